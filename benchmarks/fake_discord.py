@@ -0,0 +1,314 @@
+"""A local stand-in for the Discord gateway and REST API
+
+Just enough of both for a real discord.py client to log in, receive
+READY/GUILD_CREATE for a set of synthetic guilds, and then be fed a stream
+of MESSAGE_CREATE events. Every REST call the bot makes is counted, and
+replies to command messages are timed against the moment the command was
+dispatched.
+"""
+import asyncio
+import collections
+import datetime
+import itertools
+import json
+import time
+
+from aiohttp import web, WSMsgType
+
+HELLO, HEARTBEAT, IDENTIFY, HEARTBEAT_ACK, DISPATCH = 10, 1, 2, 11, 0
+
+_snowflakes = itertools.count(1 << 40)
+
+
+def snowflake():
+    return str(next(_snowflakes))
+
+
+def now_iso():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def json_response(data):
+    # discord.py only parses bodies whose content type is exactly application/json
+    return web.Response(body=json.dumps(data).encode(), content_type="application/json")
+
+
+def user_payload(user_id, name, bot=False):
+    return {
+        "id": str(user_id),
+        "username": name,
+        "global_name": name,
+        "discriminator": "0",
+        "avatar": None,
+        "bot": bot
+    }
+
+
+class FakeGuild:
+    def __init__(self, index, command_channels, chatter_channels, member_ids):
+        self.id = snowflake()
+        self.name = f"Load Guild {index}"
+        self.command_channels = [snowflake() for _ in range(command_channels)]
+        self.chatter_channels = [snowflake() for _ in range(chatter_channels)]
+        self.members = [user_payload(member_id, f"member{index}-{n}") for n, member_id in enumerate(member_ids)]
+
+    def payload(self, bot_user):
+        channels = [
+            {"id": channel_id, "type": 0, "name": f"channel-{position}", "position": position,
+             "permission_overwrites": [], "guild_id": self.id}
+            for position, channel_id in enumerate(self.command_channels + self.chatter_channels)
+        ]
+        members = [
+            {"user": user, "roles": [], "joined_at": now_iso(), "deaf": False, "mute": False, "flags": 0}
+            for user in self.members + [bot_user]
+        ]
+        return {
+            "id": self.id,
+            "name": self.name,
+            "icon": None,
+            "owner_id": self.members[0]["id"] if self.members else bot_user["id"],
+            "roles": [{
+                "id": self.id, "name": "@everyone", "permissions": str((1 << 41) - 1),
+                "position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False
+            }],
+            "channels": channels,
+            "threads": [],
+            "members": members,
+            "member_count": len(members),
+            "presences": [],
+            "voice_states": [],
+            "emojis": [],
+            "stickers": [],
+            "features": [],
+            "large": False,
+            "unavailable": False,
+            "premium_tier": 0,
+            "system_channel_flags": 0,
+            "verification_level": 0,
+            "default_message_notifications": 0,
+            "explicit_content_filter": 0,
+            "mfa_level": 0,
+            "nsfw_level": 0,
+            "preferred_locale": "en-US",
+            "joined_at": now_iso(),
+            "stage_instances": [],
+            "guild_scheduled_events": []
+        }
+
+
+class FakeDiscord:
+    """aiohttp application serving /api/v10 REST routes and a /gateway websocket"""
+
+    def __init__(self, guilds):
+        self.guilds = guilds
+        self.bot_user = user_payload(snowflake(), "Slayy Mom", bot=True)
+        self.application_id = snowflake()
+        self.base_url = None
+        self.runner = None
+        self.gateway_url = None
+        self.rest_calls = collections.Counter()
+        self.messages_dispatched = 0
+        self.command_latencies = []
+        self.pending_commands = collections.defaultdict(collections.deque)  # channel id -> dispatch times
+        self.pending_vents = {}  # channel id -> author of the !vent waiting for a thread
+        self.ready = asyncio.Event()
+        self._ws = None
+        self._sequence = 0
+        self._channel_guild = {
+            channel_id: guild for guild in guilds for channel_id in guild.command_channels + guild.chatter_channels
+        }
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/gateway", self.gateway)
+        app.router.add_get("/api/v10/gateway", self.get_gateway)
+        app.router.add_get("/api/v10/gateway/bot", self.get_gateway)
+        app.router.add_get("/api/v10/users/@me", self.get_me)
+        app.router.add_get("/api/v10/oauth2/applications/@me", self.get_application)
+        app.router.add_post("/api/v10/channels/{channel_id}/messages", self.create_message)
+        app.router.add_patch("/api/v10/channels/{channel_id}/messages/{message_id}", self.edit_message)
+        app.router.add_post("/api/v10/channels/{channel_id}/threads", self.create_thread)
+        app.router.add_post("/api/v10/users/@me/channels", self.create_dm)
+        app.router.add_route("*", "/api/v10/{tail:.*}", self.catch_all)
+        return app
+
+    # Gateway
+
+    async def gateway(self, request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._ws = ws
+        await ws.send_json({"op": HELLO, "d": {"heartbeat_interval": 41250}})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            if payload["op"] == HEARTBEAT:
+                await ws.send_json({"op": HEARTBEAT_ACK, "d": None})
+            elif payload["op"] == IDENTIFY:
+                await self.dispatch("READY", {
+                    "v": 10,
+                    "user": self.bot_user,
+                    "guilds": [{"id": guild.id, "unavailable": True} for guild in self.guilds],
+                    "session_id": "fake-session",
+                    "resume_gateway_url": self.gateway_url,
+                    "application": {"id": self.application_id, "flags": 0}
+                })
+                for guild in self.guilds:
+                    await self.dispatch("GUILD_CREATE", guild.payload(self.bot_user))
+                self.ready.set()
+        return ws
+
+    async def dispatch(self, event, data):
+        self._sequence += 1
+        await self._ws.send_json({"op": DISPATCH, "t": event, "s": self._sequence, "d": data})
+
+    async def send_message(self, channel_id, author, content, expects_reply):
+        """Dispatch a MESSAGE_CREATE as if author had typed content in channel_id"""
+        guild = self._channel_guild.get(channel_id)
+        if expects_reply:
+            self.pending_commands[channel_id].append(time.perf_counter())
+        if content.startswith("!vent"):
+            self.pending_vents[channel_id] = author
+        self.messages_dispatched += 1
+        await self.dispatch("MESSAGE_CREATE", {
+            "id": snowflake(),
+            "channel_id": channel_id,
+            "guild_id": guild.id if guild else None,
+            "author": author,
+            "member": {"roles": [], "joined_at": now_iso(), "deaf": False, "mute": False, "flags": 0},
+            "content": content,
+            "timestamp": now_iso(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [],
+            "pinned": False,
+            "type": 0
+        })
+
+    # REST
+
+    def count(self, request):
+        self.rest_calls[f"{request.method} {request.match_info.route.resource.canonical}"] += 1
+
+    async def get_gateway(self, request):
+        self.count(request)
+        return json_response({
+            "url": self.gateway_url,
+            "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}
+        })
+
+    async def get_me(self, request):
+        self.count(request)
+        return json_response(self.bot_user)
+
+    async def get_application(self, request):
+        self.count(request)
+        return json_response({
+            "id": self.application_id,
+            "name": "Slayy Mom",
+            "description": "",
+            "icon": None,
+            "bot_public": True,
+            "bot_require_code_grant": False,
+            "owner": user_payload(snowflake(), "owner"),
+            "verify_key": "0" * 64,
+            "flags": 0
+        })
+
+    def message_payload(self, channel_id, body):
+        return {
+            "id": snowflake(),
+            "channel_id": channel_id,
+            "author": self.bot_user,
+            "content": body.get("content") or "",
+            "timestamp": now_iso(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": body.get("embeds") or [],
+            "pinned": False,
+            "type": 0
+        }
+
+    async def create_message(self, request):
+        self.count(request)
+        channel_id = request.match_info["channel_id"]
+        pending = self.pending_commands.get(channel_id)
+        if pending:
+            self.command_latencies.append(time.perf_counter() - pending.popleft())
+        body = await self.read_body(request)
+        return json_response(self.message_payload(channel_id, body))
+
+    async def edit_message(self, request):
+        self.count(request)
+        body = await self.read_body(request)
+        return json_response(self.message_payload(request.match_info["channel_id"], body))
+
+    async def create_thread(self, request):
+        self.count(request)
+        parent_id = request.match_info["channel_id"]
+        body = await self.read_body(request)
+        guild = self._channel_guild[parent_id]
+        thread = {
+            "id": snowflake(),
+            "type": body.get("type", 11),
+            "guild_id": guild.id,
+            "parent_id": parent_id,
+            "name": body.get("name", "thread"),
+            "owner_id": self.bot_user["id"],
+            "message_count": 0,
+            "member_count": 0,
+            "thread_metadata": {
+                "archived": False,
+                "auto_archive_duration": body.get("auto_archive_duration", 1440),
+                "archive_timestamp": now_iso(),
+                "locked": False
+            }
+        }
+        self._channel_guild[thread["id"]] = guild
+        await self.dispatch("THREAD_CREATE", dict(thread, newly_created=True))
+
+        # The person who asked to vent replies in their new thread shortly after
+        author = self.pending_vents.pop(parent_id, None)
+        if author is not None:
+            asyncio.get_running_loop().call_later(
+                0.5, lambda: asyncio.ensure_future(self.send_message(thread["id"], author, "I had a rough day.", False))
+            )
+        return json_response(thread)
+
+    async def create_dm(self, request):
+        self.count(request)
+        body = await self.read_body(request)
+        return json_response({
+            "id": snowflake(),
+            "type": 1,
+            "recipients": [user_payload(body.get("recipient_id", snowflake()), "member")]
+        })
+
+    async def catch_all(self, request):
+        self.count(request)
+        if request.method in ("DELETE", "PUT"):
+            return web.Response(status=204)
+        return json_response({})
+
+    async def read_body(self, request):
+        if request.content_type == "application/json":
+            return await request.json()
+        if request.content_type.startswith("multipart/"):
+            reader = await request.multipart()
+            part = await reader.next()
+            while part is not None:
+                if part.name == "payload_json":
+                    return json.loads(await part.text())
+                part = await reader.next()
+        return {}
@@ -0,0 +1,91 @@
+"""Lightweight stand-ins for the discord.py objects the bot's hot paths touch"""
+import itertools
+
+_ids = itertools.count(10 ** 17)
+
+
+class FakeSentMessage:
+    def __init__(self, channel, content=None, embed=None):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+
+    async def edit(self, content=None, embed=None):
+        self.channel.edits += 1
+        self.content = content or self.content
+        self.embed = embed or self.embed
+
+
+class FakeChannel:
+    """Records what the bot sends instead of talking to Discord"""
+
+    def __init__(self, guild=None, channel_id=None):
+        self.id = channel_id or next(_ids)
+        self.guild = guild
+        self.sent = 0
+        self.edits = 0
+
+    async def send(self, content=None, embed=None, **kwargs):
+        self.sent += 1
+        return FakeSentMessage(self, content, embed)
+
+
+class FakeUser:
+    def __init__(self, user_id=None, name="bench-user", bot=False):
+        self.id = user_id or next(_ids)
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{self.id}>"
+        self.bot = bot
+        self.dm_channel = FakeChannel()
+
+    async def send(self, content=None, embed=None, **kwargs):
+        return await self.dm_channel.send(content, embed=embed)
+
+
+class FakeGuild:
+    def __init__(self, guild_id=None, name="Bench Guild"):
+        self.id = guild_id or next(_ids)
+        self.name = name
+        self.premium_tier = 0
+        self.members = {}
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+
+class FakeMessage:
+    def __init__(self, content, author, channel):
+        self.id = next(_ids)
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.embeds = []
+        self.attachments = []
+        self.mentions = []
+        self.role_mentions = []
+        self.channel_mentions = []
+        self.mention_everyone = False
+        self.webhook_id = None
+        self.type = None
+        self.interaction_metadata = None
+        self._state = None  # Context reads this; nothing dereferences it offline
+
+    async def delete(self):
+        pass
+
+
+class FakeContext:
+    """Just enough of commands.Context for calling command callbacks directly"""
+
+    def __init__(self, author, channel, prefix="!"):
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.prefix = prefix
+        self.message = FakeMessage("", author, channel)
+
+    async def send(self, content=None, embed=None, **kwargs):
+        return await self.channel.send(content, embed=embed)
@@ -0,0 +1,227 @@
+"""End-to-end load test against a local fake Discord
+
+Starts benchmarks.fake_discord in its own thread and event loop, points
+discord.py at it, and runs the real bot object from bot.py with every cog
+loaded, exactly as main.py does. The fake gateway then replays a message
+stream (synthetic, or recorded with --record and replayed with --replay)
+across many guilds and channels: commands, !vent followed by a reply in
+the new thread, trigger-laden chatter and plain chatter.
+
+Reports end-to-end command latency (dispatch to the bot's reply reaching
+the REST API), REST calls issued per message and event-loop lag.
+
+    python -m benchmarks.load_test --guilds 50 --rate 200 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import threading
+import time
+
+import discord
+import yarl
+from aiohttp import web
+
+from benchmarks.fake_discord import FakeDiscord, FakeGuild
+from benchmarks.run_benchmarks import REPO_ROOT, build_data_dir, random_word
+
+COMMANDS = [
+    "!affirmation",
+    "!comfort",
+    "!resources",
+    "!resources support",
+    "!help",
+    "!help trigger",
+    "!pronouns they/them",
+    "!pride trans",
+    "!birthday 15-06-1995"
+]
+
+
+def synthetic_stream(args, rng, guild_count, vocabulary):
+    """Yield (offset, guild index, kind, content) events at args.rate per second"""
+    filler = [random_word(rng) for _ in range(500)]
+    total = int(args.rate * args.duration)
+    for index in range(total):
+        roll = rng.random()
+        if roll < args.command_share:
+            kind, content = "command", rng.choice(COMMANDS)
+        elif roll < args.command_share + args.vent_share:
+            kind, content = "vent", "!vent"
+        else:
+            words = [rng.choice(filler) for _ in range(rng.randint(5, 40))]
+            if roll < args.command_share + args.vent_share + args.trigger_share:
+                words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            kind, content = "chatter", " ".join(words)
+        yield index / args.rate, rng.randrange(guild_count), kind, content
+
+
+def recorded_stream(path):
+    with open(path, 'r') as f:
+        for line in f:
+            event = json.loads(line)
+            yield event["offset"], event["guild"], event["kind"], event["content"]
+
+
+async def produce(fake, events, rng):
+    """Feed the events to the bot in real time (runs on the fake server's loop)"""
+    await fake.ready.wait()
+    started = time.perf_counter()
+    for offset, guild_index, kind, content in events:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        guild = fake.guilds[guild_index % len(fake.guilds)]
+        author = rng.choice(guild.members)
+        if kind == "chatter":
+            channel_id = rng.choice(guild.chatter_channels)
+        else:
+            channel_id = rng.choice(guild.command_channels)
+        await fake.send_message(channel_id, author, content, expects_reply=kind == "command")
+    return time.perf_counter() - started
+
+
+def start_server_thread(fake, port):
+    """Run the fake Discord on its own event loop in a background thread"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="fake-discord", daemon=True).start()
+
+    async def serve():
+        runner = web.AppRunner(fake.app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        await site.start()
+        fake.runner = runner
+        bound_port = runner.addresses[0][1]
+        fake.base_url = f"http://127.0.0.1:{bound_port}/api/v10"
+        fake.gateway_url = f"ws://127.0.0.1:{bound_port}/gateway"
+
+    asyncio.run_coroutine_threadsafe(serve(), loop).result()
+    return loop
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    workdir, vocabulary, user_ids = build_data_dir(args, rng)
+
+    guilds = [
+        FakeGuild(index, args.command_channels, args.chatter_channels,
+                  rng.sample(user_ids, min(args.members, len(user_ids))))
+        for index in range(args.guilds)
+    ]
+
+    if args.replay:
+        events = list(recorded_stream(args.replay))
+    else:
+        events = list(synthetic_stream(args, rng, len(guilds), vocabulary))
+    if args.record:
+        with open(args.record, 'w') as f:
+            for offset, guild_index, kind, content in events:
+                f.write(json.dumps({"offset": offset, "guild": guild_index, "kind": kind, "content": content}) + "\n")
+
+    fake = FakeDiscord(guilds)
+    server_loop = start_server_thread(fake, args.port)
+
+    # Point discord.py at the fake server instead of discord.com
+    discord.http.Route.BASE = fake.base_url
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(fake.gateway_url)
+
+    os.environ.setdefault("STORAGE_BACKEND", args.storage)
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+    # Start up the way main.py does: data loads while the gateway connects
+    import bot as bot_module
+    from main import load_cogs
+    bot = bot_module.bot
+    await load_cogs(os.path.join(REPO_ROOT, "cogs"))
+
+    ready = asyncio.Event()
+
+    async def mark_ready():
+        ready.set()
+
+    bot.add_listener(mark_ready, "on_ready")
+    bot_task = asyncio.create_task(bot.start("fake-token"))
+    ready_task = asyncio.create_task(ready.wait())
+    await asyncio.wait([bot_task, ready_task], return_when=asyncio.FIRST_COMPLETED)
+    if bot_task.done():
+        bot_task.result()  # Surface whatever stopped the bot from connecting
+    print(f"Bot ready in {len(bot.guilds)} guilds; replaying {len(events)} messages")
+
+    rest_before = sum(fake.rest_calls.values())
+    lag_samples = []
+    producer = asyncio.run_coroutine_threadsafe(produce(fake, events, random.Random(args.seed)), server_loop)
+    while not producer.done():
+        lag_samples.append(bot.loop_watchdog.last_lag)
+        await asyncio.sleep(0.1)
+    elapsed = producer.result()
+
+    # Give in-flight replies a moment to land
+    await asyncio.sleep(args.drain)
+
+    rest_calls = sum(fake.rest_calls.values()) - rest_before
+    latencies = fake.command_latencies
+    unanswered = sum(len(pending) for pending in fake.pending_commands.values())
+
+    print(f"messages dispatched: {fake.messages_dispatched} in {elapsed:.1f}s "
+          f"({fake.messages_dispatched / elapsed:.0f}/s)")
+    print(f"REST calls: {rest_calls} ({rest_calls / max(1, fake.messages_dispatched):.3f} per message)")
+    for route, count in fake.rest_calls.most_common(8):
+        print(f"  {count:>8}  {route}")
+    if latencies:
+        print(f"command latency: n={len(latencies)} p50={statistics.median(latencies) * 1000:.1f}ms "
+              f"p99={percentile(latencies, 0.99) * 1000:.1f}ms max={max(latencies) * 1000:.1f}ms "
+              f"unanswered={unanswered}")
+    print(f"event-loop lag: p50={percentile(lag_samples, 0.5) * 1000:.1f}ms "
+          f"p99={percentile(lag_samples, 0.99) * 1000:.1f}ms max={bot.loop_watchdog.max_lag * 1000:.1f}ms "
+          f"stalls={len(bot.loop_watchdog.stalls)}")
+
+    await bot.close()
+    await bot.profile_store.close()
+    await bot.moderation.close()
+    bot_task.cancel()
+    asyncio.run_coroutine_threadsafe(fake.runner.cleanup(), server_loop).result(timeout=10)
+    server_loop.call_soon_threadsafe(server_loop.stop)
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=100, help="members per guild")
+    parser.add_argument("--command-channels", type=int, default=3, help="command channels per guild")
+    parser.add_argument("--chatter-channels", type=int, default=5, help="chatter channels per guild")
+    parser.add_argument("--rate", type=float, default=100, help="messages per second")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of traffic")
+    parser.add_argument("--command-share", type=float, default=0.2)
+    parser.add_argument("--vent-share", type=float, default=0.01)
+    parser.add_argument("--trigger-share", type=float, default=0.05)
+    parser.add_argument("--users", type=int, default=5000, help="stored profiles")
+    parser.add_argument("--triggers-per-user", type=int, default=3)
+    parser.add_argument("--affirmations", type=int, default=1000)
+    parser.add_argument("--resources", type=int, default=100)
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--record", help="write the generated stream to this JSONL file")
+    parser.add_argument("--replay", help="replay a stream recorded with --record")
+    parser.add_argument("--drain", type=float, default=3.0, help="seconds to wait for replies after the stream ends")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
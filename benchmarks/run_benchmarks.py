@@ -0,0 +1,231 @@
+"""Offline benchmarks for the bot's hot paths
+
+Drives on_message/check_triggers, the UserSetup commands, !affirmation,
+!resources, !resources search and !help through the fake objects in benchmarks.fakes, against
+a throwaway data directory filled with synthetic profiles and content.
+No Discord connection or token is needed.
+
+    python -m benchmarks.run_benchmarks --users 10000 --triggers-per-user 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_word(rng, length=None):
+    return "".join(rng.choices(string.ascii_lowercase, k=length or rng.randint(3, 9)))
+
+
+def build_data_dir(args, rng):
+    """Create a temp working directory with synthetic data files"""
+    workdir = tempfile.mkdtemp(prefix="slayy-bench-")
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir)
+
+    vocabulary = [random_word(rng) for _ in range(max(100, args.triggers_per_user * 20))]
+    profiles = {}
+    for user_index in range(args.users):
+        profiles[str(10 ** 15 + user_index)] = {
+            "pronouns": rng.choice(["she/her", "he/him", "they/them", None]),
+            "triggers": rng.sample(vocabulary, min(args.triggers_per_user, len(vocabulary))),
+            "birthdate": f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(1970, 2008)}",
+            "milestones": {},
+            "preferences": {"daily_affirmation": False}
+        }
+    with open(os.path.join(data_dir, "user_data.json"), 'w') as f:
+        json.dump(profiles, f, indent=4)
+
+    affirmations = {
+        "general": [f"Affirmation {i}: you are loved." for i in range(args.affirmations)],
+        "comfort": [f"Comfort {i}: I'm right here." for i in range(args.affirmations)]
+    }
+    with open(os.path.join(data_dir, "affirmations.json"), 'w') as f:
+        json.dump(affirmations, f)
+
+    resources = {}
+    for index in range(args.resources):
+        category = f"category{index % 5}"
+        resources.setdefault(category, []).append({
+            "name": f"Resource {index}",
+            "url": f"https://example.org/{index}",
+            "description": f"Helpful resource number {index}"
+        })
+    with open(os.path.join(data_dir, "resources.json"), 'w') as f:
+        json.dump(resources, f)
+
+    return workdir, vocabulary, list(profiles)
+
+
+def build_messages(args, rng, vocabulary):
+    """Chatter of roughly message_length characters, trigger_rate of it flagged"""
+    filler = [random_word(rng) for _ in range(500)]
+    messages = []
+    for _ in range(args.iterations):
+        words = []
+        while sum(len(w) + 1 for w in words) < args.message_length:
+            words.append(rng.choice(filler))
+        if rng.random() < args.trigger_rate:
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        messages.append(" ".join(words))
+    return messages
+
+
+async def measure(name, iterations, operation):
+    """Run operation(i) iterations times and return a result row"""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        before = time.perf_counter()
+        await operation(i)
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "name": name,
+        "ops_per_sec": iterations / elapsed if elapsed else float("inf"),
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6
+    }
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    workdir, vocabulary, user_ids = build_data_dir(args, rng)
+    messages = build_messages(args, rng, vocabulary)
+
+    # bot.py resolves data/ relative to the working directory
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ.setdefault("CONTENT_WARNING_WINDOW", "1")
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+    import bot as bot_module
+    from benchmarks.fakes import FakeChannel, FakeContext, FakeGuild, FakeMessage, FakeUser
+    from cogs.affirmations import Affirmations
+    from cogs.inclusive_features import InclusiveFeatures
+    from cogs.user_setup import UserSetup
+
+    bot = bot_module.bot
+    # process_commands compares authors with the logged-in user
+    bot._connection.user = FakeUser(name="Slayy Mom", bot=True)
+    load_started = time.perf_counter()
+    await bot_module.load_data()
+    load_ms = (time.perf_counter() - load_started) * 1000
+
+    guild = FakeGuild()
+    member_count = len(user_ids) if args.guild_members is None else min(args.guild_members, len(user_ids))
+    for user_id in rng.sample(user_ids, member_count):
+        guild.members[int(user_id)] = FakeUser(int(user_id))
+    bot.trigger_index.add_guild(guild.id, guild.members)
+    channels = [FakeChannel(guild) for _ in range(args.channels)]
+    authors = list(guild.members.values())[:200] or [FakeUser()]
+    user_setup = UserSetup(bot)
+    affirmations = Affirmations(bot)
+    inclusive = InclusiveFeatures(bot)
+
+    def context(i):
+        return FakeContext(authors[i % len(authors)], channels[i % len(channels)])
+
+    async def on_message(i):
+        channel = channels[i % len(channels)]
+        await bot_module.on_message(FakeMessage(messages[i], authors[i % len(authors)], channel))
+
+    async def check_triggers(i):
+        channel = channels[i % len(channels)]
+        await bot_module.check_triggers(FakeMessage(messages[i], authors[i % len(authors)], channel))
+
+    async def pronouns(i):
+        await user_setup.set_pronouns.callback(user_setup, context(i), pronouns=rng.choice(["she/her", "they/them"]))
+
+    async def trigger_add_remove(i):
+        ctx = context(i)
+        word = f"benchword{i}"
+        await user_setup.trigger_add.callback(user_setup, ctx, word=word)
+        await user_setup.trigger_remove.callback(user_setup, ctx, word=word)
+
+    async def birthday(i):
+        await user_setup.set_birthday.callback(user_setup, context(i), date_str="15-06-1995")
+
+    async def affirmation(i):
+        await affirmations.get_affirmation.callback(affirmations, context(i))
+
+    async def resources(i):
+        category = None if i % 2 else f"category{i % 5}"
+        await inclusive.resources.callback(inclusive, context(i), category=category)
+
+    async def resources_search(i):
+        query = ("helpful resource", f"resource {i % args.resources}", "numb", "nothing here")[i % 4]
+        await inclusive.resources_search.callback(inclusive, context(i), query=query)
+
+    async def help_menu(i):
+        await bot_module.help_command.callback(context(i), command=None if i % 2 else "trigger")
+
+    async def flush(i):
+        bot.profile_store.mark_dirty(user_ids[i % len(user_ids)] if user_ids else i)
+        await bot.profile_store.flush()
+
+    benchmarks = [
+        ("on_message", on_message),
+        ("check_triggers", check_triggers),
+        ("pronouns", pronouns),
+        ("trigger add+remove", trigger_add_remove),
+        ("birthday", birthday),
+        ("affirmation", affirmation),
+        ("resources", resources),
+        ("resources search", resources_search),
+        ("help", help_menu),
+        (f"store flush ({args.storage})", flush)
+    ]
+
+    print(f"users={args.users} guild_members={member_count} triggers/user={args.triggers_per_user} message_length={args.message_length} "
+          f"affirmations={args.affirmations} resources={args.resources} storage={args.storage}")
+    print(f"data load + index build: {load_ms:.1f}ms")
+    print(f"{'benchmark':<28}{'ops/s':>12}{'p50 (us)':>12}{'p99 (us)':>12}")
+    try:
+        for name, operation in benchmarks:
+            if args.only and name not in args.only:
+                continue
+            iterations = args.iterations if not name.startswith("store flush") else min(args.iterations, 200)
+            row = await measure(name, iterations, operation)
+            print(f"{row['name']:<28}{row['ops_per_sec']:>12.0f}{row['p50_us']:>12.1f}{row['p99_us']:>12.1f}")
+
+        sent = sum(channel.sent for channel in channels)
+        edits = sum(channel.edits for channel in channels)
+        print(f"channel sends: {sent}, warning edits: {edits}")
+    finally:
+        await bot.profile_store.close()
+        await bot.moderation.close()
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--triggers-per-user", type=int, default=3)
+    parser.add_argument("--message-length", type=int, default=200)
+    parser.add_argument("--trigger-rate", type=float, default=0.05, help="fraction of messages containing a trigger")
+    parser.add_argument("--affirmations", type=int, default=1000, help="lines per affirmation category")
+    parser.add_argument("--resources", type=int, default=100)
+    parser.add_argument("--channels", type=int, default=50)
+    parser.add_argument("--guild-members", type=int, help="users in the benchmark guild (default: all of them)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="*", help="run only the named benchmarks")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
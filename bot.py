@@ -2,10 +2,29 @@ import os
 import discord
 from discord.ext import commands, tasks
 import json
-import random
 import datetime
 import asyncio
+import time
 from dotenv import load_dotenv
+from utils.broadcaster import Broadcaster
+from utils.celebrations import CelebrationIndex
+from utils.content_cache import ContentCache, validate_affirmations, validate_resources
+from utils.embed_templates import EmbedTemplateCache
+from utils.guild_settings import GuildSettings
+from utils.locale_packs import LocalePack, LocalePacks, normalize_locale
+from utils.loop_watchdog import LoopWatchdog
+from utils.metrics import InstrumentedBackend, MetricsRegistry, instrument_http
+from utils.moderation_ledger import ModerationLedger
+from utils.outbound import TokenBucket, WarningCoalescer
+from utils.profile_store import ProfileStore
+from utils.profile_sync import ProfileSync
+from utils.profiler import SamplingProfiler
+from utils.replies import ReplyRegistry
+from utils.sharding import cluster_file, parse_shard_ids
+from utils.startup import StartupTimer
+from utils.storage import open_backend
+from utils.trigger_matcher import GuildTriggerIndex
+from utils.vent_tracker import VentTracker
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +33,18 @@ load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
 PREFIX = os.getenv('COMMAND_PREFIX', '!')
 AFFIRMATION_CHANNEL_ID = os.getenv('AFFIRMATION_CHANNEL_ID')
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'json')
+CONTENT_WARNING_WINDOW = float(os.getenv('CONTENT_WARNING_WINDOW', '60'))
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108') or 0)
+DEFAULT_LOCALE = normalize_locale(os.getenv('DEFAULT_LOCALE', 'en'))
+LOCALE_CACHE_SIZE = int(os.getenv('LOCALE_CACHE_SIZE', '8'))
+
+# Sharding, normally set by launcher.py; CLUSTER_ID names one of several processes
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0') or 0)
+SHARD_IDS = parse_shard_ids(os.getenv('SHARD_IDS'))
+CLUSTER_ID = os.getenv('CLUSTER_ID') or None
+PROFILE_SYNC_INTERVAL = float(os.getenv('PROFILE_SYNC_INTERVAL', '1'))
 
 # Set up intents (permissions)
 intents = discord.Intents.default()
@@ -21,19 +52,117 @@ intents.message_content = True
 intents.members = True
 
 # Initialize bot with command prefix and intents
-bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
+if SHARD_COUNT:
+    bot = commands.AutoShardedBot(
+        command_prefix=PREFIX, intents=intents, help_command=None,
+        shard_count=SHARD_COUNT, shard_ids=SHARD_IDS
+    )
+else:
+    bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
+bot.cluster_id = CLUSTER_ID
+
+# Per-phase startup timing, printed once the bot is ready
+bot.startup = StartupTimer()
+
+# Set once profiles and settings are loaded; handlers wait for it
+bot.data_loaded = asyncio.Event()
+bot.data_task = None
+
+def member_guild_ids(user_id):
+    """Ids of the guilds a user shares with the bot"""
+    user = bot.get_user(int(user_id))
+    return [guild.id for guild in user.mutual_guilds] if user else []
+
+# Shared indexes over profile data, kept in sync by the UserSetup cog.
+# Triggers are indexed per guild, following member joins and leaves.
+bot.trigger_index = GuildTriggerIndex(member_guilds=member_guild_ids)
+bot.celebrations = CelebrationIndex()
+
+# Watches for event-loop stalls and which command caused them
+bot.loop_watchdog = LoopWatchdog()
+
+# Latency histograms and counters, served at http://METRICS_HOST:METRICS_PORT/metrics
+bot.metrics = MetricsRegistry()
+instrument_http(bot.http, bot.metrics)
+COMMAND_SECONDS = bot.metrics.histogram(
+    "slayy_command_duration_seconds", "Time spent running each command", ("command", "outcome")
+)
+COMMAND_ERRORS = bot.metrics.counter(
+    "slayy_command_errors_total", "Commands that failed, by error type", ("command", "error")
+)
+MESSAGE_SECONDS = bot.metrics.histogram(
+    "slayy_on_message_duration_seconds", "Time spent handling each message, commands included"
+)
+TRIGGER_SECONDS = bot.metrics.histogram(
+    "slayy_trigger_check_duration_seconds", "Time spent checking a message for trigger words"
+)
+bot.metrics.gauge("slayy_event_loop_lag_seconds", "Most recent event-loop lag", lambda: bot.loop_watchdog.last_lag)
+bot.metrics.gauge("slayy_event_loop_max_lag_seconds", "Worst event-loop lag since start", lambda: bot.loop_watchdog.max_lag)
+bot.metrics.gauge("slayy_gateway_latency_seconds", "Gateway heartbeat latency", lambda: bot.latency)
 
 # Data storage paths
 DATA_DIR = "data"
 USER_DATA_FILE = os.path.join(DATA_DIR, "user_data.json")
 RESOURCES_FILE = os.path.join(DATA_DIR, "resources.json")
 AFFIRMATIONS_FILE = os.path.join(DATA_DIR, "affirmations.json")
+LOCALES_DIR = os.path.join(DATA_DIR, "locales")
+DATABASE_FILE = os.path.join(DATA_DIR, "slayy_mom.db")
+GUILD_SETTINGS_FILE = os.path.join(DATA_DIR, "guild_settings.json")
+MODERATION_DB_FILE = os.path.join(DATA_DIR, "moderation.db")
+BROADCAST_PROGRESS_FILE = cluster_file(os.path.join(DATA_DIR, "broadcast_progress.log"), CLUSTER_ID)
+OPEN_VENTS_FILE = cluster_file(os.path.join(DATA_DIR, "open_vents.json"), CLUSTER_ID)
+
+# Owner-controlled sampling profiler (see !profile); writes collapsed stacks to DATA_DIR
+bot.profiler = SamplingProfiler(DATA_DIR)
+
+# Profiles are loaded once and written back in batches. When several
+# processes share the database, writes are flushed sooner and each process
+# replays the others' changes.
+bot.profile_store = ProfileStore(
+    InstrumentedBackend(open_backend(STORAGE_BACKEND, USER_DATA_FILE, DATABASE_FILE, origin=CLUSTER_ID), bot.metrics),
+    flush_interval=PROFILE_SYNC_INTERVAL if CLUSTER_ID else 5.0
+)
+bot.metrics.gauge("slayy_profiles", "Profiles held in memory", lambda: len(bot.profile_store.profiles))
+
+# Affirmations and resources are parsed once and reloaded when the files change
+bot.affirmations_cache = ContentCache(AFFIRMATIONS_FILE, {"general": [], "comfort": []}, validate_affirmations)
+bot.resources_cache = ContentCache(RESOURCES_FILE, {}, validate_resources)
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
+# Paces the bot's own sends per channel; content warnings share the same budget
+bot.send_throttle = TokenBucket()
+bot.warning_coalescer = WarningCoalescer(bot.send_throttle, window=CONTENT_WARNING_WINDOW)
+
+# Per-guild configuration and the fan-out used for the daily post
+bot.guild_settings = GuildSettings(GUILD_SETTINGS_FILE)
+bot.broadcaster = Broadcaster(BROADCAST_PROGRESS_FILE)
+
+# Affirmations and resources in other languages, from data/locales/<locale>/.
+# A pack is only parsed once someone with that language uses it.
+bot.locales = LocalePacks(
+    LOCALES_DIR,
+    LocalePack(DEFAULT_LOCALE, bot.affirmations_cache, bot.resources_cache),
+    bot.guild_settings,
+    max_loaded=LOCALE_CACHE_SIZE
+)
+
+# Warnings and timeouts, with each member's active warning count kept in memory
+bot.moderation = ModerationLedger(MODERATION_DB_FILE)
+
+# Conversations waiting on a user's next message, looked up by channel and
+# author instead of a wait_for check per pending conversation; vent threads
+# awaiting their follow-up are remembered across restarts
+bot.replies = ReplyRegistry()
+bot.vent_tracker = VentTracker(OPEN_VENTS_FILE)
+bot.metrics.gauge("slayy_open_vents", "Vent threads waiting for a follow-up", lambda: len(bot.vent_tracker))
+
+# Embeds that only change with the prefix or the data files are built once
+bot.embed_templates = EmbedTemplateCache()
 
 # Initialize data files if they don't exist
 def initialize_data_files():
+    # Ensure data directory exists
+    os.makedirs(DATA_DIR, exist_ok=True)
+    
     # User data structure
     if not os.path.exists(USER_DATA_FILE):
         with open(USER_DATA_FILE, 'w') as f:
@@ -91,51 +220,102 @@ def initialize_data_files():
             json.dump(default_affirmations, f, indent=4)
 
 # User data functions
-def load_user_data():
+async def load_profiles():
+    """Load stored profiles and build the indexes derived from them"""
+    await bot.profile_store.load()
+    bot.trigger_index.load(bot.profile_store.profiles)
+    # Guilds that arrived before the profiles did are indexed now
+    for guild in bot.guilds:
+        index_guild(guild)
+    bot.celebrations.load(bot.profile_store.profiles)
+
+def index_guild(guild):
+    bot.trigger_index.add_guild(guild.id, (member.id for member in guild.members))
+
+async def load_data():
+    """Create missing data files and load everything the handlers need"""
+    with bot.startup.phase("data load"):
+        await asyncio.to_thread(initialize_data_files)
+        await load_profiles()
+        bot.guild_settings.load()
+        bot.vent_tracker.load()
+        await bot.moderation.load()
+        # Parse the content files now rather than on the first command
+        await asyncio.to_thread(bot.affirmations_cache.get)
+        await asyncio.to_thread(bot.resources_cache.get)
+        bot.locales.default.resource_index.refresh()
+    bot.data_loaded.set()
+
+async def load_data_in_background():
     try:
-        with open(USER_DATA_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+        await load_data()
+    except Exception as e:
+        print(f"Failed to load bot data, shutting down: {e}")
+        await bot.close()
+
+async def setup_hook():
+    # Runs after login, before the gateway connects: data loads while it does
+    bot.startup.end("login")
+    bot.startup.begin("gateway ready")
+    if bot.data_task is None and not bot.data_loaded.is_set():
+        bot.data_task = asyncio.create_task(load_data_in_background())
 
-def save_user_data(data):
-    with open(USER_DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+bot.setup_hook = setup_hook
+
+def reindex_profile(user_id, profile):
+    """Bring the trigger and celebration indexes in line with one profile"""
+    bot.trigger_index.remove_user(user_id)
+    bot.celebrations.remove_user(user_id)
+    if profile is None:
+        return
+    for trigger in profile.triggers:
+        bot.trigger_index.add(user_id, trigger, profile.is_whole_word(trigger))
+    if profile.birthdate:
+        bot.celebrations.set_birthday(user_id, profile.birthdate)
+    for date_str, description in profile.milestone_items():
+        bot.celebrations.add_milestone(user_id, date_str, description)
+
+# Picks up profile changes made by the other processes of a sharded launch
+bot.profile_sync = ProfileSync(bot.profile_store, reindex_profile, interval=PROFILE_SYNC_INTERVAL) if CLUSTER_ID else None
 
 def get_user_profile(user_id):
-    data = load_user_data()
-    user_id = str(user_id)  # Convert to string for JSON compatibility
-    
-    if user_id not in data:
-        # Create default profile
-        data[user_id] = {
-            "pronouns": None,
-            "triggers": [],
-            "birthdate": None,
-            "milestones": {},
-            "preferences": {
-                "daily_affirmation": False
-            }
-        }
-        save_user_data(data)
-    
-    return data[user_id]
+    return bot.profile_store.get_or_create(user_id)
 
 # Load resources and affirmations
 def load_resources():
-    with open(RESOURCES_FILE, 'r') as f:
-        return json.load(f)
+    return bot.resources_cache.get()
 
 def load_affirmations():
-    with open(AFFIRMATIONS_FILE, 'r') as f:
-        return json.load(f)
+    return bot.affirmations_cache.get()
 
 # Bot events
 @bot.event
 async def on_ready():
-    print(f'{bot.user.name} has connected to Discord!')
-    initialize_data_files()
-    daily_affirmation.start()
+    if CLUSTER_ID:
+        print(f'{bot.user.name} has connected to Discord! (cluster {CLUSTER_ID}, shards {bot.shard_ids} of {bot.shard_count})')
+    else:
+        print(f'{bot.user.name} has connected to Discord!')
+    bot.startup.end("gateway ready")
+    await bot.data_loaded.wait()
+    startup_report = bot.startup.report()
+    if startup_report:
+        print(startup_report)
+    
+    bot.profile_store.start()
+    if bot.profile_sync is not None:
+        bot.profile_sync.start()
+    bot.loop_watchdog.start()
+    if METRICS_PORT:
+        try:
+            await bot.metrics.serve(METRICS_HOST, METRICS_PORT)
+        except OSError as e:
+            print(f"Could not start the metrics endpoint on {METRICS_HOST}:{METRICS_PORT}: {e}")
+    if not daily_affirmation.is_running():
+        daily_affirmation.start()
+    
+    # Finish a daily post that was interrupted by a restart
+    if bot.broadcaster.is_unfinished(daily_run_name()):
+        asyncio.create_task(send_daily_affirmation())
 
 @bot.event
 async def on_message(message):
@@ -143,43 +323,129 @@ async def on_message(message):
     if message.author.bot:
         return
     
-    # Process commands
-    await bot.process_commands(message)
+    # A message can beat the profile load on a fresh start
+    if not bot.data_loaded.is_set():
+        await bot.data_loaded.wait()
     
-    # Check for trigger words in messages
-    await check_triggers(message)
+    with bot.loop_watchdog.track("on_message"), MESSAGE_SECONDS.time():
+        # Wake anything waiting on this user's reply here (e.g. a vent follow-up)
+        bot.replies.dispatch(message)
+        
+        # Process commands
+        await bot.process_commands(message)
+        
+        # Check for trigger words in messages
+        with bot.loop_watchdog.track("check_triggers"), TRIGGER_SECONDS.time():
+            await check_triggers(message)
+
+# Label each command's task so loop stalls can be traced back to it,
+# time it for the metrics endpoint, and let the profiler pick it out.
+# These hooks run for every command, including the ones in cogs; a group
+# and its subcommand are handled separately.
+@bot.before_invoke
+async def label_command(ctx):
+    bot.loop_watchdog.push_label(ctx.command.qualified_name)
+    bot.profiler.command_started(ctx.command.qualified_name)
+    ctx.invoke_started = time.perf_counter()
+
+@bot.after_invoke
+async def unlabel_command(ctx):
+    bot.loop_watchdog.pop_label()
+    bot.profiler.command_finished(ctx.command.qualified_name)
+    outcome = "error" if ctx.command_failed else "ok"
+    COMMAND_SECONDS.observe(time.perf_counter() - ctx.invoke_started, ctx.command.qualified_name, outcome)
+
+@bot.listen("on_command_error")
+async def count_command_error(ctx, error):
+    command = ctx.command.qualified_name if ctx.command else "<unknown>"
+    COMMAND_ERRORS.inc(command, type(error).__name__)
+
+# Keep the per-guild trigger indexes in step with guild membership
+@bot.listen()
+async def on_guild_available(guild):
+    index_guild(guild)
+
+@bot.listen()
+async def on_guild_join(guild):
+    index_guild(guild)
+
+@bot.listen()
+async def on_guild_remove(guild):
+    bot.trigger_index.remove_guild(guild.id)
+
+@bot.listen()
+async def on_member_join(member):
+    bot.trigger_index.member_joined(member.guild.id, member.id)
+
+@bot.listen()
+async def on_raw_member_remove(payload):
+    # The raw event also fires for members that were never cached
+    bot.trigger_index.member_left(payload.guild_id, payload.user.id)
+
+def message_text(message):
+    """Everything readable in a message, for trigger matching"""
+    parts = [message.content]
+    for embed in message.embeds:
+        parts += [embed.title, embed.description, embed.footer.text, embed.author.name]
+        for field in embed.fields:
+            parts += [field.name, field.value]
+    parts += [attachment.filename for attachment in message.attachments]
+    return "\n".join(part for part in parts if part)
 
 # Check for trigger words
 async def check_triggers(message):
-    content = message.content.lower()
-    user_data = load_user_data()
-    
-    # Check all users' triggers
-    for profile in user_data.items():
-        if "triggers" in profile:
-            for trigger in profile["triggers"]:
-                if trigger.lower() in content:
-                    # If message contains a trigger word, add a warning
-                    await message.channel.send(f"⚠️ Content warning: This message may contain triggering content for some members.")
-                    return
+    # Only the server's own members' triggers matter, and DMs have no one else to protect
+    if message.guild is None:
+        return
+    # One pass over the message, its embeds and attachment names finds any member's trigger word
+    if bot.trigger_index.search(message.guild.id, message_text(message)) is not None:
+        # Warnings in a busy channel are folded into one message
+        await bot.warning_coalescer.warn(message.channel)
 
 # Daily affirmation task
 @tasks.loop(hours=24)
 async def daily_affirmation():
+    with bot.loop_watchdog.track("daily_affirmation"):
+        await send_daily_affirmation()
+
+def daily_run_name():
+    return f"daily-affirmation-{datetime.date.today().isoformat()}"
+
+def daily_affirmation_channels():
+    """Map guild id -> channel for every guild that gets the daily post"""
+    channels = {}
+    for guild_id, channel_id in bot.guild_settings.guilds_with("affirmation_channel").items():
+        channel = bot.get_channel(channel_id)
+        if channel:
+            channels[guild_id] = channel
+    
+    # The channel from the environment still works for single-server setups
     if AFFIRMATION_CHANNEL_ID:
         channel = bot.get_channel(int(AFFIRMATION_CHANNEL_ID))
-        if channel:
-            affirmations = load_affirmations()
-            daily_msg = random.choice(affirmations["general"])
-            
-            embed = discord.Embed(
-                title="💖 Daily Affirmation",
-                description=daily_msg,
-                color=discord.Color.from_rgb(255, 105, 180)  # Pink color
-            )
-            embed.set_footer(text="Slayy Mom loves you! 🌈")
-            
-            await channel.send(embed=embed)
+        if channel and channel.guild.id not in channels:
+            channels[channel.guild.id] = channel
+    
+    return channels
+
+async def send_daily_affirmation():
+    results = await bot.broadcaster.broadcast(daily_run_name(), daily_affirmation_channels(), post_daily_affirmation)
+    print(f"Daily affirmation: sent {results['sent']}, skipped {results['skipped']}, failed {results['failed']}")
+
+async def post_daily_affirmation(channel):
+    # Posted in the server's language, if it has one
+    daily_msg = bot.locales.pack_for(guild_id=channel.guild.id).draw("general", reader=channel.id)
+    if daily_msg is None:
+        return
+    
+    embed = discord.Embed(
+        title="💖 Daily Affirmation",
+        description=daily_msg,
+        color=discord.Color.from_rgb(255, 105, 180)  # Pink color
+    )
+    embed.set_footer(text="Slayy Mom loves you! 🌈")
+    
+    await bot.send_throttle.acquire(channel.id)
+    await channel.send(embed=embed)
 
 @daily_affirmation.before_loop
 async def before_daily_affirmation():
@@ -196,101 +462,113 @@ async def before_daily_affirmation():
     await asyncio.sleep((target_time - now).total_seconds())
 
 # Help command
+# Per-command help pages; {prefix} is filled in when the embed is built
+HELP_PAGES = {
+    "pronouns": {
+        "title": "Pronouns Command",
+        "description": "Set your preferred pronouns with `{prefix}pronouns <your pronouns>`.\n\nExamples:\n`{prefix}pronouns she/her`\n`{prefix}pronouns they/them`\n`{prefix}pronouns he/they`"
+    },
+    "trigger": {
+        "title": "Trigger Command",
+        "description": "Add or remove trigger words with `{prefix}trigger add <word>` or `{prefix}trigger remove <word>`.\nUse `{prefix}trigger addword <word>` for a word that shouldn't match inside longer words.\nView your triggers with `{prefix}trigger list`."
+    },
+    "birthday": {
+        "title": "Birthday Command",
+        "description": "Set your birthday with `{prefix}birthday DD-MM-YYYY`.\nI'll remember and celebrate with you!"
+    },
+    "language": {
+        "title": "Language Command",
+        "description": "Choose the language for your affirmations and resources with `{prefix}language <code>`, or see what's available with `{prefix}language`.\n`{prefix}language reset` goes back to the server's language, and moderators can set that with `{prefix}language server <code>`."
+    },
+    "affirmation": {
+        "title": "Affirmation Command",
+        "description": "Get a positive affirmation with `{prefix}affirmation`."
+    },
+    "comfort": {
+        "title": "Comfort Command",
+        "description": "Receive comforting words with `{prefix}comfort`."
+    },
+    "vent": {
+        "title": "Vent Command",
+        "description": "Create a private thread to vent with `{prefix}vent`.\nI'll be there to listen and support you."
+    },
+    "resources": {
+        "title": "Resources Command",
+        "description": "Get LGBTQIA+ resources with `{prefix}resources`.\nYou can also specify a category: `{prefix}resources communities`, `{prefix}resources youtube`, or `{prefix}resources support`.\nSearch them all with `{prefix}resources search <words>`."
+    },
+    "tw": {
+        "title": "Trigger Warning Command",
+        "description": "Add a trigger warning to your message with `{prefix}tw <topic> <your message>`.\nThis will put your message in a spoiler with a warning."
+    },
+    "forgetme": {
+        "title": "Forget Me Command",
+        "description": "Delete all your stored data with `{prefix}forgetme`.\nThis action cannot be undone."
+    }
+}
+
+def build_help_embed(topic=None):
+    """Build the general help menu, or the help page for one command"""
+    if topic is not None:
+        info = HELP_PAGES[topic]
+        return discord.Embed(
+            title=info["title"],
+            description=info["description"].format(prefix=PREFIX),
+            color=discord.Color.from_rgb(233, 30, 99)
+        )
+    
+    embed = discord.Embed(
+        title="Slayy Mom Bot - Help Menu",
+        description="I'm your supportive Discord mom! Here are my commands:",
+        color=discord.Color.from_rgb(233, 30, 99)
+    )
+    
+    embed.add_field(
+        name="🔧 User Setup",
+        value=f"`{PREFIX}pronouns` - Set your preferred pronouns\n"
+              f"`{PREFIX}trigger` - Add words to your trigger list\n"
+              f"`{PREFIX}birthday` - Set your birthday for celebrations\n"
+              f"`{PREFIX}language` - Choose your language",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💖 Support & Affirmations",
+        value=f"`{PREFIX}affirmation` - Get a positive affirmation\n"
+              f"`{PREFIX}comfort` - Receive comforting words\n"
+              f"`{PREFIX}vent` - Create a private thread to vent",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🛡️ Safety & Resources",
+        value=f"`{PREFIX}resources` - Get LGBTQIA+ resources\n"
+              f"`{PREFIX}tw <topic>` - Add a trigger warning\n"
+              f"`{PREFIX}forgetme` - Delete your stored data",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="ℹ️ More Info",
+        value=f"Type `{PREFIX}help <command>` for more details on a specific command.",
+        inline=False
+    )
+    
+    embed.set_footer(text="Slayy Mom loves you unconditionally! 🌈")
+    return embed
+
 @bot.command(name="help")
 async def help_command(ctx, command=None):
-    if command is None:
-        # General help menu
+    topic = command.lower() if command else None
+    
+    if topic is None or topic in HELP_PAGES:
+        # Help pages only change with the prefix, so they are built once
+        embed = bot.embed_templates.get(("help", topic), PREFIX, lambda: build_help_embed(topic))
+    else:
         embed = discord.Embed(
-            title="Slayy Mom Bot - Help Menu",
-            description="I'm your supportive Discord mom! Here are my commands:",
-            color=discord.Color.from_rgb(233, 30, 99)
+            title="Command Not Found",
+            description=f"I couldn't find information for `{command}`.\nUse `{PREFIX}help` to see all available commands.",
+            color=discord.Color.red()
         )
-        
-        embed.add_field(
-            name="🔧 User Setup",
-            value=f"`{PREFIX}pronouns` - Set your preferred pronouns\n"
-                  f"`{PREFIX}trigger` - Add words to your trigger list\n"
-                  f"`{PREFIX}birthday` - Set your birthday for celebrations",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="💖 Support & Affirmations",
-            value=f"`{PREFIX}affirmation` - Get a positive affirmation\n"
-                  f"`{PREFIX}comfort` - Receive comforting words\n"
-                  f"`{PREFIX}vent` - Create a private thread to vent",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🛡️ Safety & Resources",
-            value=f"`{PREFIX}resources` - Get LGBTQIA+ resources\n"
-                  f"`{PREFIX}tw <topic>` - Add a trigger warning\n"
-                  f"`{PREFIX}forgetme` - Delete your stored data",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="ℹ️ More Info",
-            value=f"Type `{PREFIX}help <command>` for more details on a specific command.",
-            inline=False
-        )
-        
-        embed.set_footer(text="Slayy Mom loves you unconditionally! 🌈")
-    else:
-        # Specific command help
-        command_info = {
-            "pronouns": {
-                "title": "Pronouns Command",
-                "description": f"Set your preferred pronouns with `{PREFIX}pronouns <your pronouns>`.\n\nExamples:\n`{PREFIX}pronouns she/her`\n`{PREFIX}pronouns they/them`\n`{PREFIX}pronouns he/they`"
-            },
-            "trigger": {
-                "title": "Trigger Command",
-                "description": f"Add or remove trigger words with `{PREFIX}trigger add <word>` or `{PREFIX}trigger remove <word>`.\nView your triggers with `{PREFIX}trigger list`."
-            },
-            "birthday": {
-                "title": "Birthday Command",
-                "description": f"Set your birthday with `{PREFIX}birthday DD-MM-YYYY`.\nI'll remember and celebrate with you!"
-            },
-            "affirmation": {
-                "title": "Affirmation Command",
-                "description": f"Get a positive affirmation with `{PREFIX}affirmation`."
-            },
-            "comfort": {
-                "title": "Comfort Command",
-                "description": f"Receive comforting words with `{PREFIX}comfort`."
-            },
-            "vent": {
-                "title": "Vent Command",
-                "description": f"Create a private thread to vent with `{PREFIX}vent`.\nI'll be there to listen and support you."
-            },
-            "resources": {
-                "title": "Resources Command",
-                "description": f"Get LGBTQIA+ resources with `{PREFIX}resources`.\nYou can also specify a category: `{PREFIX}resources communities`, `{PREFIX}resources youtube`, or `{PREFIX}resources support`."
-            },
-            "tw": {
-                "title": "Trigger Warning Command",
-                "description": f"Add a trigger warning to your message with `{PREFIX}tw <topic> <your message>`.\nThis will put your message in a spoiler with a warning."
-            },
-            "forgetme": {
-                "title": "Forget Me Command",
-                "description": f"Delete all your stored data with `{PREFIX}forgetme`.\nThis action cannot be undone."
-            }
-        }
-        
-        if command.lower() in command_info:
-            info = command_info[command.lower()]
-            embed = discord.Embed(
-                title=info["title"],
-                description=info["description"],
-                color=discord.Color.from_rgb(233, 30, 99)
-            )
-        else:
-            embed = discord.Embed(
-                title="Command Not Found",
-                description=f"I couldn't find information for `{command}`.\nUse `{PREFIX}help` to see all available commands.",
-                color=discord.Color.red()
-            )
     
     await ctx.send(embed=embed)
 
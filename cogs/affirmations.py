@@ -1,35 +1,71 @@
 import discord
 from discord.ext import commands
-import json
-import os
 import random
 import asyncio
+import time
+
+CELEBRATION_MESSAGES = [
+    "🎉 CONGRATULATIONS on {achievement}! I'm so incredibly proud of you!",
+    "🌟 That's amazing! {achievement} is such a wonderful accomplishment!",
+    "💖 My heart is bursting with pride! {achievement} is worth celebrating!",
+    "🎊 WOW! {achievement} is a huge deal! You should be so proud of yourself!",
+    "✨ Look at you go! {achievement} is proof of your hard work and dedication!"
+]
+
+COMFORT_RESPONSES = [
+    "Thank you for sharing that with me. It takes courage to be vulnerable.",
+    "I hear you, and your feelings are completely valid.",
+    "I'm so proud of you for expressing yourself. That can be really hard sometimes.",
+    "You're not alone in feeling this way. I'm here for you.",
+    "Thank you for trusting me with your thoughts. Is there anything specific you need right now?",
+    "It sounds like you're going through a lot. Remember to be gentle with yourself."
+]
+
+# How long a vent thread waits for the user's first message before checking in
+VENT_REPLY_TIMEOUT = 600.0
+
+def celebration_message(achievement):
+    """Pick one of mom's celebration lines for an achievement"""
+    return random.choice(CELEBRATION_MESSAGES).format(achievement=achievement)
 
 class Affirmations(commands.Cog):
     """Commands for affirmations and emotional support"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.affirmations_file = os.path.join("data", "affirmations.json")
+        self._vent_tasks = {}
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Pick back up the vents that were still waiting when the bot stopped
+        await self.bot.data_loaded.wait()
+        for thread_id, user_id, expires_at in self.bot.vent_tracker.items():
+            if thread_id not in self._vent_tasks:
+                self.follow_up_vent(thread_id, user_id, expires_at)
+    
+    async def cog_unload(self):
+        for task in list(self._vent_tasks.values()):
+            task.cancel()
     
     def load_affirmations(self):
-        try:
-            with open(self.affirmations_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"general": [], "comfort": []}
+        return self.bot.affirmations_cache.get()
+    
+    def draw(self, category, ctx):
+        """Pick a line the user didn't just see, in their language and preferring ones tagged with their pronouns"""
+        profile = self.bot.profile_store.get(ctx.author.id)
+        pronouns = profile.pronouns if profile else None
+        pack = self.bot.locales.pack_for(profile, ctx.guild.id if ctx.guild else None)
+        return pack.draw(category, reader=ctx.author.id, tag=pronouns)
     
     @commands.command(name="affirmation")
     async def get_affirmation(self, ctx):
         """Get a positive affirmation"""
-        affirmations = self.load_affirmations()
+        affirmation = self.draw("general", ctx)
         
-        if not affirmations.get("general"):
+        if affirmation is None:
             await ctx.send("I don't have any affirmations yet. Please add some first!")
             return
         
-        affirmation = random.choice(affirmations["general"])
-        
         embed = discord.Embed(
             title="💖 Affirmation for You",
             description=affirmation,
@@ -42,14 +78,12 @@ class Affirmations(commands.Cog):
     @commands.command(name="comfort")
     async def comfort(self, ctx):
         """Get comforting words when you're feeling down"""
-        affirmations = self.load_affirmations()
+        comfort_msg = self.draw("comfort", ctx)
         
-        if not affirmations.get("comfort"):
+        if comfort_msg is None:
             await ctx.send("I don't have any comfort messages yet. Please add some first!")
             return
         
-        comfort_msg = random.choice(affirmations["comfort"])
-        
         embed = discord.Embed(
             title="🫂 Mom's Here For You",
             description=comfort_msg,
@@ -89,52 +123,87 @@ class Affirmations(commands.Cog):
             
             await thread.send(embed=embed)
             
-            # Send follow-up comfort message after user vents
-            def check(m):
-                return m.author == ctx.author and m.channel == thread
-            
-            try:
-                # Wait for the user to send a message in the thread
-                await self.bot.wait_for('message', check=check, timeout=600.0)  # 10 minute timeout
-                
-                # Wait a moment before responding
-                await asyncio.sleep(2)
-                
-                # Send a comforting response
-                comfort_responses = [
-                    "Thank you for sharing that with me. It takes courage to be vulnerable.",
-                    "I hear you, and your feelings are completely valid.",
-                    "I'm so proud of you for expressing yourself. That can be really hard sometimes.",
-                    "You're not alone in feeling this way. I'm here for you.",
-                    "Thank you for trusting me with your thoughts. Is there anything specific you need right now?",
-                    "It sounds like you're going through a lot. Remember to be gentle with yourself."
-                ]
-                
-                await thread.send(random.choice(comfort_responses))
-                
-            except asyncio.TimeoutError:
-                # If user doesn't send anything within timeout period
-                await thread.send("I'm still here if you need to talk. Take your time. 💜")
+            # Follow up once the user has vented; the follow-up survives a restart
+            expires_at = time.time() + VENT_REPLY_TIMEOUT
+            self.follow_up_vent(thread.id, ctx.author.id, expires_at)
+            await self.bot.vent_tracker.open(thread.id, ctx.author.id, expires_at)
         
         except discord.Forbidden:
             await ctx.send("I don't have permission to create threads in this channel.")
         except discord.HTTPException:
             await ctx.send("I couldn't create a thread. Please try again later.")
     
+    def follow_up_vent(self, thread_id, user_id, expires_at):
+        task = asyncio.create_task(self.vent_follow_up(thread_id, user_id, expires_at))
+        self._vent_tasks[thread_id] = task
+        task.add_done_callback(lambda _: self._vent_tasks.pop(thread_id, None))
+    
+    async def vent_follow_up(self, thread_id, user_id, expires_at):
+        """Comfort the user after their first message in a vent thread, or check in if none comes"""
+        if time.time() > expires_at + VENT_REPLY_TIMEOUT:
+            # The bot was down long enough that a late check-in would only confuse
+            await self.bot.vent_tracker.close(thread_id)
+            return
+        
+        try:
+            await self.bot.replies.wait(thread_id, user_id, timeout=max(0.0, expires_at - time.time()))
+        except asyncio.TimeoutError:
+            # If user doesn't send anything within timeout period
+            response = "I'm still here if you need to talk. Take your time. 💜"
+        else:
+            # Wait a moment before responding
+            await asyncio.sleep(2)
+            response = random.choice(COMFORT_RESPONSES)
+        
+        await self.bot.vent_tracker.close(thread_id)
+        try:
+            thread = self.bot.get_channel(thread_id) or await self.bot.fetch_channel(thread_id)
+            await thread.send(response)
+        except discord.HTTPException:
+            pass  # The thread was deleted or is no longer reachable
+    
+    @commands.group(name="dailychannel", invoke_without_command=True)
+    @commands.guild_only()
+    async def daily_channel(self, ctx):
+        """Show which channel gets the daily affirmation in this server"""
+        channel_id = self.bot.guild_settings.get(ctx.guild.id, "affirmation_channel")
+        channel = ctx.guild.get_channel(channel_id) if channel_id else None
+        
+        if channel is None:
+            await ctx.send(f"Daily affirmations aren't set up here yet. Use `{ctx.prefix}dailychannel set #channel` to choose a channel.")
+        else:
+            await ctx.send(f"Daily affirmations are posted in {channel.mention}.")
+    
+    @daily_channel.command(name="set")
+    @commands.has_permissions(manage_guild=True)
+    async def daily_channel_set(self, ctx, channel: discord.TextChannel):
+        """Post the daily affirmation in a channel (Requires Manage Server permission)"""
+        await self.bot.guild_settings.set(ctx.guild.id, "affirmation_channel", channel.id)
+        await ctx.send(f"💖 I'll post a daily affirmation in {channel.mention} every morning!")
+    
+    @daily_channel.command(name="off")
+    @commands.has_permissions(manage_guild=True)
+    async def daily_channel_off(self, ctx):
+        """Stop posting daily affirmations in this server (Requires Manage Server permission)"""
+        await self.bot.guild_settings.set(ctx.guild.id, "affirmation_channel", None)
+        await ctx.send("Daily affirmations are turned off for this server.")
+    
+    @daily_channel_set.error
+    @daily_channel_off.error
+    async def daily_channel_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("You need the Manage Server permission to change the daily affirmation channel.")
+        elif isinstance(error, commands.ChannelNotFound):
+            await ctx.send("I couldn't find that channel.")
+        else:
+            await ctx.send(f"An error occurred: {error}")
+    
     @commands.command(name="celebrate")
     async def celebrate(self, ctx, *, achievement):
         """Celebrate an achievement or milestone"""
-        celebration_messages = [
-            f"🎉 CONGRATULATIONS on {achievement}! I'm so incredibly proud of you!",
-            f"🌟 That's amazing! {achievement} is such a wonderful accomplishment!",
-            f"💖 My heart is bursting with pride! {achievement} is worth celebrating!",
-            f"🎊 WOW! {achievement} is a huge deal! You should be so proud of yourself!",
-            f"✨ Look at you go! {achievement} is proof of your hard work and dedication!"
-        ]
-        
         embed = discord.Embed(
             title="Time to Celebrate!",
-            description=random.choice(celebration_messages),
+            description=celebration_message(achievement),
             color=discord.Color.gold()
         )
         embed.set_footer(text="I'm always here to celebrate your wins, big and small! 💕")
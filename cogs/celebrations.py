@@ -0,0 +1,130 @@
+import discord
+from discord.ext import commands, tasks
+import asyncio
+import datetime
+import os
+from cogs.affirmations import celebration_message
+from utils.broadcaster import Broadcaster
+from utils.sharding import cluster_file, handles_user
+
+# Celebrants per embed, to stay well inside Discord's description limit
+LINES_PER_EMBED = 15
+
+class Celebrations(commands.Cog):
+    """Celebrates birthdays and milestone anniversaries every morning"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.broadcaster = Broadcaster(cluster_file(os.path.join("data", "celebration_progress.log"), bot.cluster_id))
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Started here rather than in cog_load, which runs before login
+        if not self.daily_celebrations.is_running():
+            self.daily_celebrations.start()
+    
+    async def cog_unload(self):
+        self.daily_celebrations.cancel()
+    
+    def run_name(self, today):
+        return f"celebrations-{today.isoformat()}"
+    
+    def celebration_channels(self):
+        """Map guild -> channel for every guild with a daily affirmation channel"""
+        channels = {}
+        for guild_id, channel_id in self.bot.guild_settings.guilds_with("affirmation_channel").items():
+            guild = self.bot.get_guild(guild_id)
+            channel = guild.get_channel(channel_id) if guild else None
+            if channel:
+                channels[guild] = channel
+        return channels
+    
+    def milestone_text(self, date, description, today):
+        years = today.year - date.year
+        if years == 0:
+            return description
+        return f"{years} year{'s' if years != 1 else ''} since {description}"
+    
+    async def send_celebrations(self, today):
+        """Celebrate everyone whose birthday or milestone falls on today"""
+        entries = self.bot.celebrations.due(today)
+        if not entries:
+            return
+        
+        targets = {}
+        
+        # Birthdays are celebrated together in each server's channel
+        birthdays = [entry for entry in entries if entry[1] == "birthday"]
+        if birthdays:
+            for guild, channel in self.celebration_channels().items():
+                lines = []
+                for user_id, _, _, _ in birthdays:
+                    member = guild.get_member(int(user_id))
+                    if member:
+                        lines.append(f"🎂 {member.mention} {celebration_message('another year of being wonderfully you')}")
+                if lines:
+                    targets[f"guild:{guild.id}"] = (channel, self.build_embeds(lines))
+        
+        # Milestones can be personal, so they are celebrated privately.
+        # In a sharded launch only one process sends each user's DMs.
+        for user_id, kind, date, description in entries:
+            if kind != "milestone" or not handles_user(self.bot, user_id):
+                continue
+            user = self.bot.get_user(int(user_id))
+            if user is None and self.bot.shard_count:
+                # The user's servers may all be cached by other processes
+                try:
+                    user = await self.bot.fetch_user(int(user_id))
+                except discord.HTTPException:
+                    user = None
+            if user:
+                line = celebration_message(self.milestone_text(date, description, today))
+                targets[f"dm:{user_id}:{date.isoformat()}"] = (user, self.build_embeds([line]))
+        
+        results = await self.broadcaster.broadcast(self.run_name(today), targets, self.send_target)
+        print(f"Celebrations: sent {results['sent']}, skipped {results['skipped']}, failed {results['failed']}")
+    
+    def build_embeds(self, lines):
+        embeds = []
+        for start in range(0, len(lines), LINES_PER_EMBED):
+            embed = discord.Embed(
+                title="Time to Celebrate!",
+                description="\n\n".join(lines[start:start + LINES_PER_EMBED]),
+                color=discord.Color.gold()
+            )
+            embed.set_footer(text="I'm always here to celebrate your wins, big and small! 💕")
+            embeds.append(embed)
+        return embeds
+    
+    async def send_target(self, target):
+        destination, embeds = target
+        for embed in embeds:
+            await self.bot.send_throttle.acquire(destination.id)
+            await destination.send(embed=embed)
+    
+    @tasks.loop(hours=24)
+    async def daily_celebrations(self):
+        with self.bot.loop_watchdog.track("daily_celebrations"):
+            await self.send_celebrations(datetime.date.today())
+    
+    @daily_celebrations.before_loop
+    async def before_daily_celebrations(self):
+        await self.bot.wait_until_ready()
+        await self.bot.data_loaded.wait()
+        
+        # Finish today's celebrations if a restart interrupted them
+        today = datetime.date.today()
+        if self.broadcaster.is_unfinished(self.run_name(today)):
+            await self.send_celebrations(today)
+        
+        # Celebrate at the same time as the daily affirmation (9:00 AM)
+        now = datetime.datetime.now()
+        target_time = datetime.datetime(now.year, now.month, now.day, 9, 0)
+        
+        if now > target_time:
+            target_time = target_time + datetime.timedelta(days=1)
+        
+        await asyncio.sleep((target_time - now).total_seconds())
+
+async def setup(bot):
+    await bot.add_cog(Celebrations(bot))
@@ -0,0 +1,134 @@
+import asyncio
+import discord
+from discord.ext import commands
+
+class Diagnostics(commands.Cog):
+    """Owner-only commands for finding performance problems"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    @commands.command(name="loopstats", hidden=True)
+    @commands.is_owner()
+    async def loop_stats(self, ctx, show_stack: bool = False):
+        """Show event-loop lag and the most recent stalls"""
+        stats = self.bot.loop_watchdog.summary()
+        
+        embed = discord.Embed(
+            title="🩺 Event Loop Health",
+            description=(
+                f"Current lag: **{stats['last_lag'] * 1000:.0f}ms**\n"
+                f"Worst lag since start: **{stats['max_lag'] * 1000:.0f}ms**\n"
+                f"Recorded stalls: **{stats['stall_count']}**"
+            ),
+            color=discord.Color.blue()
+        )
+        
+        # Most recent stalls first
+        for stall in reversed(stats["stalls"][-5:]):
+            embed.add_field(
+                name=f"{stall['label']} — {stall['lag'] * 1000:.0f}ms",
+                value=f"at {stall['at'].strftime('%H:%M:%S')}",
+                inline=False
+            )
+        
+        await ctx.send(embed=embed)
+        
+        # Stack samples can be long, so they go to the owner's DMs
+        if show_stack and stats["stalls"] and stats["stalls"][-1]["stack"]:
+            stack = stats["stalls"][-1]["stack"][-1900:]
+            await ctx.author.send(f"```\n{stack}\n```")
+    
+    @loop_stats.error
+    async def loop_stats_error(self, ctx, error):
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("Only the bot owner can use this command.")
+        else:
+            await ctx.send(f"An error occurred: {error}")
+
+    @commands.group(name="profile", hidden=True, invoke_without_command=True)
+    @commands.is_owner()
+    async def profile(self, ctx):
+        """Show whether the sampling profiler is running"""
+        profiler = self.bot.profiler
+        if not profiler.active:
+            await ctx.send(
+                f"The profiler is idle. Use `{ctx.prefix}profile for <seconds>` or "
+                f"`{ctx.prefix}profile next <count> <command>` to start it."
+            )
+        elif profiler.command:
+            await ctx.send(
+                f"Profiling `{profiler.command}`: {profiler.remaining} invocations to go, "
+                f"{profiler.samples} samples so far."
+            )
+        else:
+            await ctx.send(f"Profiling everything: {profiler.samples} samples so far.")
+    
+    @profile.command(name="for")
+    @commands.is_owner()
+    async def profile_for(self, ctx, seconds: float):
+        """Profile the whole bot for a number of seconds"""
+        if not 1 <= seconds <= self.bot.profiler.max_duration:
+            await ctx.send(f"Pick a window between 1 and {self.bot.profiler.max_duration:.0f} seconds.")
+            return
+        await self.start_profile(ctx, f"everything for {seconds:g}s", duration=seconds)
+    
+    @profile.command(name="next")
+    @commands.is_owner()
+    async def profile_next(self, ctx, count: int, *, command_name: str):
+        """Profile the next few invocations of one command, e.g. `profile next 20 trigger add`"""
+        command = self.bot.get_command(command_name)
+        if command is None:
+            await ctx.send(f"I don't have a command called `{command_name}`.")
+            return
+        if count < 1:
+            await ctx.send("The invocation count must be at least 1.")
+            return
+        await self.start_profile(
+            ctx,
+            f"the next {count} uses of `{command.qualified_name}`",
+            command=command.qualified_name,
+            invocations=count
+        )
+    
+    @profile.command(name="stop")
+    @commands.is_owner()
+    async def profile_stop(self, ctx):
+        """Stop the running profile early and write what it has"""
+        if not self.bot.profiler.active:
+            await ctx.send("The profiler isn't running.")
+            return
+        self.bot.profiler.stop()
+    
+    async def start_profile(self, ctx, description, **options):
+        try:
+            done = self.bot.profiler.start(**options)
+        except RuntimeError:
+            await ctx.send(f"A profile is already running. Use `{ctx.prefix}profile stop` to end it first.")
+            return
+        await ctx.send(f"🔬 Profiling {description}.")
+        # Report back once the profile is written, without holding up this command
+        asyncio.create_task(self.report_profile(ctx, done))
+    
+    async def report_profile(self, ctx, done):
+        try:
+            path, samples = await done
+        except OSError as e:
+            await ctx.send(f"The profile couldn't be written: {e}")
+            return
+        await ctx.send(f"🔬 Profile finished with {samples} samples, written to `{path}`.")
+    
+    @profile.error
+    @profile_for.error
+    @profile_next.error
+    @profile_stop.error
+    async def profile_error(self, ctx, error):
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("Only the bot owner can use this command.")
+        elif isinstance(error, (commands.MissingRequiredArgument, commands.BadArgument)):
+            await ctx.send(f"Usage: `{ctx.prefix}profile for <seconds>` or `{ctx.prefix}profile next <count> <command>`")
+        else:
+            await ctx.send(f"An error occurred: {error}")
+
+async def setup(bot):
+    await bot.add_cog(Diagnostics(bot))
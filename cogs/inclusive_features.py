@@ -1,35 +1,105 @@
 import discord
 from discord.ext import commands
-import json
-import os
 import datetime
+import typing
+from utils.outbound import run_bounded
+
+PRIDE_FLAGS = {
+    "rainbow": {
+        "colors": [0xFF0000, 0xFF7F00, 0xFFFF00, 0x00FF00, 0x0000FF, 0x4B0082, 0x9400D3],
+        "message": "Pride is about celebrating the beautiful diversity of the LGBTQIA+ community!"
+    },
+    "trans": {
+        "colors": [0x55CDFC, 0xF7A8B8, 0xFFFFFF, 0xF7A8B8, 0x55CDFC],
+        "message": "Trans rights are human rights! You are valid, seen, and loved."
+    },
+    "bi": {
+        "colors": [0xD60270, 0x9B4F96, 0x0038A8],
+        "message": "Bi visibility matters! Your identity is valid regardless of your relationship."
+    },
+    "pan": {
+        "colors": [0xFF1B8D, 0xFFDA00, 0x1BB3FF],
+        "message": "Pan pride! Love knows no gender boundaries."
+    },
+    "ace": {
+        "colors": [0x000000, 0xA4A4A4, 0xFFFFFF, 0x810081],
+        "message": "Ace pride! Your identity is valid and important."
+    },
+    "nb": {
+        "colors": [0xFFF430, 0xFFFFFF, 0x9C59D1, 0x000000],
+        "message": "Non-binary pride! Gender is a spectrum, and you are valid wherever you are on it."
+    }
+}
+
+# Active warnings -> length in minutes of the automatic timeout that follows.
+# Warnings past the last threshold repeat its timeout.
+ESCALATION_MINUTES = {3: 60, 5: 24 * 60}
+
+# Results shown by !resources search
+RESOURCE_SEARCH_RESULTS = 5
+
+# Moderation history entries per !modlog page
+MODLOG_PAGE_SIZE = 10
+
+# Bulk moderation runs this many members' timeouts and DMs at once,
+# and acts on at most MAX_BULK_TARGETS members per command
+BULK_CONCURRENCY = 8
+MAX_BULK_TARGETS = 200
+
+def escalation_reason(count):
+    return f"Automatic timeout after {count} warnings"
+
+def escalation_minutes(count):
+    """Minutes of automatic timeout for a member with count active warnings, or None"""
+    if count in ESCALATION_MINUTES:
+        return ESCALATION_MINUTES[count]
+    highest = max(ESCALATION_MINUTES)
+    return ESCALATION_MINUTES[highest] if count > highest else None
+
+class RecentJoins(commands.Converter):
+    """Converts "joined:N" into every member who joined in the last N minutes"""
+    
+    async def convert(self, ctx, argument):
+        prefix, _, minutes = argument.partition(":")
+        if prefix.lower() != "joined" or not minutes.isdigit():
+            raise commands.BadArgument(f"{argument} is not a member or joined:<minutes>")
+        cutoff = discord.utils.utcnow() - datetime.timedelta(minutes=int(minutes))
+        return [member for member in ctx.guild.members if member.joined_at and member.joined_at >= cutoff]
+
+def describe_failure(error):
+    if isinstance(error, discord.Forbidden):
+        return "missing permission (their role may be above mine)"
+    if isinstance(error, discord.HTTPException):
+        return f"Discord error {error.status}"
+    return str(error)
+
+def build_bulk_summary(title, reason, lines):
+    """One embed listing every member's result, trimmed to Discord's description limit"""
+    description = ""
+    for index, line in enumerate(lines):
+        if len(description) + len(line) + 40 > 4000:
+            description += f"...and {len(lines) - index} more"
+            break
+        description += line + "\n"
+    embed = discord.Embed(title=title, description=description, color=discord.Color.orange())
+    embed.add_field(name="Reason", value=reason)
+    return embed
 
 class InclusiveFeatures(commands.Cog):
     """Commands for inclusive features and safety tools"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.resources_file = os.path.join("data", "resources.json")
     
-    def load_resources(self):
-        try:
-            with open(self.resources_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+    def resource_pack(self, ctx):
+        """The locale pack whose resources this user should see"""
+        profile = self.bot.profile_store.get(ctx.author.id)
+        return self.bot.locales.pack_for(profile, ctx.guild.id if ctx.guild else None).resource_pack()
     
-    @commands.command(name="resources")
-    async def resources(self, ctx, category=None):
-        """Get LGBTQIA+ resources"""
-        resources = self.load_resources()
-        
-        if not resources:
-            await ctx.send("I don't have any resources available yet.")
-            return
-        
-        if category and category.lower() in resources:
+    def build_resources_embed(self, resources, category_name=None):
+        """Build the overview embed, or the embed for one category"""
+        if category_name is not None:
             # Show specific category
-            category_name = category.lower()
             category_resources = resources[category_name]
             
             embed = discord.Embed(
@@ -64,6 +134,54 @@ class InclusiveFeatures(commands.Cog):
                 )
         
         embed.set_footer(text="Remember that you're not alone. There's a whole community here for you! 🌈")
+        return embed
+    
+    @commands.group(name="resources", invoke_without_command=True)
+    async def resources(self, ctx, category=None):
+        """Get LGBTQIA+ resources"""
+        pack = self.resource_pack(ctx)
+        resources = pack.resources_cache.get()
+        
+        if not resources:
+            await ctx.send("I don't have any resources available yet.")
+            return
+        
+        category_name = category.lower() if category and category.lower() in resources else None
+        
+        # Rebuilt only when the pack's resources.json changes
+        embed = self.bot.embed_templates.get(
+            ("resources", pack.locale, category_name),
+            pack.resources_version,
+            lambda: self.build_resources_embed(resources, category_name)
+        )
+        await ctx.send(embed=embed)
+    
+    @resources.command(name="search")
+    async def resources_search(self, ctx, *, query=None):
+        """Search every resource by name, description and category"""
+        if not query:
+            await ctx.send(f"Tell me what you're looking for, e.g. `{ctx.prefix}resources search crisis line`.")
+            return
+        
+        index = self.resource_pack(ctx).resource_index
+        results = index.search(query, limit=RESOURCE_SEARCH_RESULTS)
+        if not results:
+            suggestions = index.complete(query, limit=5)
+            hint = f" Try: {', '.join(suggestions)}" if suggestions else ""
+            await ctx.send(f"I couldn't find any resources matching '{query}'.{hint}")
+            return
+        
+        embed = discord.Embed(
+            title=f"Resources matching '{query}'",
+            color=discord.Color.from_rgb(255, 20, 147)  # Deep pink
+        )
+        for category_name, resource in results:
+            embed.add_field(
+                name=f"{resource['name']} ({category_name})",
+                value=f"[{resource['description']}]({resource['url']})",
+                inline=False
+            )
+        embed.set_footer(text="Remember that you're not alone. There's a whole community here for you! 🌈")
         await ctx.send(embed=embed)
     
     @commands.command(name="tw", aliases=["trigger_warning"])
@@ -94,25 +212,52 @@ class InclusiveFeatures(commands.Cog):
     async def warn_user(self, ctx, member: discord.Member, *, reason=None):
         """Warn a user for inappropriate behavior (Requires Manage Messages permission)"""
         reason = reason or "No reason provided"
+        count = await self.bot.moderation.add_warning(ctx.guild.id, member.id, ctx.author.id, reason)
         
         # DM the user
         try:
-            embed = discord.Embed(
-                title="Warning",
-                description=f"You have received a warning in {ctx.guild.name}",
-                color=discord.Color.red()
-            )
-            embed.add_field(name="Reason", value=reason)
-            embed.add_field(name="Warned by", value=ctx.author.display_name)
-            embed.set_footer(text="Please review the server rules. Repeated warnings may result in further action.")
-            
-            await member.send(embed=embed)
+            await member.send(embed=self.build_warning_embed(ctx, reason, count))
             
             # Confirmation in channel
-            await ctx.send(f"✅ {member.mention} has been warned. Reason: {reason}")
+            await ctx.send(f"✅ {member.mention} has been warned ({count} active). Reason: {reason}")
             
         except discord.Forbidden:
-            await ctx.send(f"⚠️ Could not DM {member.mention}, but the warning has been recorded. Reason: {reason}")
+            await ctx.send(f"⚠️ Could not DM {member.mention}, but the warning has been recorded ({count} active). Reason: {reason}")
+        
+        try:
+            minutes = await self.escalate(member, count)
+        except discord.HTTPException:
+            await ctx.send(f"⚠️ {member.mention} has {count} active warnings, but I couldn't time them out.")
+        else:
+            if minutes:
+                await self.bot.moderation.add_timeout(ctx.guild.id, member.id, self.bot.user.id, minutes, escalation_reason(count))
+                await ctx.send(f"⏳ {member.mention} has {count} active warnings and has been timed out for {minutes} minutes.")
+    
+    def build_warning_embed(self, ctx, reason, count):
+        embed = discord.Embed(
+            title="Warning",
+            description=f"You have received a warning in {ctx.guild.name}",
+            color=discord.Color.red()
+        )
+        embed.add_field(name="Reason", value=reason)
+        embed.add_field(name="Warned by", value=ctx.author.display_name)
+        embed.add_field(name="Active warnings", value=str(count))
+        embed.set_footer(text="Please review the server rules. Repeated warnings may result in further action.")
+        return embed
+    
+    async def escalate(self, member, count):
+        """Time a member out automatically when their warnings reach a threshold
+
+        Returns the timeout length in minutes, or None below the thresholds.
+        Recording the timeout in the ledger is left to the caller, so a bulk
+        warning can record every escalation in one go.
+        """
+        minutes = escalation_minutes(count)
+        if minutes is None:
+            return None
+        
+        await member.timeout(discord.utils.utcnow() + datetime.timedelta(minutes=minutes), reason=escalation_reason(count))
+        return minutes
     
     @warn_user.error
     async def warn_user_error(self, ctx, error):
@@ -133,6 +278,7 @@ class InclusiveFeatures(commands.Cog):
             # Convert minutes to seconds for the timeout duration
             duration_seconds = duration * 60
             await member.timeout(discord.utils.utcnow() + datetime.timedelta(seconds=duration_seconds), reason=reason)
+            await self.bot.moderation.add_timeout(ctx.guild.id, member.id, ctx.author.id, duration, reason)
             
             embed = discord.Embed(
                 title="User Timed Out",
@@ -165,58 +311,209 @@ class InclusiveFeatures(commands.Cog):
         else:
             await ctx.send(f"An error occurred: {error}")
     
+    @commands.command(name="massmute")
+    @commands.guild_only()
+    @commands.has_permissions(moderate_members=True)
+    async def mass_mute(self, ctx, duration: int, targets: commands.Greedy[typing.Union[discord.Member, RecentJoins]], *, reason=None):
+        """Timeout many members at once, e.g. during a raid (Requires Moderate Members permission)"""
+        members = self.bulk_targets(ctx, targets)
+        if not members:
+            await self.send_no_targets(ctx, "mute", reason)
+            return
+        reason = reason or "No reason provided"
+        until = discord.utils.utcnow() + datetime.timedelta(minutes=duration)
+        
+        async def mute(member):
+            await member.timeout(until, reason=reason)
+            return await self.try_dm(member, content=f"You have been timed out in {ctx.guild.name} for {duration} minutes. Reason: {reason}")
+        
+        async with ctx.typing():
+            results = await run_bounded(members, mute, BULK_CONCURRENCY)
+            muted = [member.id for member, result in zip(members, results) if not isinstance(result, Exception)]
+            if muted:
+                await self.bot.moderation.add_timeouts(ctx.guild.id, muted, ctx.author.id, duration, reason)
+        
+        lines = []
+        for member, result in zip(members, results):
+            if isinstance(result, Exception):
+                lines.append(f"❌ {member.mention}: {describe_failure(result)}")
+            else:
+                lines.append(f"✅ {member.mention}{'' if result else ' (DM failed)'}")
+        await ctx.send(
+            embed=build_bulk_summary(f"Timed out {len(muted)} of {len(members)} members for {duration} minutes", reason, lines),
+            allowed_mentions=discord.AllowedMentions.none()
+        )
+    
+    @commands.command(name="masswarn")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    async def mass_warn(self, ctx, targets: commands.Greedy[typing.Union[discord.Member, RecentJoins]], *, reason=None):
+        """Warn many members at once (Requires Manage Messages permission)"""
+        members = self.bulk_targets(ctx, targets)
+        if not members:
+            await self.send_no_targets(ctx, "warn", reason)
+            return
+        reason = reason or "No reason provided"
+        counts = await self.bot.moderation.add_warnings(ctx.guild.id, [member.id for member in members], ctx.author.id, reason)
+        
+        async def warn(member):
+            count = counts[member.id]
+            dm_sent = await self.try_dm(member, embed=self.build_warning_embed(ctx, reason, count))
+            try:
+                escalation = await self.escalate(member, count)
+            except discord.HTTPException as e:
+                escalation = e
+            return count, dm_sent, escalation
+        
+        async with ctx.typing():
+            results = await run_bounded(members, warn, BULK_CONCURRENCY)
+            # Record the automatic timeouts once the pool is done, one ledger write per threshold
+            escalated = {}
+            for member, result in zip(members, results):
+                if not isinstance(result, Exception) and isinstance(result[2], int):
+                    escalated.setdefault((result[0], result[2]), []).append(member.id)
+            for (count, minutes), user_ids in escalated.items():
+                await self.bot.moderation.add_timeouts(ctx.guild.id, user_ids, self.bot.user.id, minutes, escalation_reason(count))
+        
+        lines = []
+        for member, result in zip(members, results):
+            if isinstance(result, Exception):
+                lines.append(f"❌ {member.mention}: {describe_failure(result)}")
+                continue
+            count, dm_sent, escalation = result
+            line = f"✅ {member.mention} ({count} active){'' if dm_sent else ' (DM failed)'}"
+            if isinstance(escalation, Exception):
+                line += f", automatic timeout failed: {describe_failure(escalation)}"
+            elif escalation:
+                line += f", timed out for {escalation} minutes"
+            lines.append(line)
+        await ctx.send(
+            embed=build_bulk_summary(f"Warned {len(members)} members", reason, lines),
+            allowed_mentions=discord.AllowedMentions.none()
+        )
+    
+    def bulk_targets(self, ctx, targets):
+        """Flatten members and recent-join lists, dropping duplicates, the moderator and bots"""
+        members = {}
+        for target in targets:
+            for member in target if isinstance(target, list) else [target]:
+                if member != ctx.author and not member.bot:
+                    members[member.id] = member
+        return list(members.values())[:MAX_BULK_TARGETS]
+    
+    async def send_no_targets(self, ctx, action, reason):
+        # Greedy stops at the first argument that isn't a target, so that one ends up at the start of reason
+        if reason:
+            await ctx.send(f"I couldn't find a member matching '{reason.split()[0]}'. Please give members to {action}: mentions, IDs, or `joined:<minutes>` for everyone who joined recently.")
+        else:
+            await ctx.send(f"Please give members to {action}: mentions, IDs, or `joined:<minutes>` for everyone who joined recently.")
+    
+    async def try_dm(self, member, **kwargs):
+        """Send member a DM, returning whether it went through"""
+        try:
+            await member.send(**kwargs)
+            return True
+        except discord.HTTPException:
+            return False
+    
+    @mass_mute.error
+    @mass_warn.error
+    async def bulk_moderation_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("You don't have permission to do that.")
+        elif isinstance(error, commands.NoPrivateMessage):
+            await ctx.send("Bulk moderation only works in a server.")
+        elif isinstance(error, commands.BadArgument):
+            parameter = ctx.current_parameter.name if ctx.current_parameter else None
+            if parameter == "duration":
+                await ctx.send(f"'{ctx.current_argument}' isn't a valid duration. Please give the timeout length in minutes.")
+            else:
+                await ctx.send(f"I couldn't use '{ctx.current_argument}' as a target: give mentions, IDs, or `joined:<minutes>`.")
+        else:
+            await ctx.send(f"An error occurred: {error}")
+    
+    @commands.group(name="warnings", invoke_without_command=True)
+    @commands.has_permissions(manage_messages=True)
+    async def warnings(self, ctx, member: discord.Member):
+        """Show how many active warnings a member has (Requires Manage Messages permission)"""
+        count = self.bot.moderation.active_warnings(ctx.guild.id, member.id)
+        await ctx.send(f"{member.mention} has {count} active warning{'s' if count != 1 else ''}.")
+    
+    @warnings.command(name="clear")
+    @commands.has_permissions(manage_messages=True)
+    async def warnings_clear(self, ctx, member: discord.Member, *, reason=None):
+        """Reset a member's active warnings; they stay in the moderation log (Requires Manage Messages permission)"""
+        cleared = await self.bot.moderation.clear_warnings(ctx.guild.id, member.id, ctx.author.id, reason)
+        await ctx.send(f"✅ Cleared {cleared} active warning{'s' if cleared != 1 else ''} for {member.mention}.")
+    
+    @commands.command(name="modlog")
+    @commands.has_permissions(manage_messages=True)
+    async def modlog(self, ctx, member: typing.Optional[discord.Member] = None, before: int = None):
+        """Page through this server's warnings and timeouts, newest first (Requires Manage Messages permission)"""
+        entries = await self.bot.moderation.history(
+            ctx.guild.id, member.id if member else None, before=before, limit=MODLOG_PAGE_SIZE
+        )
+        if not entries:
+            await ctx.send("No more moderation history." if before else "There's no moderation history yet.")
+            return
+        
+        lines = []
+        for entry in entries:
+            line = f"`#{entry['id']}` <t:{int(entry['created_at'])}:R> **{entry['action']}** <@{entry['user_id']}> by <@{entry['moderator_id']}>"
+            if entry["duration"]:
+                line += f" for {entry['duration']} min"
+            if entry["reason"]:
+                line += f": {entry['reason']}"
+            lines.append(line)
+        
+        embed = discord.Embed(
+            title=f"Moderation Log{f' for {member.display_name}' if member else ''}",
+            description="\n".join(lines),
+            color=discord.Color.dark_grey()
+        )
+        if len(entries) == MODLOG_PAGE_SIZE:
+            target = f"{member.id} " if member else ""
+            embed.set_footer(text=f"Older entries: {ctx.prefix}modlog {target}{entries[-1]['id']}")
+        await ctx.send(embed=embed, allowed_mentions=discord.AllowedMentions.none())
+    
+    @warnings.error
+    @warnings_clear.error
+    @modlog.error
+    async def moderation_log_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("You don't have permission to view or change moderation records.")
+        elif isinstance(error, commands.MemberNotFound):
+            await ctx.send("I couldn't find that member.")
+        elif isinstance(error, commands.MissingRequiredArgument):
+            await ctx.send(f"Please mention a member, e.g. `{ctx.prefix}{ctx.command.qualified_name} @member`.")
+        else:
+            await ctx.send(f"An error occurred: {error}")
+    
+    def build_pride_embed(self, flag_name):
+        """Build the pride message embed for one flag"""
+        selected = PRIDE_FLAGS[flag_name]
+        
+        embed = discord.Embed(
+            title="🌈 Pride and Love! 🌈",
+            description=selected["message"],
+            color=selected["colors"][0]  # Use first color for embed
+        )
+        embed.set_footer(text=f"Showing {flag_name} pride flag colors. Remember: You are loved exactly as you are! 💖")
+        return embed
+    
     @commands.command(name="pride")
     async def pride_message(self, ctx, flag=None):
         """Send a pride-themed message with optional flag type"""
-        pride_flags = {
-            "rainbow": {
-                "colors": [0xFF0000, 0xFF7F00, 0xFFFF00, 0x00FF00, 0x0000FF, 0x4B0082, 0x9400D3],
-                "message": "Pride is about celebrating the beautiful diversity of the LGBTQIA+ community!"
-            },
-            "trans": {
-                "colors": [0x55CDFC, 0xF7A8B8, 0xFFFFFF, 0xF7A8B8, 0x55CDFC],
-                "message": "Trans rights are human rights! You are valid, seen, and loved."
-            },
-            "bi": {
-                "colors": [0xD60270, 0x9B4F96, 0x0038A8],
-                "message": "Bi visibility matters! Your identity is valid regardless of your relationship."
-            },
-            "pan": {
-                "colors": [0xFF1B8D, 0xFFDA00, 0x1BB3FF],
-                "message": "Pan pride! Love knows no gender boundaries."
-            },
-            "ace": {
-                "colors": [0x000000, 0xA4A4A4, 0xFFFFFF, 0x810081],
-                "message": "Ace pride! Your identity is valid and important."
-            },
-            "nb": {
-                "colors": [0xFFF430, 0xFFFFFF, 0x9C59D1, 0x000000],
-                "message": "Non-binary pride! Gender is a spectrum, and you are valid wherever you are on it."
-            }
-        }
-        
-        if flag and flag.lower() in pride_flags:
-            selected = pride_flags[flag.lower()]
-            color = selected["colors"][0]  # Use first color for embed
-            message = selected["message"]
+        if flag and flag.lower() in PRIDE_FLAGS:
+            flag_name = flag.lower()
         else:
             # Default to rainbow
-            selected = pride_flags["rainbow"]
-            color = selected["colors"][0]
-            message = selected["message"]
+            flag_name = "rainbow"
             
             if flag:
-                await ctx.send(f"I don't have that flag yet, so I'll use the rainbow flag instead! Available flags: {', '.join(pride_flags.keys())}")
-        
-        embed = discord.Embed(
-            title="🌈 Pride and Love! 🌈",
-            description=message,
-            color=color
-        )
-        
-        flag_name = flag.lower() if flag and flag.lower() in pride_flags else "rainbow"
-        embed.set_footer(text=f"Showing {flag_name} pride flag colors. Remember: You are loved exactly as you are! 💖")
+                await ctx.send(f"I don't have that flag yet, so I'll use the rainbow flag instead! Available flags: {', '.join(PRIDE_FLAGS.keys())}")
         
+        embed = self.bot.embed_templates.get(("pride", flag_name), None, lambda: self.build_pride_embed(flag_name))
         await ctx.send(embed=embed)
 
 async def setup(bot):
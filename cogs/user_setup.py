@@ -1,45 +1,19 @@
 import discord
 from discord.ext import commands
-import json
-import os
 import datetime
+from utils.confirm import ConfirmView
+from utils.locale_packs import normalize_locale
+from utils.text_normalize import fold
 
 class UserSetup(commands.Cog):
     """Commands for user profile setup and customization"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.user_data_file = os.path.join("data", "user_data.json")
-    
-    def load_user_data(self):
-        try:
-            with open(self.user_data_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def save_user_data(self, data):
-        with open(self.user_data_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        self.store = bot.profile_store
     
     def get_user_profile(self, user_id):
-        data = self.load_user_data()
-        user_id = str(user_id)  # Convert to string for JSON compatibility
-        
-        if user_id not in data:
-            # Create default profile
-            data[user_id] = {
-                "pronouns": None,
-                "triggers": [],
-                "birthdate": None,
-                "milestones": {},
-                "preferences": {
-                    "daily_affirmation": False
-                }
-            }
-            self.save_user_data(data)
-        
-        return data[user_id]
+        return self.store.get_or_create(user_id)
     
     @commands.command(name="pronouns")
     async def set_pronouns(self, ctx, *, pronouns=None):
@@ -47,7 +21,7 @@ class UserSetup(commands.Cog):
         if pronouns is None:
             # Display current pronouns
             user_profile = self.get_user_profile(ctx.author.id)
-            current_pronouns = user_profile.get("pronouns", "not set")
+            current_pronouns = user_profile.pronouns or "not set"
             
             embed = discord.Embed(
                 title="Your Pronouns",
@@ -62,14 +36,9 @@ class UserSetup(commands.Cog):
             return
         
         # Update pronouns
-        user_data = self.load_user_data()
-        user_id = str(ctx.author.id)
-        
-        if user_id not in user_data:
-            user_data[user_id] = {}
-        
-        user_data[user_id]["pronouns"] = pronouns
-        self.save_user_data(user_data)
+        user_profile = self.get_user_profile(ctx.author.id)
+        user_profile.pronouns = pronouns
+        self.store.mark_dirty(ctx.author.id)
         
         embed = discord.Embed(
             title="Pronouns Updated",
@@ -82,32 +51,45 @@ class UserSetup(commands.Cog):
     @commands.group(name="trigger", invoke_without_command=True)
     async def trigger(self, ctx):
         """Manage your trigger words"""
-        await ctx.send(f"Please use one of the subcommands: `{ctx.prefix}trigger add`, `{ctx.prefix}trigger remove`, or `{ctx.prefix}trigger list`")
+        await ctx.send(f"Please use one of the subcommands: `{ctx.prefix}trigger add`, `{ctx.prefix}trigger addword`, `{ctx.prefix}trigger remove`, or `{ctx.prefix}trigger list`")
     
     @trigger.command(name="add")
     async def trigger_add(self, ctx, *, word):
         """Add a word to your trigger list"""
-        user_data = self.load_user_data()
-        user_id = str(ctx.author.id)
-        
-        if user_id not in user_data:
-            user_data[user_id] = {"triggers": []}
-        elif "triggers" not in user_data[user_id]:
-            user_data[user_id]["triggers"] = []
+        await self.add_trigger(ctx, word, whole_word=False)
+    
+    @trigger.command(name="addword")
+    async def trigger_add_word(self, ctx, *, word):
+        """Add a trigger that only matches as a whole word, not inside other words"""
+        await self.add_trigger(ctx, word, whole_word=True)
+    
+    async def add_trigger(self, ctx, word, whole_word):
+        user_profile = self.get_user_profile(ctx.author.id)
         
-        # Check if trigger is already in the list
-        if word.lower() in [t.lower() for t in user_data[user_id]["triggers"]]:
-            await ctx.send(f"'{word}' is already in your trigger list.")
-            return
+        # Check if trigger is already in the list (ignoring case, accents and look-alike spellings)
+        existing = next((t for t in user_profile.triggers if fold(t) == fold(word)), None)
+        if existing is not None:
+            if user_profile.is_whole_word(existing) == whole_word:
+                await ctx.send(f"'{word}' is already in your trigger list.")
+                return
+            # Same word, other matching mode: switch it over
+            user_profile.set_whole_word(existing, whole_word)
+            word = existing
+        else:
+            user_profile.add_trigger(word, whole_word)
+        self.store.mark_dirty(ctx.author.id)
+        self.bot.trigger_index.add(ctx.author.id, word, whole_word)
         
-        user_data[user_id]["triggers"].append(word)
-        self.save_user_data(user_data)
+        if whole_word:
+            description = f"I've added '{word}' to your trigger list. I'll help warn about content with this as a whole word."
+        else:
+            description = f"I've added '{word}' to your trigger list. I'll help warn about content containing this."
         
         # Send confirmation as DM for privacy
         try:
             embed = discord.Embed(
                 title="Trigger Word Added",
-                description=f"I've added '{word}' to your trigger list. I'll help warn about content containing this.",
+                description=description,
                 color=discord.Color.green()
             )
             embed.set_footer(text="Your privacy is important to me. This list is private.")
@@ -122,19 +104,18 @@ class UserSetup(commands.Cog):
     @trigger.command(name="remove")
     async def trigger_remove(self, ctx, *, word):
         """Remove a word from your trigger list"""
-        user_data = self.load_user_data()
-        user_id = str(ctx.author.id)
+        user_profile = self.store.get(ctx.author.id)
         
-        if user_id not in user_data or "triggers" not in user_data[user_id]:
+        if user_profile is None or not user_profile.triggers:
             await ctx.send("You don't have any trigger words set.")
             return
         
-        # Case-insensitive removal
-        triggers = user_data[user_id]["triggers"]
-        for trigger in triggers:
-            if trigger.lower() == word.lower():
-                user_data[user_id]["triggers"].remove(trigger)
-                self.save_user_data(user_data)
+        # Removal ignores case, accents and look-alike spellings
+        for trigger in user_profile.triggers:
+            if fold(trigger) == fold(word):
+                user_profile.remove_trigger(trigger)
+                self.store.mark_dirty(ctx.author.id)
+                self.bot.trigger_index.remove(ctx.author.id, trigger)
                 
                 try:
                     await ctx.author.send(f"I've removed '{trigger}' from your trigger list.")
@@ -149,14 +130,13 @@ class UserSetup(commands.Cog):
     @trigger.command(name="list")
     async def trigger_list(self, ctx):
         """List your trigger words"""
-        user_data = self.load_user_data()
-        user_id = str(ctx.author.id)
+        user_profile = self.store.get(ctx.author.id)
         
-        if user_id not in user_data or "triggers" not in user_data[user_id] or not user_data[user_id]["triggers"]:
+        if user_profile is None or not user_profile.triggers:
             await ctx.send("You don't have any trigger words set.")
             return
         
-        triggers = user_data[user_id]["triggers"]
+        triggers = user_profile.triggers
         
         # Send as DM for privacy
         try:
@@ -167,7 +147,10 @@ class UserSetup(commands.Cog):
             )
             
             # Format the list of triggers
-            trigger_text = "\n".join([f"• {trigger}" for trigger in triggers])
+            trigger_text = "\n".join([
+                f"• {trigger} (whole word)" if user_profile.is_whole_word(trigger) else f"• {trigger}"
+                for trigger in triggers
+            ])
             embed.add_field(name="Words", value=trigger_text)
             embed.set_footer(text="Your privacy is important to me. This list is private.")
             
@@ -185,7 +168,7 @@ class UserSetup(commands.Cog):
         if date_str is None:
             # Display current birthday
             user_profile = self.get_user_profile(ctx.author.id)
-            current_bday = user_profile.get("birthdate", "not set")
+            current_bday = user_profile.birthdate or "not set"
             
             embed = discord.Embed(
                 title="Your Birthday",
@@ -209,14 +192,10 @@ class UserSetup(commands.Cog):
             return
         
         # Update birthday
-        user_data = self.load_user_data()
-        user_id = str(ctx.author.id)
-        
-        if user_id not in user_data:
-            user_data[user_id] = {}
-        
-        user_data[user_id]["birthdate"] = formatted_date
-        self.save_user_data(user_data)
+        user_profile = self.get_user_profile(ctx.author.id)
+        user_profile.birthdate = formatted_date
+        self.store.mark_dirty(ctx.author.id)
+        self.bot.celebrations.set_birthday(ctx.author.id, formatted_date)
         
         embed = discord.Embed(
             title="Birthday Updated",
@@ -239,16 +218,10 @@ class UserSetup(commands.Cog):
             return
         
         # Update milestones
-        user_data = self.load_user_data()
-        user_id = str(ctx.author.id)
-        
-        if user_id not in user_data:
-            user_data[user_id] = {"milestones": {}}
-        elif "milestones" not in user_data[user_id]:
-            user_data[user_id]["milestones"] = {}
-        
-        user_data[user_id]["milestones"][formatted_date] = description
-        self.save_user_data(user_data)
+        user_profile = self.get_user_profile(ctx.author.id)
+        user_profile.add_milestone(formatted_date, description)
+        self.store.mark_dirty(ctx.author.id)
+        self.bot.celebrations.add_milestone(ctx.author.id, formatted_date, description)
         
         embed = discord.Embed(
             title="Milestone Added",
@@ -258,6 +231,66 @@ class UserSetup(commands.Cog):
         embed.set_footer(text="I'll remember to celebrate this special day with you! 🎉")
         await ctx.send(embed=embed)
     
+    @commands.group(name="language", invoke_without_command=True)
+    async def language(self, ctx, locale=None):
+        """Choose the language for your affirmations and resources"""
+        locales = self.bot.locales
+        if locale is None:
+            # Show the current choice and what's available
+            profile = self.store.get(ctx.author.id)
+            current = locales.pack_for(profile, ctx.guild.id if ctx.guild else None).locale
+            await ctx.send(
+                f"You're getting affirmations and resources in **{current}**. "
+                f"Available languages: {', '.join(locales.available())}\n"
+                f"Use `{ctx.prefix}language <code>` to choose one, or `{ctx.prefix}language reset` to follow the server."
+            )
+            return
+        
+        if not locales.has(locale):
+            await ctx.send(f"I don't have a '{locale}' language pack yet. Available languages: {', '.join(locales.available())}")
+            return
+        
+        user_profile = self.get_user_profile(ctx.author.id)
+        user_profile.set_preference("locale", normalize_locale(locale))
+        self.store.mark_dirty(ctx.author.id)
+        await ctx.send(f"I'll use **{normalize_locale(locale)}** for your affirmations and resources. 💖")
+    
+    @language.command(name="reset")
+    async def language_reset(self, ctx):
+        """Go back to the server's language"""
+        user_profile = self.store.get(ctx.author.id)
+        if user_profile and user_profile.get_preference("locale"):
+            user_profile.set_preference("locale", None)
+            self.store.mark_dirty(ctx.author.id)
+        await ctx.send("I'll use the server's language for you again.")
+    
+    @language.command(name="server")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def language_server(self, ctx, locale):
+        """Set the default language for this server, or 'reset' (Requires Manage Server permission)"""
+        locales = self.bot.locales
+        if locale.lower() == "reset":
+            await self.bot.guild_settings.set(ctx.guild.id, "locale", None)
+            await ctx.send(f"This server is back to the default language ({locales.default.locale}).")
+            return
+        if not locales.has(locale):
+            await ctx.send(f"I don't have a '{locale}' language pack yet. Available languages: {', '.join(locales.available())}")
+            return
+        await self.bot.guild_settings.set(ctx.guild.id, "locale", normalize_locale(locale))
+        await ctx.send(f"This server's affirmations and resources will be in **{normalize_locale(locale)}** unless members choose their own.")
+    
+    @language_server.error
+    async def language_server_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("You need the Manage Server permission to change the server's language.")
+        elif isinstance(error, commands.NoPrivateMessage):
+            await ctx.send("The server language can only be set in a server.")
+        elif isinstance(error, commands.MissingRequiredArgument):
+            await ctx.send(f"Please give a language code, e.g. `{ctx.prefix}language server hi`.")
+        else:
+            await ctx.send(f"An error occurred: {error}")
+    
     @commands.command(name="forgetme")
     async def forget_me(self, ctx):
         """Delete all your stored data"""
@@ -269,36 +302,31 @@ class UserSetup(commands.Cog):
         )
         embed.add_field(
             name="Confirmation",
-            value="Reply with 'yes' to confirm or 'no' to cancel."
+            value="Press the button below to confirm, or Cancel to keep your data."
         )
-                
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel and m.content.lower() in ['yes', 'no']
         
-        try:
-            response = await self.bot.wait_for('message', check=check, timeout=30.0)
-            
-            if response.content.lower() == 'yes':
-                user_data = self.load_user_data()
-                user_id = str(ctx.author.id)
+        view = ConfirmView(ctx.author.id, confirm_label="Delete my data")
+        prompt = await ctx.send(embed=embed, view=view)
+        await view.wait()
+        
+        if view.confirmed is None:
+            await prompt.edit(view=None)
+            await ctx.send("Confirmation timed out. Your data remains unchanged.")
+        elif view.confirmed:
+            if self.store.delete(ctx.author.id):
+                self.bot.trigger_index.remove_user(ctx.author.id)
+                self.bot.celebrations.remove_user(ctx.author.id)
                 
-                if user_id in user_data:
-                    del user_data[user_id]
-                    self.save_user_data(user_data)
-                    
-                    embed = discord.Embed(
-                        title="Data Deleted",
-                        description="All your data has been deleted from my records.",
-                        color=discord.Color.green()
-                    )
-                    await ctx.send(embed=embed)
-                else:
-                    await ctx.send("You don't have any stored data.")
+                embed = discord.Embed(
+                    title="Data Deleted",
+                    description="All your data has been deleted from my records.",
+                    color=discord.Color.green()
+                )
+                await ctx.send(embed=embed)
             else:
-                await ctx.send("Operation cancelled. Your data remains unchanged.")
-                
-        except asyncio.TimeoutError:
-            await ctx.send("Confirmation timed out. Your data remains unchanged.")
+                await ctx.send("You don't have any stored data.")
+        else:
+            await ctx.send("Operation cancelled. Your data remains unchanged.")
 
 async def setup(bot):
     await bot.add_cog(UserSetup(bot))
\ No newline at end of file
@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import aiohttp
+from dotenv import load_dotenv
+from utils.sharding import split_shards
+from utils.storage import SqliteBackend
+
+# Runs the bot as several processes, each running a cluster of shards:
+#   python launcher.py --workers 4
+# Every worker is main.py with SHARD_COUNT, SHARD_IDS and CLUSTER_ID set.
+# The workers share data/slayy_mom.db and replay each other's profile changes.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(ROOT, "data")
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+# A worker that stays up this long is healthy again, so its restart backoff resets
+HEALTHY_AFTER = 60
+
+
+async def fetch_gateway_info(token):
+    """Return (recommended shard count, identify max_concurrency) from Discord"""
+    headers = {"Authorization": f"Bot {token}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_BOT_URL, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data["shards"], data.get("session_start_limit", {}).get("max_concurrency", 1)
+
+
+async def prepare_database():
+    """Create the shared database and import user_data.json once, before any worker starts"""
+    backend = SqliteBackend(
+        os.path.join(DATA_DIR, "slayy_mom.db"),
+        import_from=os.path.join(DATA_DIR, "user_data.json")
+    )
+    try:
+        await backend.load()
+    finally:
+        await backend.close()
+
+
+class Worker:
+    def __init__(self, cluster_id, shard_ids):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.process = None
+        self.started_at = None
+        self.restarts = 0
+        self.restart_at = None
+
+    def start(self, shard_count, metrics_port):
+        env = dict(os.environ)
+        env.update({
+            "SHARD_COUNT": str(shard_count),
+            "SHARD_IDS": ",".join(map(str, self.shard_ids)),
+            "CLUSTER_ID": str(self.cluster_id),
+            "STORAGE_BACKEND": "sqlite",
+            "METRICS_PORT": str(metrics_port + self.cluster_id if metrics_port else 0)
+        })
+        self.process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env)
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        print(f"Started cluster {self.cluster_id} (shards {self.shard_ids}) as pid {self.process.pid}")
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run the bot as several sharded worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: one per core)")
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT", "0") or 0),
+                        help="total shards (default: SHARD_COUNT, or Discord's recommendation)")
+    args = parser.parse_args()
+
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        print("Error: No Discord token found. Please set the DISCORD_TOKEN in your .env file.")
+        sys.exit(1)
+
+    if os.getenv("STORAGE_BACKEND", "json").lower() != "sqlite":
+        print("Note: workers share profiles through SQLite, so STORAGE_BACKEND=sqlite is used for them")
+
+    try:
+        recommended, max_concurrency = asyncio.run(fetch_gateway_info(token))
+    except (aiohttp.ClientError, KeyError) as e:
+        if not args.shards:
+            print(f"Error: Couldn't ask Discord for a shard count ({e}); pass --shards")
+            sys.exit(1)
+        recommended, max_concurrency = args.shards, 1
+    shard_count = args.shards or recommended
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    asyncio.run(prepare_database())
+
+    metrics_port = int(os.getenv("METRICS_PORT", "9108") or 0)
+    workers = [Worker(index, shard_ids) for index, shard_ids in enumerate(split_shards(shard_count, args.workers))]
+    print(f"Running {shard_count} shards in {len(workers)} processes")
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    # Discord allows max_concurrency identifies every 5 seconds, so
+    # each worker waits for the previous one's shards to get through
+    for worker in workers:
+        if stopping:
+            break
+        worker.start(shard_count, metrics_port)
+        time.sleep(5 * math.ceil(len(worker.shard_ids) / max_concurrency))
+
+    while not stopping:
+        time.sleep(1)
+        for worker in workers:
+            if worker.process is None or worker.process.poll() is None:
+                if worker.process is not None and time.monotonic() - worker.started_at > HEALTHY_AFTER:
+                    worker.restarts = 0
+                continue
+            if worker.restart_at is None:
+                # Back off when a worker keeps crashing, e.g. on a bad token
+                delay = min(300, 5 * 2 ** worker.restarts)
+                worker.restarts += 1
+                worker.restart_at = time.monotonic() + delay
+                print(f"Cluster {worker.cluster_id} exited with code {worker.process.returncode}; restarting in {delay}s")
+            elif time.monotonic() >= worker.restart_at:
+                worker.start(shard_count, metrics_port)
+
+    print("Stopping workers...")
+    running = [worker.process for worker in workers if worker.process is not None and worker.process.poll() is None]
+    for process in running:
+        process.send_signal(signal.SIGINT)  # main.py flushes profiles on the way out
+    deadline = time.monotonic() + 30
+    for process in running:
+        try:
+            process.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,49 @@
+import time
+
+# Taken before the other imports so the startup report can include them
+STARTED = time.perf_counter()
+
 import asyncio
 import os
-from bot import bot, initialize_data_files
+from bot import bot
+
+async def load_cogs(cogs_dir="cogs"):
+    """Load every extension in cogs_dir concurrently"""
+    names = sorted(filename[:-3] for filename in os.listdir(cogs_dir) if filename.endswith(".py"))
+
+    async def load(name):
+        started = time.perf_counter()
+        try:
+            await bot.load_extension(f"cogs.{name}")
+        except Exception as e:
+            print(f"Failed to load extension {name}: {e}")
+        else:
+            print(f"Loaded extension: {name} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    with bot.startup.phase("cog load"):
+        await asyncio.gather(*(load(name) for name in names))
 
 async def main():
-    # Initialize data files
-    initialize_data_files()
-    
-    # Load all cogs
-    cogs_dir = "cogs"
-    for filename in os.listdir(cogs_dir):
-        if filename.endswith(".py"):
-            try:
-                await bot.load_extension(f"{cogs_dir}.{filename[:-3]}")
-                print(f"Loaded extension: {filename[:-3]}")
-            except Exception as e:
-                print(f"Failed to load extension {filename}: {e}")
-    
+    # Data files and profiles load in the background once the bot logs in
+    await load_cogs()
+
     # Run the bot
-    async with bot:
-        await bot.start(os.getenv('DISCORD_TOKEN'))
+    try:
+        async with bot:
+            bot.startup.begin("login")
+            await bot.start(os.getenv('DISCORD_TOKEN'))
+    finally:
+        # Write out any profile changes still waiting in memory
+        await bot.profile_store.close()
+        await bot.moderation.close()
+        await bot.metrics.close()
 
 if __name__ == "__main__":
     # Create cogs directory if it doesn't exist
     os.makedirs("cogs", exist_ok=True)
-    
+
+    bot.startup.started = STARTED
+    bot.startup.record("imports", STARTED)
+
     # Run the bot
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
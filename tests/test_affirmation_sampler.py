@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+import pytest
+
+from utils.affirmation_sampler import AffirmationSampler
+
+
+class StaticCache:
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self.version = 1
+
+    def get(self):
+        return self.corpus
+
+
+@pytest.mark.parametrize("size", [2, 3, 5, 17, 64])
+def test_every_bag_is_a_full_permutation(size):
+    lines = [f"line {i}" for i in range(size)]
+    sampler = AffirmationSampler(StaticCache({"daily": lines}), rng=random.Random(size))
+    draws = [sampler.draw("daily", reader=1) for _ in range(size * 200)]
+
+    for start in range(0, len(draws), size):
+        assert sorted(draws[start:start + size]) == sorted(lines)
+    assert all(a != b for a, b in zip(draws, draws[1:]))
+
+
+def test_readers_have_independent_bags():
+    lines = [f"line {i}" for i in range(8)]
+    sampler = AffirmationSampler(StaticCache({"daily": lines}), rng=random.Random(1))
+    first = [sampler.draw("daily", reader=1) for _ in range(4)]
+    second = [sampler.draw("daily", reader=2) for _ in range(8)]
+    first += [sampler.draw("daily", reader=1) for _ in range(4)]
+    assert sorted(first) == sorted(second) == sorted(lines)
+
+
+def test_weighted_pool_never_repeats_and_follows_weights():
+    corpus = {"daily": [{"text": "common", "weight": 8}, {"text": "medium", "weight": 4}, "rare"]}
+    sampler = AffirmationSampler(StaticCache(corpus), rng=random.Random(7))
+    draws = [sampler.draw("daily", reader=1) for _ in range(3000)]
+    assert all(a != b for a, b in zip(draws, draws[1:]))
+    # No-repeat caps "common" near every other draw, but "rare" stays rarest
+    counts = Counter(draws)
+    assert 0 < counts["rare"] < min(counts["common"], counts["medium"])
+
+
+def test_tagged_lines_only_reach_matching_readers():
+    corpus = {"daily": ["everyone", {"text": "for she/her", "tags": ["she/her"]}]}
+    sampler = AffirmationSampler(StaticCache(corpus), rng=random.Random(3))
+    assert {sampler.draw("daily", reader=1) for _ in range(20)} == {"everyone"}
+    assert {sampler.draw("daily", reader=2, tag="she/her") for _ in range(20)} == {"everyone", "for she/her"}
+    assert sampler.draw("missing") is None
@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from utils.broadcaster import Broadcaster
+
+
+def http_error(cls, status):
+    return cls(SimpleNamespace(status=status, reason="test"), "test")
+
+
+class FlakySend:
+    """send() that fails for some targets until told to recover"""
+
+    def __init__(self, errors):
+        self.errors = errors  # target -> exception to raise
+        self.delivered = []
+
+    async def __call__(self, target):
+        error = self.errors.get(target)
+        if error is not None:
+            raise error
+        self.delivered.append(target)
+
+
+def run(broadcaster, targets, send, run_name="daily-2026-01-01"):
+    return asyncio.run(broadcaster.broadcast(run_name, targets, send))
+
+
+def make_broadcaster(tmp_path):
+    return Broadcaster(str(tmp_path / "progress.log"), concurrency=3, max_retries=1, base_delay=0)
+
+
+def test_resume_skips_delivered_targets(tmp_path):
+    targets = {guild_id: f"channel {guild_id}" for guild_id in range(10)}
+    broadcaster = make_broadcaster(tmp_path)
+    # A previous process delivered to the first four before it stopped
+    with open(broadcaster.progress_path, "w") as f:
+        f.write("daily-2026-01-01\n0\n1\n2\n3\n")
+    assert broadcaster.is_unfinished("daily-2026-01-01")
+
+    send = FlakySend({})
+    results = run(broadcaster, targets, send)
+    assert results == {"sent": 6, "skipped": 4, "failed": 0}
+    assert sorted(send.delivered) == [f"channel {guild_id}" for guild_id in range(4, 10)]
+    assert not broadcaster.is_unfinished("daily-2026-01-01")
+    assert run(broadcaster, targets, send)["sent"] == 0
+
+
+def test_failed_targets_are_retried_on_resume(tmp_path):
+    targets = {1: "ok", 2: "flaky", 3: "forbidden"}
+    broadcaster = make_broadcaster(tmp_path)
+    send = FlakySend({"flaky": http_error(discord.HTTPException, 503), "forbidden": http_error(discord.Forbidden, 403)})
+
+    assert run(broadcaster, targets, send) == {"sent": 1, "skipped": 0, "failed": 2}
+    assert broadcaster.is_unfinished("daily-2026-01-01")
+    with open(broadcaster.progress_path) as f:
+        lines = f.read().splitlines()
+    assert "#failed 2" in lines and "#skip 3" in lines and "#done" not in lines
+
+    # After a restart the transient failure is retried; the rejected target isn't
+    del send.errors["flaky"]
+    assert run(make_broadcaster(tmp_path), targets, send) == {"sent": 1, "skipped": 2, "failed": 0}
+    assert send.delivered == ["ok", "flaky"]
+    assert not broadcaster.is_unfinished("daily-2026-01-01")
+
+
+def test_new_run_starts_fresh(tmp_path):
+    broadcaster = make_broadcaster(tmp_path)
+    send = FlakySend({})
+    run(broadcaster, {1: "a"}, send, run_name="daily-2026-01-01")
+    assert run(broadcaster, {1: "a"}, send, run_name="daily-2026-01-02")["sent"] == 1
+    assert send.delivered == ["a", "a"]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from utils.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("command",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "help")
+
+    lines = list(histogram.render())
+    assert lines == [
+        'latency_seconds_bucket{command="help",le="0.1"} 2',
+        'latency_seconds_bucket{command="help",le="1"} 3',
+        'latency_seconds_bucket{command="help",le="+Inf"} 4',
+        'latency_seconds_sum{command="help"} 3.65',
+        'latency_seconds_count{command="help"} 4',
+    ]
+    assert histogram.count("help") == 4 and histogram.count("other") == 0
+
+
+def test_counter_labels_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", 'Errors "seen"', ("route",))
+    counter.inc('/a"b\\c\n')
+    counter.inc('/a"b\\c\n', amount=2)
+    text = registry.render()
+    assert '# HELP errors_total Errors \\"seen\\"' in text
+    assert 'errors_total{route="/a\\"b\\\\c\\n"} 3' in text
+
+
+def test_broken_gauge_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.gauge("broken", "Raises", lambda: 1 / 0)
+    registry.gauge("fine", "Works", lambda: 7)
+    text = registry.render()
+    assert "# broken unavailable" in text
+    assert "fine 7" in text
+
+
+def test_names_are_unique():
+    registry = MetricsRegistry()
+    registry.counter("dup", "First")
+    with pytest.raises(ValueError):
+        registry.gauge("dup", "Second", lambda: 0)
+
+
+def test_serves_metrics_over_http():
+    async def scenario():
+        registry = MetricsRegistry()
+        registry.gauge("up", "Always 1", lambda: 1)
+        await registry.serve("127.0.0.1", 0)
+        port = registry._server.sockets[0].getsockname()[1]
+        try:
+            responses = []
+            for path in ("/metrics", "/nope"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+                responses.append((await reader.read()).decode())
+                writer.close()
+            return responses
+        finally:
+            await registry.close()
+
+    metrics, missing = asyncio.run(scenario())
+    assert metrics.startswith("HTTP/1.1 200 OK") and metrics.endswith("up 1\n")
+    assert missing.startswith("HTTP/1.1 404")
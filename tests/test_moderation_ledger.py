@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from utils.moderation_ledger import ModerationLedger
+
+
+async def table_counts(ledger):
+    db = await ledger.connect()
+    async with db.execute("SELECT guild_id, user_id, count FROM active_warnings") as cursor:
+        return {(guild_id, user_id): count async for guild_id, user_id, count in cursor}
+
+
+def test_concurrent_writes_keep_table_and_cache_in_sync(tmp_path):
+    async def scenario():
+        ledger = ModerationLedger(str(tmp_path / "moderation.db"))
+        await ledger.load()
+        try:
+            warnings = [ledger.add_warning(1, user_id % 5, 99, "spam") for user_id in range(40)]
+            # NULL user_id violates NOT NULL, so this one rolls back mid-burst
+            failing = ledger.add_warnings(1, [7, None], 99, "bad")
+            timeouts = [ledger.add_timeout(1, user_id, 99, 10, "cool off") for user_id in range(5)]
+            results = await asyncio.gather(*warnings, failing, *timeouts, return_exceptions=True)
+            assert sum(isinstance(result, Exception) for result in results) == 1
+
+            expected = {(1, user_id): 8 for user_id in range(5)}
+            assert await table_counts(ledger) == expected
+            assert ledger._active == expected
+            assert len(await ledger.history(1, limit=100)) == 45
+
+            # Nothing from the failed call survives, and a fresh load agrees
+            assert ledger.active_warnings(1, 7) == 0
+            await ledger.load()
+            assert ledger._active == expected
+        finally:
+            await ledger.close()
+
+    asyncio.run(scenario())
+
+
+def test_clear_warnings_keeps_history(tmp_path):
+    async def scenario():
+        ledger = ModerationLedger(str(tmp_path / "moderation.db"))
+        try:
+            await ledger.add_warnings(1, [2, 3], 99, "spam")
+            assert await ledger.clear_warnings(1, 2, 99) == 1
+            assert await table_counts(ledger) == {(1, 3): 1}
+            assert [entry["action"] for entry in await ledger.history(1, user_id=2)] == ["clear", "warn"]
+        finally:
+            await ledger.close()
+
+    asyncio.run(scenario())
+
+
+def test_history_pages_newest_first(tmp_path):
+    async def scenario():
+        ledger = ModerationLedger(str(tmp_path / "moderation.db"))
+        try:
+            for user_id in range(7):
+                await ledger.add_warning(1, user_id, 99, None)
+            first = await ledger.history(1, limit=3)
+            second = await ledger.history(1, before=first[-1]["id"], limit=3)
+            assert [entry["user_id"] for entry in first + second] == [6, 5, 4, 3, 2, 1]
+        finally:
+            await ledger.close()
+
+    asyncio.run(scenario())
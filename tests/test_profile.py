@@ -0,0 +1,31 @@
+import pytest
+
+from utils.profile import Profile, pack_date, unpack_date
+
+
+@pytest.mark.parametrize("date_str", ["15-06-1995", "29-02-2024", "01-01-0001"])
+def test_valid_dates_are_packed(date_str):
+    assert isinstance(pack_date(date_str), int)
+    assert unpack_date(pack_date(date_str)) == date_str
+
+
+@pytest.mark.parametrize("date_str", [
+    "1995-03-05",  # ISO order
+    "31-02-2020",  # no such day
+    "5-6-1995",  # not zero-padded
+    "15-06-95",
+    "weird",
+    "",
+    "--",
+])
+def test_malformed_dates_round_trip_unchanged(date_str):
+    assert pack_date(date_str) == date_str
+    assert unpack_date(pack_date(date_str)) == date_str
+
+
+def test_profile_keeps_malformed_dates():
+    data = {"birthdate": "1995-03-05", "milestones": {"1995-03-05": "legacy", "01-02-2020": "sober"}}
+    profile = Profile.from_dict(data)
+    assert profile.birthdate == "1995-03-05"
+    assert profile.milestones == data["milestones"]
+    assert Profile.from_dict(profile.to_dict()).to_dict() == profile.to_dict()
@@ -0,0 +1,78 @@
+import asyncio
+
+from utils.profile import Profile
+from utils.profile_store import ProfileStore
+
+
+class SlowBackend:
+    """Backend whose write blocks until the test releases it"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.written = []
+
+    async def load(self):
+        return {}
+
+    def prepare(self, profiles, user_ids):
+        return {user_id: profiles[user_id].pronouns for user_id in user_ids if user_id in profiles}
+
+    async def write(self, batch):
+        self.started.set()
+        await self.release.wait()
+        if self.fail:
+            self.fail = False
+            raise OSError("disk full")
+        self.written.append(batch)
+
+    async def close(self):
+        pass
+
+
+def run_interleaving(fail):
+    async def scenario():
+        backend = SlowBackend(fail=fail)
+        store = ProfileStore(backend)
+        await store.load()
+        store.get_or_create(1).pronouns = "local"
+
+        flush = asyncio.create_task(store.flush())
+        await backend.started.wait()
+        # Another process's copy arrives while ours is being written
+        accepted = store.apply_remote(1, Profile(pronouns="remote"))
+        backend.release.set()
+        await flush
+        await store.flush()
+        return accepted, store.get(1).pronouns, backend.written
+
+    return asyncio.run(scenario())
+
+
+def test_remote_copy_does_not_replace_profile_being_written():
+    accepted, pronouns, written = run_interleaving(fail=False)
+    assert accepted is False
+    assert pronouns == "local"
+    assert written == [{"1": "local"}]
+
+
+def test_failed_write_retries_the_local_change():
+    accepted, pronouns, written = run_interleaving(fail=True)
+    assert accepted is False
+    assert written == [{"1": "local"}]
+
+
+def test_remote_copy_applies_once_nothing_is_pending():
+    async def scenario():
+        backend = SlowBackend()
+        backend.release.set()
+        store = ProfileStore(backend)
+        await store.load()
+        store.get_or_create(1)
+        await store.flush()
+        assert store.apply_remote(1, Profile(pronouns="remote"))
+        assert store.apply_remote(2, None)
+        return store.get(1).pronouns
+
+    assert asyncio.run(scenario()) == "remote"
@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from utils.replies import ReplyRegistry
+from utils.vent_tracker import VentTracker
+
+
+def message(channel_id, author_id, content="hi"):
+    return SimpleNamespace(channel=SimpleNamespace(id=channel_id), author=SimpleNamespace(id=author_id), content=content)
+
+
+def test_dispatch_only_resolves_the_matching_waiter():
+    async def scenario():
+        registry = ReplyRegistry()
+        waiting = asyncio.create_task(registry.wait(1, 10))
+        other = asyncio.create_task(registry.wait(1, 11))
+        await asyncio.sleep(0)
+        assert len(registry) == 2
+
+        assert registry.dispatch(message(2, 10)) is False  # Same author, other channel
+        assert registry.dispatch(message(1, 10, "mine")) is True
+        assert (await waiting).content == "mine"
+        assert not other.done()
+        other.cancel()
+        await asyncio.gather(other, return_exceptions=True)
+        assert len(registry) == 0
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_waiter_is_removed():
+    async def scenario():
+        registry = ReplyRegistry()
+        with pytest.raises(asyncio.TimeoutError):
+            await registry.wait(1, 10, timeout=0.01)
+        assert len(registry) == 0
+        assert registry.dispatch(message(1, 10)) is False
+
+    asyncio.run(scenario())
+
+
+def test_vent_tracker_survives_a_restart(tmp_path):
+    path = str(tmp_path / "open_vents.json")
+
+    async def scenario():
+        tracker = VentTracker(path)
+        tracker.load()
+        await tracker.open(100, 1, 1000.0)
+        await tracker.open(200, 2, 2000.0)
+        await tracker.close(100)
+        await tracker.close(999)  # Unknown threads are ignored
+
+    asyncio.run(scenario())
+    restarted = VentTracker(path)
+    restarted.load()
+    assert restarted.items() == [(200, 2, 2000.0)]
+
+
+def test_vent_tracker_ignores_a_corrupt_file(tmp_path):
+    path = tmp_path / "open_vents.json"
+    path.write_text("{not json")
+    tracker = VentTracker(str(path))
+    tracker.load()
+    assert len(tracker) == 0
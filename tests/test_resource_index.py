@@ -0,0 +1,95 @@
+from utils.resource_index import ResourceIndex, tokenize
+
+
+class FakeCache:
+    def __init__(self, resources):
+        self.resources = resources
+        self.version = 1
+
+    def get(self):
+        return self.resources
+
+    def replace(self, resources):
+        self.resources = resources
+        self.version += 1
+
+
+def resource(name, description, url=None):
+    return {"name": name, "description": description, "url": url or f"https://example.org/{name}"}
+
+
+RESOURCES = {
+    "Crisis Lines": [
+        resource("Trevor Project", "Crisis support for LGBTQ young people"),
+        resource("Trans Lifeline", "Peer support hotline run by trans people"),
+    ],
+    "Health": [
+        resource("Crisis Text Line", "Text-based support any time"),
+        resource("Planned Parenthood", "Sexual health services and information"),
+    ],
+}
+
+
+def names(results):
+    return [res["name"] for _, res in results]
+
+
+def test_tokenize_strips_accents_and_case():
+    assert tokenize("Café SÉRVICES, trans-friendly!") == ["cafe", "services", "trans", "friendly"]
+
+
+def test_name_matches_outrank_category_and_description_matches():
+    index = ResourceIndex(FakeCache({
+        "Misc": [resource("Listening Circle", "Call our hotline"), resource("Hotline Hub", "Numbers to call")],
+        "Hotline Directory": [resource("Phone Book", "Numbers to call")],
+    }))
+    assert names(index.search("hotline")) == ["Hotline Hub", "Phone Book", "Listening Circle"]
+
+
+def test_common_and_rare_words():
+    index = ResourceIndex(FakeCache({
+        "Misc": [
+            resource("Support Group", "Weekly support meetings"),
+            resource("Support Line", "Support by phone"),
+            resource("Helpful Notes", "Support for nonbinary people"),
+        ],
+    }))
+    # "nonbinary" narrows to one document; "support" alone ranks by the field it is in
+    assert names(index.search("support nonbinary")) == ["Helpful Notes"]
+    assert names(index.search("support"))[-1] == "Helpful Notes"
+
+
+def test_every_query_word_must_match():
+    index = ResourceIndex(FakeCache(RESOURCES))
+    assert names(index.search("peer hotline")) == ["Trans Lifeline"]
+    assert index.search("hotline dentist") == []
+    assert index.search("   ") == []
+
+
+def test_last_word_matches_as_a_prefix():
+    index = ResourceIndex(FakeCache(RESOURCES))
+    assert names(index.search("sexual heal")) == ["Planned Parenthood"]
+    assert index.complete("cri") == ["crisis"]
+
+
+def test_limit_and_category_field():
+    index = ResourceIndex(FakeCache(RESOURCES))
+    assert set(names(index.search("health"))) == {"Crisis Text Line", "Planned Parenthood"}
+    assert len(index.search("support", limit=2)) == 2
+
+
+def test_refresh_follows_file_changes():
+    cache = FakeCache(RESOURCES)
+    index = ResourceIndex(cache)
+    assert len(index) == 4
+
+    cache.replace({
+        "Health": [
+            resource("Planned Parenthood", "Sexual health services and information"),
+            resource("Dental Aid", "Free dentist visits"),
+        ],
+    })
+    assert len(index) == 2
+    assert names(index.search("dentist")) == ["Dental Aid"]
+    assert index.search("crisis") == []
+    assert index.complete("tr") == []
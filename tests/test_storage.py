@@ -0,0 +1,137 @@
+import asyncio
+import json
+import shutil
+import sqlite3
+
+from utils.profile import Profile
+from utils.storage import JsonBackend, SqliteBackend
+
+
+def flush(backend, profiles, user_ids):
+    asyncio.run(backend.write(backend.prepare(profiles, user_ids)))
+
+
+def load(path, **kwargs):
+    return asyncio.run(JsonBackend(path, **kwargs).load())
+
+
+def test_journal_replays_over_snapshot(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    backend = JsonBackend(path, compact_every=100)
+    profiles = {"1": Profile(pronouns="she/her"), "2": Profile(pronouns="they/them")}
+    flush(backend, profiles, ["1", "2"])
+    profiles["1"].add_trigger("spiders")
+    flush(backend, profiles, ["1"])
+
+    loaded = load(path)
+    assert {user_id: profile.to_dict() for user_id, profile in loaded.items()} == {
+        user_id: profile.to_dict() for user_id, profile in profiles.items()
+    }
+
+
+def test_torn_journal_line_is_ignored_and_cut(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    backend = JsonBackend(path, compact_every=100)
+    flush(backend, {"1": Profile(pronouns="she/her")}, ["1"])
+    with open(backend.journal_path, "a") as f:
+        f.write('{"id": "2", "gen": 0, "prof')
+
+    assert list(load(path)) == ["1"]
+    with open(backend.journal_path) as f:
+        assert f.read().endswith("}\n")
+
+
+def test_stale_journal_after_crashed_compaction_is_skipped(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    backend = JsonBackend(path, compact_every=3)
+    profiles = {"1": Profile(pronouns="v1")}
+    flush(backend, profiles, ["1"])
+    profiles["2"] = Profile(pronouns="x")
+    flush(backend, profiles, ["2"])
+    shutil.copy(backend.journal_path, tmp_path / "stale")
+
+    profiles["1"].pronouns = "v2"
+    batch = backend.prepare(profiles, ["1"])
+    assert batch[0] == "snapshot"
+    asyncio.run(backend.write(batch))
+    # Crash between replacing the snapshot and emptying the journal
+    shutil.copy(tmp_path / "stale", backend.journal_path)
+
+    assert load(path)["1"].pronouns == "v2"
+
+
+def test_deletion_removes_profile_from_disk_immediately(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    backend = JsonBackend(path, compact_every=1000)
+    profiles = {"1": Profile(pronouns="she/her", triggers=["secret"]), "2": Profile()}
+    flush(backend, profiles, ["1", "2"])
+    profiles["1"].add_trigger("another secret")
+    flush(backend, profiles, ["1"])
+
+    del profiles["1"]
+    flush(backend, profiles, ["1"])
+
+    for file_path in (path, backend.journal_path):
+        with open(file_path) as f:
+            assert "secret" not in f.read()
+    assert list(load(path)) == ["2"]
+
+
+def test_snapshot_without_generation_still_loads(tmp_path):
+    path = tmp_path / "user_data.json"
+    path.write_text(json.dumps({"1": {"pronouns": "he/him", "triggers": [], "birthdate": None}}))
+    assert load(str(path))["1"].pronouns == "he/him"
+
+
+def test_sqlite_import_keeps_malformed_dates(tmp_path, capsys):
+    json_path = tmp_path / "user_data.json"
+    json_path.write_text(json.dumps({
+        "1": {"birthdate": "1995-03-05", "milestones": {"not a date": "legacy", "01-02-2020": "sober"}},
+        "2": {"birthdate": "15-06-1995", "milestones": {"31-02-2021": "impossible"}},
+    }))
+
+    async def scenario():
+        backend = SqliteBackend(str(tmp_path / "profiles.db"), import_from=str(json_path))
+        try:
+            await backend.load()
+            db = await backend.connect()
+            async with db.execute("SELECT user_id, birth_month, birth_day FROM profiles ORDER BY user_id") as cursor:
+                birthdays = await cursor.fetchall()
+            async with db.execute("SELECT date, month, day FROM milestones ORDER BY date") as cursor:
+                milestones = await cursor.fetchall()
+            return birthdays, milestones, await backend.load_profiles(["1", "2"])
+        finally:
+            await backend.close()
+
+    birthdays, milestones, profiles = asyncio.run(scenario())
+    assert birthdays == [("1", None, None), ("2", 6, 15)]
+    assert milestones == [("01-02-2020", 2, 1), ("31-02-2021", None, None), ("not a date", None, None)]
+    assert profiles["1"].birthdate == "1995-03-05"
+    assert profiles["1"].milestones == {"not a date": "legacy", "01-02-2020": "sober"}
+    assert profiles["2"].milestones == {"31-02-2021": "impossible"}
+
+    report = capsys.readouterr().out
+    assert "'1995-03-05'" in report and "'not a date'" in report and "'31-02-2021'" in report
+    assert "'15-06-1995'" not in report
+
+
+def test_sqlite_migrates_not_null_milestone_columns(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "CREATE TABLE milestones (user_id TEXT NOT NULL, date TEXT NOT NULL, month INTEGER NOT NULL, "
+            "day INTEGER NOT NULL, description TEXT NOT NULL, PRIMARY KEY (user_id, date))"
+        )
+        db.execute("INSERT INTO milestones VALUES ('1', '01-02-2020', 2, 1, 'sober')")
+
+    async def scenario():
+        backend = SqliteBackend(path)
+        try:
+            await backend.load()
+            profiles = {"1": Profile(milestones={"01-02-2020": "sober", "someday": "later"})}
+            await backend.write(backend.prepare(profiles, ["1"]))
+            return await backend.load_profiles(["1"])
+        finally:
+            await backend.close()
+
+    assert asyncio.run(scenario())["1"].milestones == {"01-02-2020": "sober", "someday": "later"}
@@ -0,0 +1,62 @@
+import pytest
+
+from utils.text_normalize import fold, fold_with_substitutions, word_mask
+from utils.trigger_matcher import TriggerMatcher
+
+
+def matcher_for(trigger, whole_word=False):
+    matcher = TriggerMatcher()
+    matcher.add(1, trigger, whole_word)
+    return matcher
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("k1ll", "kill"),
+    ("SH!T", "shit"),
+    ("k|ll", "kill"),
+    ("ｓｈｉｔ", "shit"),
+    ("ѕhіt", "shit"),
+    ("omg!!!", "omg!!!"),
+    ("lily", "lily"),
+    ("Il1", "il1"),
+    ("|!e", "|!e"),
+    ("2024", "2024"),
+])
+def test_fold(text, expected):
+    assert fold(text) == expected
+
+
+def test_word_mask_lines_up_with_fold():
+    for text in ("sh!t happens", "k|ll me", "omg!!! lol", "straße 1"):
+        assert len(word_mask(text)) == len(fold(text))
+    assert word_mask("sh!t!") == "wwww "
+
+
+@pytest.mark.parametrize("text", ["omg!!!", "wow!!! lol", "lily", "Il1", "I'll go", "1ll"])
+def test_punctuation_and_l_do_not_become_i(text):
+    assert matcher_for("ill").search(text) is None
+
+
+@pytest.mark.parametrize("text", ["|!e", "!1e", "|13"])
+def test_whole_word_trigger_ignores_symbol_runs(text):
+    assert matcher_for("lie", whole_word=True).search(text) is None
+
+
+@pytest.mark.parametrize("text", ["k1ll", "KILL", "k|ll", "sk!ll"])
+def test_substitutes_between_letters_still_match(text):
+    assert matcher_for("kill").search(text) == "kill"
+
+
+def test_whole_word_trigger_with_substitute_inside():
+    matcher = matcher_for("shit", whole_word=True)
+    assert matcher.search("oh sh!t.") == "shit"
+    assert matcher.search("shitake") is None
+
+
+def test_long_message_with_many_substitutions():
+    text = "k1ll " * 20000
+    folded, substitutions = fold_with_substitutions(text)
+    assert folded == "kill " * 20000
+    assert len(substitutions) == 20000
+    assert word_mask(text, substitutions) == word_mask(text) == "wwww " * 20000
+    assert len(list(matcher_for("kill", whole_word=True).iter_matches(text))) == 20000
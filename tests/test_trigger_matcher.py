@@ -0,0 +1,63 @@
+import random
+
+from utils.text_normalize import fold
+from utils.trigger_matcher import TriggerMatcher
+
+
+def naive_matches(patterns, text):
+    folded = fold(text)
+    found = set()
+    for pattern in patterns:
+        start = folded.find(pattern)
+        while start != -1:
+            found.add((start + len(pattern) - 1, pattern))
+            start = folded.find(pattern, start + 1)
+    return found
+
+
+def test_matches_agree_with_naive_search():
+    rng = random.Random(1)
+    alphabet = "abcde "
+    for _ in range(200):
+        matcher = TriggerMatcher()
+        patterns = set()
+        for user_id in range(rng.randint(1, 6)):
+            for _ in range(rng.randint(1, 4)):
+                word = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 4)))
+                matcher.add(user_id, word)
+                patterns.add(word)
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        assert set(matcher.iter_matches(text)) == naive_matches(patterns, text)
+
+
+def test_removing_triggers_updates_matches():
+    matcher = TriggerMatcher()
+    matcher.add(1, "spider")
+    matcher.add(2, "Spider")
+    matcher.add(2, "blood")
+    assert matcher.search("a SPIDER!") == "spider"
+
+    matcher.remove(1, "spider")
+    assert matcher.search("a spider") == "spider"  # User 2 still has it
+    matcher.remove_user(2)
+    assert matcher.search("a spider, blood") is None
+    assert len(matcher) == 0 and matcher.users() == []
+
+
+def test_whole_word_only_when_every_owner_wants_it():
+    matcher = TriggerMatcher()
+    matcher.add(1, "cat", whole_word=True)
+    assert matcher.search("concatenate") is None
+    assert matcher.search("my cat.") == "cat"
+
+    matcher.add(2, "cat")  # Someone wants it matched anywhere
+    assert matcher.search("concatenate") == "cat"
+    matcher.remove(2, "cat")
+    assert matcher.search("concatenate") is None
+
+
+def test_blank_triggers_are_ignored():
+    matcher = TriggerMatcher()
+    matcher.add(1, "   ")
+    assert len(matcher) == 0
+    assert matcher.search("   ") is None
@@ -0,0 +1,164 @@
+import random
+
+_MASK32 = 0xFFFFFFFF
+
+
+class AliasTable:
+    """Vose alias table for O(1) weighted draws"""
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.prob = [1.0] * count
+        self.alias = list(range(count))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def draw(self, rng):
+        index = rng.randrange(len(self.prob))
+        return index if rng.random() < self.prob[index] else self.alias[index]
+
+
+def _mix(value, key):
+    value = (value ^ key) * 0x9E3779B1 & _MASK32
+    value ^= value >> 15
+    return value * 0x85EBCA6B & _MASK32
+
+
+class _Pool:
+    """The lines one (category, tag) pair can draw from"""
+
+    def __init__(self, texts, weights):
+        self.texts = texts
+        self.size = len(texts)
+        self.alias = AliasTable(weights) if any(weight != 1 for weight in weights) else None
+        # Per-reader cursor packed into one int: seed << 32 | position for
+        # shuffle bags, or the last index drawn for weighted pools
+        self.cursors = {}
+
+        bits = max(2, (self.size - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._half_mask = (1 << self._half) - 1
+
+    def draw(self, rng, reader):
+        if self.alias is not None:
+            return self.texts[self._draw_weighted(rng, reader)]
+        return self.texts[self._draw_shuffled(rng, reader)]
+
+    def _draw_weighted(self, rng, reader):
+        last = self.cursors.get(reader)
+        index = self.alias.draw(rng)
+        if index == last and self.size > 1:
+            # Rejection keeps the draw O(1) on average; a line that dominates
+            # the weights falls back to its neighbour rather than looping
+            for _ in range(32):
+                index = self.alias.draw(rng)
+                if index != last:
+                    break
+            else:
+                index = (last + 1) % self.size
+        if reader is not None:
+            self.cursors[reader] = index
+        return index
+
+    def _draw_shuffled(self, rng, reader):
+        cursor = self.cursors.get(reader)
+        if cursor is None:
+            seed, position = rng.getrandbits(32), 0
+        else:
+            seed, position = cursor >> 32, cursor & _MASK32
+
+        if position >= self.size:
+            # Bag exhausted: start a new shuffle, never opening with the line
+            # just shown. Reseeding (1 in size odds of a retry) keeps every
+            # slot of the new bag, where skipping slot 0 would drop a line.
+            last = self._permute(self.size - 1, seed)
+            seed, position = rng.getrandbits(32), 0
+            while self.size > 1 and self._permute(0, seed) == last:
+                seed = rng.getrandbits(32)
+
+        index = self._permute(position, seed)
+        if reader is not None:
+            self.cursors[reader] = (seed << 32) | (position + 1)
+        return index
+
+    def _permute(self, index, seed):
+        """Map position -> line index through a seeded Feistel permutation
+
+        The network permutes the next power of four above the pool size;
+        cycle walking folds it back into range, so any position can be
+        resolved in O(1) without storing the shuffled order.
+        """
+        half = self._half
+        mask = self._half_mask
+        while True:
+            left, right = index >> half, index & mask
+            for round_key in range(4):
+                left, right = right, left ^ (_mix(right, seed + round_key) & mask)
+            index = (left << half) | right
+            if index < self.size:
+                return index
+
+
+class AffirmationSampler:
+    """Draws affirmations in O(1) without showing a reader the same line twice in a row
+
+    Corpus entries are plain strings or objects with "text" and optional
+    "weight" and "tags". Untagged lines are shown to everyone; tagged lines
+    only to readers asking for one of their tags (e.g. a pronoun set).
+    Unweighted pools are walked as per-reader shuffle bags, weighted pools
+    are drawn from an alias table. Pools are rebuilt when the corpus changes.
+    """
+
+    def __init__(self, content_cache, rng=None):
+        self.content_cache = content_cache
+        self.rng = rng or random.Random()
+        self._version = None
+        self._pools = {}
+        self._tags = set()
+
+    def draw(self, category, reader=None, tag=None):
+        """Return a line from category, or None if it is empty"""
+        corpus = self.content_cache.get()
+        if self.content_cache.version != self._version:
+            self._version = self.content_cache.version
+            self._pools = {}
+            self._tags = {
+                entry_tag
+                for entries in corpus.values()
+                for entry in entries if isinstance(entry, dict)
+                for entry_tag in entry.get("tags", ())
+            }
+
+        if tag not in self._tags:
+            tag = None  # Only build pools for tags the corpus actually uses
+        pool = self._pools.get((category, tag))
+        if pool is None:
+            pool = self._pools[(category, tag)] = self._build_pool(corpus.get(category, ()), tag)
+        if not pool.size:
+            return None
+        return pool.draw(self.rng, reader)
+
+    def _build_pool(self, entries, tag):
+        texts = []
+        weights = []
+        for entry in entries:
+            if isinstance(entry, str):
+                texts.append(entry)
+                weights.append(1)
+                continue
+            tags = entry.get("tags")
+            if tags and tag not in tags:
+                continue
+            texts.append(entry["text"])
+            weights.append(entry.get("weight", 1))
+        return _Pool(texts, weights)
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import random
+
+import discord
+
+
+class Broadcaster:
+    """Fans a message out to many channels with bounded concurrency
+
+    A fixed pool of workers pulls targets from a queue, so at most
+    concurrency sends are in flight at once; discord.py still applies its
+    own per-route buckets underneath. Rate-limited (429) and server-side
+    (5xx) failures are retried with exponential backoff and jitter.
+
+    Every delivered target is appended to a progress file named after the
+    run, so restarting mid-broadcast resumes with the targets that are left
+    instead of posting to everyone twice. Targets that can never succeed
+    (missing permissions, deleted channels) are recorded as skipped. Ones
+    that failed after every retry are recorded as failed, and the run is
+    then left unfinished so the next resume tries them again.
+    """
+
+    def __init__(self, progress_path, concurrency=8, max_retries=5, base_delay=1.0):
+        self.progress_path = progress_path
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._active = set()
+
+    def is_unfinished(self, run_name):
+        """Return True if run_name was started but never completed"""
+        header, _, finished = self._read_progress()
+        return header == run_name and not finished
+
+    async def broadcast(self, run_name, targets, send):
+        """Call send(target) for every target not yet delivered in run_name
+
+        targets maps a stable key (e.g. guild id) to whatever send needs.
+        Returns a dict with the number of targets sent, skipped and failed.
+        """
+        if run_name in self._active:
+            return {"sent": 0, "skipped": len(targets), "failed": 0}
+        self._active.add(run_name)
+        try:
+            return await self._broadcast(run_name, targets, send)
+        finally:
+            self._active.discard(run_name)
+
+    async def _broadcast(self, run_name, targets, send):
+        header, done, finished = await asyncio.to_thread(self._read_progress)
+        if header != run_name:
+            done, finished = set(), False
+            await asyncio.to_thread(self._start_progress, run_name)
+        if finished:
+            return {"sent": 0, "skipped": len(targets), "failed": 0}
+
+        queue = asyncio.Queue()
+        for key, target in targets.items():
+            if str(key) not in done:
+                queue.put_nowait((key, target))
+
+        results = {"sent": 0, "skipped": len(targets) - queue.qsize(), "failed": 0}
+        retry_later = []
+        progress = open(self.progress_path, 'a')
+        try:
+            async def worker():
+                while True:
+                    try:
+                        key, target = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    outcome = await self._send_with_retry(send, target)
+                    if outcome == "sent":
+                        progress.write(f"{key}\n")
+                        results["sent"] += 1
+                    elif outcome == "rejected":
+                        progress.write(f"#skip {key}\n")
+                        results["failed"] += 1
+                    else:
+                        # Not marked done, so a resume sends to it again
+                        progress.write(f"#failed {key}\n")
+                        results["failed"] += 1
+                        retry_later.append(key)
+                    progress.flush()
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            await asyncio.gather(*workers)
+            if not retry_later:
+                progress.write("#done\n")
+        finally:
+            progress.close()
+
+        return results
+
+    async def _send_with_retry(self, send, target):
+        """Return "sent", "rejected" (retrying won't help) or "failed" (worth retrying later)"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await send(target)
+                return "sent"
+            except (discord.Forbidden, discord.NotFound):
+                return "rejected"
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    return "rejected"
+                if attempt == self.max_retries:
+                    print(f"Giving up on broadcast target after {attempt + 1} attempts: {e}")
+                    return "failed"
+                retry_after = getattr(e, "retry_after", None) or self.base_delay * (2 ** attempt)
+                await asyncio.sleep(retry_after + random.uniform(0, self.base_delay))
+            except Exception as e:
+                # One broken target must not stop the rest of the broadcast
+                print(f"Broadcast target failed: {e}")
+                return "failed"
+        return "failed"
+
+    def _read_progress(self):
+        try:
+            with open(self.progress_path, 'r') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None, set(), False
+        if not lines:
+            return None, set(), False
+        # Delivered and skipped targets are handled; "#failed" ones are not
+        done = set()
+        for line in lines[1:]:
+            if line.startswith("#skip "):
+                done.add(line[len("#skip "):])
+            elif not line.startswith("#"):
+                done.add(line)
+        return lines[0], done, "#done" in lines[1:]
+
+    def _start_progress(self, run_name):
+        tmp_path = f"{self.progress_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(f"{run_name}\n")
+        os.replace(tmp_path, self.progress_path)
@@ -0,0 +1,86 @@
+import calendar
+import datetime
+
+
+def _parse_date(date_str):
+    """Return a date for a DD-MM-YYYY string, or None"""
+    try:
+        day, month, year = map(int, date_str.split('-'))
+        return datetime.date(year, month, day)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class CelebrationIndex:
+    """Birthdays and milestones indexed by month and day
+
+    Kept in sync by the UserSetup commands so finding today's celebrations
+    only touches the people celebrating today, never the whole profile set.
+    Entries are (user_id, kind, date, description) tuples where kind is
+    "birthday" or "milestone".
+    """
+
+    def __init__(self):
+        self._days = {}  # (month, day) -> set of entries
+        self._user_entries = {}  # user id -> set of entries
+
+    def load(self, profiles):
+        """Rebuild the index from every stored profile"""
+        self._days = {}
+        self._user_entries = {}
+        for user_id, profile in profiles.items():
+            if profile.birthdate:
+                self.set_birthday(user_id, profile.birthdate)
+            for date_str, description in profile.milestone_items():
+                self.add_milestone(user_id, date_str, description)
+
+    def set_birthday(self, user_id, date_str):
+        user_id = str(user_id)
+        for entry in [e for e in self._user_entries.get(user_id, ()) if e[1] == "birthday"]:
+            self._remove(entry)
+        date = _parse_date(date_str)
+        if date is not None:
+            self._add((user_id, "birthday", date, None))
+
+    def add_milestone(self, user_id, date_str, description):
+        user_id = str(user_id)
+        date = _parse_date(date_str)
+        if date is None:
+            return
+        for entry in [e for e in self._user_entries.get(user_id, ()) if e[1] == "milestone" and e[2] == date]:
+            self._remove(entry)
+        self._add((user_id, "milestone", date, description))
+
+    def remove_user(self, user_id):
+        for entry in list(self._user_entries.get(str(user_id), ())):
+            self._remove(entry)
+
+    def due(self, today):
+        """Return the entries to celebrate on a given date
+
+        Feb 29 dates are celebrated on Feb 28 in non-leap years. Milestones
+        dated in the future are skipped until they actually happen.
+        """
+        entries = list(self._days.get((today.month, today.day), ()))
+        if today.month == 2 and today.day == 28 and not calendar.isleap(today.year):
+            entries.extend(self._days.get((2, 29), ()))
+        return [entry for entry in entries if entry[2] <= today]
+
+    def _add(self, entry):
+        date = entry[2]
+        self._days.setdefault((date.month, date.day), set()).add(entry)
+        self._user_entries.setdefault(entry[0], set()).add(entry)
+
+    def _remove(self, entry):
+        date = entry[2]
+        key = (date.month, date.day)
+        day_entries = self._days.get(key)
+        if day_entries is not None:
+            day_entries.discard(entry)
+            if not day_entries:
+                del self._days[key]
+        user_entries = self._user_entries.get(entry[0])
+        if user_entries is not None:
+            user_entries.discard(entry)
+            if not user_entries:
+                del self._user_entries[entry[0]]
@@ -0,0 +1,39 @@
+import discord
+
+
+class ConfirmView(discord.ui.View):
+    """Confirm/Cancel buttons that only the person who asked can press
+
+    Button presses are routed to the view by discord.py's view store, so a
+    pending confirmation costs nothing on the message path. After wait(),
+    confirmed is True, False, or None if the view timed out.
+    """
+
+    def __init__(self, author_id, confirm_label="Confirm", timeout=30.0):
+        super().__init__(timeout=timeout)
+        self.author_id = author_id
+        self.confirmed = None
+        self.confirm.label = confirm_label
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("This confirmation isn't for you.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Confirm", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction, button):
+        self.confirmed = True
+        await self._finish(interaction)
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction, button):
+        self.confirmed = False
+        await self._finish(interaction)
+
+    async def _finish(self, interaction):
+        # Grey the buttons out so the choice can't be made twice
+        for item in self.children:
+            item.disabled = True
+        await interaction.response.edit_message(view=self)
+        self.stop()
@@ -0,0 +1,95 @@
+import json
+import os
+import time
+
+
+class ContentCache:
+    """A JSON data file parsed once and served from memory
+
+    The file is stat'ed at most once every check_interval seconds and only
+    re-parsed when its modification time or size changes. A new version is
+    validated before it replaces the old one, so a bad live edit leaves the
+    bot serving the last good content instead of breaking.
+    """
+
+    def __init__(self, path, default, validator=None, check_interval=5.0):
+        self.path = path
+        self.default = default
+        self.validator = validator
+        self.check_interval = check_interval
+        self.version = 0
+        self._data = default
+        self._signature = None
+        self._next_check = 0.0
+
+    def get(self):
+        """Return the current parsed content, reloading it if the file changed"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self._check()
+        return self._data
+
+    def invalidate(self):
+        """Force the next get() to look at the file again"""
+        self._next_check = 0.0
+
+    def _check(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if self.validator:
+                self.validator(data)
+        except (OSError, ValueError) as e:
+            # Keep serving the last good version until the file is fixed
+            print(f"Ignoring invalid content in {self.path}: {e}")
+            self._signature = signature
+            return
+
+        self._data = data
+        self._signature = signature
+        self.version += 1
+
+
+def validate_affirmations(data):
+    """Raise ValueError unless data maps categories to lists of affirmations
+
+    An affirmation is a string, or an object with a "text" string and an
+    optional positive "weight" and list of "tags".
+    """
+    if not isinstance(data, dict):
+        raise ValueError("expected an object of affirmation categories")
+    for category, entries in data.items():
+        if not isinstance(entries, list):
+            raise ValueError(f"category '{category}' must be a list")
+        for entry in entries:
+            if isinstance(entry, str):
+                continue
+            if not isinstance(entry, dict) or not isinstance(entry.get("text"), str):
+                raise ValueError(f"every affirmation in '{category}' needs a text")
+            weight = entry.get("weight", 1)
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+                raise ValueError(f"weights in '{category}' must be positive numbers")
+            tags = entry.get("tags", [])
+            if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                raise ValueError(f"tags in '{category}' must be a list of strings")
+
+
+def validate_resources(data):
+    """Raise ValueError unless every resource has a name, url and description"""
+    if not isinstance(data, dict):
+        raise ValueError("expected an object of resource categories")
+    for category, entries in data.items():
+        if not isinstance(entries, list):
+            raise ValueError(f"category '{category}' must be a list")
+        for entry in entries:
+            if not isinstance(entry, dict) or not all(key in entry for key in ("name", "url", "description")):
+                raise ValueError(f"every resource in '{category}' needs a name, url and description")
@@ -0,0 +1,21 @@
+class EmbedTemplateCache:
+    """Embeds built once per key and handed out as copies
+
+    Each template is stored with the version it was built from (the command
+    prefix, a ContentCache version, ...). Asking for a key with a different
+    version rebuilds it, so templates invalidate themselves when the data
+    behind them changes.
+    """
+
+    def __init__(self):
+        self._templates = {}
+
+    def get(self, key, version, builder):
+        """Return a copy of the embed for key, building it if missing or stale"""
+        entry = self._templates.get(key)
+        if entry is None or entry[0] != version:
+            entry = self._templates[key] = (version, builder())
+        return entry[1].copy()
+
+    def clear(self):
+        self._templates.clear()
@@ -0,0 +1,90 @@
+import asyncio
+import contextlib
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows, where only single-process runs are supported
+    fcntl = None
+
+
+class GuildSettings:
+    """Per-guild configuration kept in memory and saved to a small JSON file
+
+    Changes re-read the file under an advisory lock before writing it back,
+    so the processes of a sharded launch, which each own different guilds,
+    never overwrite each other's settings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._settings = {}
+        self._save_lock = asyncio.Lock()
+
+    def load(self):
+        self._settings = self._read()
+
+    def get(self, guild_id, key, default=None):
+        return self._settings.get(str(guild_id), {}).get(key, default)
+
+    def guilds_with(self, key):
+        """Return {guild_id: value} for every guild that has key set"""
+        return {
+            int(guild_id): settings[key]
+            for guild_id, settings in self._settings.items()
+            if settings.get(key) is not None
+        }
+
+    async def set(self, guild_id, key, value):
+        """Set (or with value None, clear) a guild setting and save it"""
+        async with self._save_lock:
+            self._settings = await asyncio.to_thread(self._update, str(guild_id), key, value)
+
+    async def save(self):
+        async with self._save_lock:
+            payload = json.dumps(self._settings, indent=4)
+            await asyncio.to_thread(self._locked_write, payload)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _update(self, guild_id, key, value):
+        with self._file_lock():
+            # Start from the file so other processes' changes are kept
+            all_settings = self._read()
+            settings = all_settings.setdefault(guild_id, {})
+            if value is None:
+                settings.pop(key, None)
+                if not settings:
+                    del all_settings[guild_id]
+            else:
+                settings[key] = value
+            self._write(json.dumps(all_settings, indent=4))
+        return all_settings
+
+    def _locked_write(self, payload):
+        with self._file_lock():
+            self._write(payload)
+
+    def _write(self, payload):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
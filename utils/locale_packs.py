@@ -0,0 +1,135 @@
+import itertools
+import os
+import time
+from collections import OrderedDict
+
+from utils.affirmation_sampler import AffirmationSampler
+from utils.content_cache import ContentCache, validate_affirmations, validate_resources
+from utils.resource_index import ResourceIndex
+
+_generations = itertools.count()
+
+
+def normalize_locale(locale):
+    """Canonical form of a locale code: "pt_BR" and "PT-br" both become "pt-br" """
+    return locale.strip().replace("_", "-").lower() if locale else None
+
+
+class LocalePack:
+    """One locale's affirmations and resources
+
+    Anything the pack lacks (a whole file, or an affirmation category) comes
+    from its fallback, normally the default pack.
+    """
+
+    def __init__(self, locale, affirmations_cache, resources_cache, fallback=None):
+        self.locale = locale
+        self.affirmations_cache = affirmations_cache
+        self.resources_cache = resources_cache
+        self.affirmation_sampler = AffirmationSampler(affirmations_cache)
+        self.resource_index = ResourceIndex(resources_cache)
+        self.fallback = fallback
+        # Tells a reloaded pack's content apart from an evicted one's
+        self.generation = next(_generations)
+
+    def draw(self, category, reader=None, tag=None):
+        """Return a line from category, or None if neither this pack nor its fallback has one"""
+        line = self.affirmation_sampler.draw(category, reader=reader, tag=tag)
+        if line is None and self.fallback is not None:
+            return self.fallback.draw(category, reader=reader, tag=tag)
+        return line
+
+    def resource_pack(self):
+        """The pack whose resources to show: this one, or the fallback if it has none"""
+        if self.resources_cache.get() or self.fallback is None:
+            return self
+        return self.fallback.resource_pack()
+
+    @property
+    def resources_version(self):
+        return (self.generation, self.resources_cache.version)
+
+
+class LocalePacks:
+    """Locale packs under locales_dir, loaded on first use and kept in a small LRU
+
+    A pack is a directory named after its locale code (data/locales/hi/,
+    data/locales/pt-br/, ...) holding its own affirmations.json and/or
+    resources.json in the same format as the default ones. Nothing is read
+    until someone asks for a locale, and at most max_loaded packs stay
+    loaded; the least recently used is dropped and simply reloaded if it is
+    needed again. The default pack is always loaded and never evicted.
+    """
+
+    def __init__(self, locales_dir, default, guild_settings, max_loaded=8, scan_interval=60.0):
+        self.locales_dir = locales_dir
+        self.default = default
+        self.guild_settings = guild_settings
+        self.max_loaded = max_loaded
+        self.scan_interval = scan_interval
+        self._loaded = OrderedDict()  # locale -> LocalePack, least recently used first
+        self._directories = None  # locale -> directory name
+        self._next_scan = 0.0
+
+    def available(self):
+        """Return the sorted locale codes that have a pack, the default's included"""
+        return sorted(set(self._scan()) | {self.default.locale})
+
+    def get(self, locale):
+        """Return the pack for locale, or the default pack if there is none"""
+        locale = normalize_locale(locale)
+        if not locale or locale == self.default.locale:
+            return self.default
+        pack = self._loaded.get(locale)
+        if pack is not None:
+            self._loaded.move_to_end(locale)
+            return pack
+
+        directory = self._scan().get(locale)
+        if directory is None:
+            return self.default
+        pack = self._loaded[locale] = self._open(locale, directory)
+        if len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+        return pack
+
+    def pack_for(self, profile=None, guild_id=None):
+        """The pack to answer in: the user's language, then the server's, then the default"""
+        candidates = []
+        if profile:
+            candidates.append(profile.get_preference("locale"))
+        if guild_id is not None:
+            candidates.append(self.guild_settings.get(guild_id, "locale"))
+        for locale in candidates:
+            if self.has(locale):
+                return self.get(locale)
+        return self.default
+
+    def has(self, locale):
+        locale = normalize_locale(locale)
+        return bool(locale) and (locale == self.default.locale or locale in self._scan())
+
+    def _open(self, locale, directory):
+        path = os.path.join(self.locales_dir, directory)
+        return LocalePack(
+            locale,
+            ContentCache(os.path.join(path, "affirmations.json"), {}, validate_affirmations),
+            ContentCache(os.path.join(path, "resources.json"), {}, validate_resources),
+            fallback=self.default
+        )
+
+    def _scan(self):
+        # Only the directory names are read; packs are parsed when first used
+        now = time.monotonic()
+        if self._directories is None or now >= self._next_scan:
+            self._next_scan = now + self.scan_interval
+            try:
+                names = os.listdir(self.locales_dir)
+            except FileNotFoundError:
+                names = []
+            self._directories = {
+                normalize_locale(name): name
+                for name in names
+                if os.path.isdir(os.path.join(self.locales_dir, name))
+            }
+        return self._directories
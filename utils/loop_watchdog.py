@@ -0,0 +1,148 @@
+import asyncio
+import collections
+import contextlib
+import datetime
+import sys
+import threading
+import time
+import traceback
+import weakref
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and attributes stalls to the code that caused them
+
+    A heartbeat task wakes every interval seconds and records how late it
+    was. A separate thread watches that heartbeat; when it goes quiet for
+    longer than threshold it grabs a stack sample of the loop thread and
+    notes which command or event the running task was labelled with.
+    """
+
+    def __init__(self, threshold=0.25, interval=0.1, log_interval=300.0, max_stalls=50):
+        self.threshold = threshold
+        self.interval = interval
+        self.log_interval = log_interval
+        self.stalls = collections.deque(maxlen=max_stalls)
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self._window_max_lag = 0.0
+        self._window_stalls = 0
+        self._labels = weakref.WeakKeyDictionary()  # task -> stack of labels
+        self._loop = None
+        self._loop_thread_id = None
+        self._last_beat = None
+        self._pending = None  # Stall sampled by the thread, waiting for a duration
+        self._lock = threading.Lock()
+        self._tasks = []
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Start the heartbeat, log task and watcher thread (safe to call more than once)"""
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._heartbeat()),
+            asyncio.create_task(self._log_loop())
+        ]
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def push_label(self, label):
+        """Label the current task with the command or event it is running"""
+        task = asyncio.current_task()
+        if task is not None:
+            self._labels.setdefault(task, []).append(label)
+
+    def pop_label(self):
+        task = asyncio.current_task()
+        labels = self._labels.get(task) if task is not None else None
+        if labels:
+            labels.pop()
+
+    @contextlib.contextmanager
+    def track(self, label):
+        """Context manager form of push_label/pop_label"""
+        self.push_label(label)
+        try:
+            yield
+        finally:
+            self.pop_label()
+
+    def summary(self):
+        """Return a dict of lag statistics for display"""
+        return {
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "stall_count": len(self.stalls),
+            "stalls": list(self.stalls)
+        }
+
+    def _current_label(self):
+        # Called from the watcher thread while the loop thread is blocked
+        try:
+            task = asyncio.current_task(self._loop)
+            labels = self._labels.get(task) if task is not None else None
+        except RuntimeError:
+            return "unknown"
+        if task is None:
+            return "<loop callback>"
+        if labels:
+            return " → ".join(labels)
+        return task.get_name()
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            self._last_beat = before
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - before - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._window_max_lag = max(self._window_max_lag, lag)
+
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if lag >= self.threshold:
+                stall = pending or {"label": "unknown", "stack": None}
+                stall["lag"] = lag
+                stall["at"] = datetime.datetime.now()
+                self.stalls.append(stall)
+                self._window_stalls += 1
+
+    async def _log_loop(self):
+        while True:
+            await asyncio.sleep(self.log_interval)
+            worst = max(self.stalls, key=lambda s: s["lag"], default=None)
+            worst_text = f", worst: {worst['label']} ({worst['lag'] * 1000:.0f}ms)" if worst else ""
+            print(
+                f"Event loop: max lag {self._window_max_lag * 1000:.0f}ms, "
+                f"{self._window_stalls} stalls in the last {self.log_interval:.0f}s{worst_text}"
+            )
+            self._window_max_lag = 0.0
+            self._window_stalls = 0
+
+    def _watch(self):
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stopping.wait(poll):
+            silent_for = time.monotonic() - self._last_beat - self.interval
+            if silent_for < self.threshold:
+                continue
+            with self._lock:
+                if self._pending is not None:
+                    continue  # Already sampled this stall
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self._pending = {
+                    "label": self._current_label(),
+                    "stack": "".join(traceback.format_stack(frame)) if frame is not None else None
+                }
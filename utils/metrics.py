@@ -0,0 +1,283 @@
+import asyncio
+import bisect
+import contextlib
+import time
+
+import discord
+
+# Upper bounds in seconds; Discord round trips and slow commands fit in the top end
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """A monotonically increasing count per combination of label values"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+
+    def inc(self, *label_values, amount=1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render(self):
+        for label_values, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+
+
+class Gauge:
+    """A value read from a callback each time the metrics are scraped"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = ()
+        self._read = read
+
+    def render(self):
+        yield f"{self.name} {_format_value(self._read())}"
+
+
+class Histogram:
+    """Bucketed observations (usually durations in seconds) per combination of label values"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum]
+
+    def observe(self, value, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    @contextlib.contextmanager
+    def time(self, *label_values):
+        """Observe how long the with-block took"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def render(self):
+        bounds = self.buckets + (float("inf"),)
+        for label_values, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, [("le", _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """In-process metrics, served over HTTP in the Prometheus text format
+
+    Metrics are only ever updated from the event loop, so they need no
+    locking; a scrape renders them on the loop too.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._server = None
+
+    def counter(self, name, help_text, label_names=()):
+        return self._register(Counter(name, help_text, label_names))
+
+    def gauge(self, name, help_text, read):
+        return self._register(Gauge(name, help_text, read))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape(metric.help_text)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # A broken gauge callback shouldn't take the whole scrape down
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, host="127.0.0.1", port=9108):
+        """Start answering GET /metrics on host:port (safe to call more than once)"""
+        if self._server is None:
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Skip the headers; nothing in them changes the response
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] in ("/", "/metrics"):
+                status, content_type, body = "200 OK", "text/plain; version=0.0.4; charset=utf-8", self.render()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", "Not found\n"
+
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class InstrumentedBackend:
+    """Wraps a profile storage backend and times its loads, prepares and writes"""
+
+    def __init__(self, backend, registry):
+        self._backend = backend
+        self._name = type(backend).__name__.replace("Backend", "").lower()
+        self._seconds = registry.histogram(
+            "slayy_storage_duration_seconds",
+            "Time spent loading, preparing and writing profiles",
+            ("backend", "operation")
+        )
+        self._written = registry.counter(
+            "slayy_storage_profiles_written_total",
+            "Profiles written (or deleted) by flushes",
+            ("backend",)
+        )
+        self._errors = registry.counter(
+            "slayy_storage_errors_total",
+            "Storage operations that raised",
+            ("backend", "operation")
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    async def load(self):
+        with self._timed("load"):
+            return await self._backend.load()
+
+    def prepare(self, profiles, user_ids):
+        with self._timed("prepare"):
+            # Carry the profile count along so write() can count it
+            return len(user_ids), self._backend.prepare(profiles, user_ids)
+
+    async def write(self, batch):
+        size, batch = batch
+        with self._timed("write"):
+            await self._backend.write(batch)
+        self._written.inc(self._name, amount=size)
+
+    async def close(self):
+        await self._backend.close()
+
+    @contextlib.contextmanager
+    def _timed(self, operation):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._errors.inc(self._name, operation)
+            raise
+        finally:
+            self._seconds.observe(time.perf_counter() - started, self._name, operation)
+
+
+def instrument_http(http, registry):
+    """Count and time every REST call the bot makes to Discord
+
+    Requests are labelled with their route template (for example
+    /channels/{channel_id}/messages) rather than the concrete path, so the
+    number of series stays small. Time spent waiting on rate limits is
+    included, since that is latency users see.
+    """
+    seconds = registry.histogram(
+        "slayy_discord_request_duration_seconds",
+        "Time spent on Discord REST calls, including rate-limit waits",
+        ("method", "route")
+    )
+    requests = registry.counter(
+        "slayy_discord_requests_total",
+        "Discord REST calls by response status",
+        ("method", "route", "status")
+    )
+    request = http.request
+
+    async def timed_request(route, *args, **kwargs):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await request(route, *args, **kwargs)
+            status = "2xx"
+            return response
+        except discord.HTTPException as e:
+            status = str(e.status)
+            raise
+        finally:
+            seconds.observe(time.perf_counter() - started, route.method, route.path)
+            requests.inc(route.method, route.path, status)
+
+    http.request = timed_request
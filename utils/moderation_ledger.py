@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import aiosqlite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mod_actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    reason TEXT,
+    duration INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mod_actions_guild ON mod_actions (guild_id, id);
+CREATE INDEX IF NOT EXISTS idx_mod_actions_member ON mod_actions (guild_id, user_id, id);
+
+CREATE TABLE IF NOT EXISTS active_warnings (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+);
+"""
+
+
+class ModerationLedger:
+    """Every warning, timeout and warning reset, kept in a SQLite database
+
+    The full history stays on disk. Only the active warning count of each
+    warned member is held in memory, so checking a count (and whether it
+    crosses an escalation threshold) is a dict lookup. History is read a
+    page at a time, newest first, with keyset paging on the entry id: a page
+    deep into a guild's history costs the same as the first one.
+
+    In a sharded launch each guild belongs to one process, so the counts it
+    caches for its own guilds are never changed behind its back. Writes
+    share one connection, so each holds a lock from its first statement to
+    its commit or rollback; otherwise one command's commit or rollback
+    could land in the middle of another's transaction.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._active = {}  # (guild_id, user_id) -> active warning count
+        self._db = None
+        self._write_lock = asyncio.Lock()
+
+    async def connect(self):
+        if self._db is None:
+            self._db = await aiosqlite.connect(self.path)
+            await self._db.execute("PRAGMA journal_mode=WAL")
+            await self._db.execute("PRAGMA synchronous=NORMAL")
+            await self._db.executescript(SCHEMA)
+            await self._db.commit()
+        return self._db
+
+    async def load(self):
+        db = await self.connect()
+        async with db.execute("SELECT guild_id, user_id, count FROM active_warnings WHERE count > 0") as cursor:
+            self._active = {(guild_id, user_id): count async for guild_id, user_id, count in cursor}
+
+    def active_warnings(self, guild_id, user_id):
+        return self._active.get((guild_id, user_id), 0)
+
+    async def add_warning(self, guild_id, user_id, moderator_id, reason):
+        """Record a warning and return the member's new active warning count"""
+        counts = await self.add_warnings(guild_id, [user_id], moderator_id, reason)
+        return counts[user_id]
+
+    async def add_warnings(self, guild_id, user_ids, moderator_id, reason):
+        """Record the same warning for several members in one transaction
+
+        Returns {user_id: new active warning count}.
+        """
+        db = await self.connect()
+        async with self._write_lock:
+            try:
+                await self._insert(db, guild_id, user_ids, moderator_id, "warn", reason)
+                await db.executemany(
+                    "INSERT INTO active_warnings (guild_id, user_id, count) VALUES (?, ?, 1) "
+                    "ON CONFLICT(guild_id, user_id) DO UPDATE SET count = count + 1",
+                    [(guild_id, user_id) for user_id in user_ids]
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            counts = {}
+            for user_id in user_ids:
+                counts[user_id] = self._active[(guild_id, user_id)] = self.active_warnings(guild_id, user_id) + 1
+        return counts
+
+    async def add_timeout(self, guild_id, user_id, moderator_id, minutes, reason):
+        await self.add_timeouts(guild_id, [user_id], moderator_id, minutes, reason)
+
+    async def add_timeouts(self, guild_id, user_ids, moderator_id, minutes, reason):
+        db = await self.connect()
+        async with self._write_lock:
+            try:
+                await self._insert(db, guild_id, user_ids, moderator_id, "timeout", reason, minutes)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def clear_warnings(self, guild_id, user_id, moderator_id, reason=None):
+        """Reset a member's active warnings; the warnings stay in the history"""
+        db = await self.connect()
+        async with self._write_lock:
+            try:
+                await self._insert(db, guild_id, [user_id], moderator_id, "clear", reason)
+                await db.execute("DELETE FROM active_warnings WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            return self._active.pop((guild_id, user_id), 0)
+
+    async def history(self, guild_id, user_id=None, before=None, limit=10):
+        """Return up to limit entries older than entry id before, newest first
+
+        Each entry is a dict with id, user_id, moderator_id, action, reason,
+        duration and created_at. Pass the last entry's id as before to get
+        the next page.
+        """
+        db = await self.connect()
+        where, params = "guild_id = ?", [guild_id]
+        if user_id is not None:
+            where += " AND user_id = ?"
+            params.append(user_id)
+        if before is not None:
+            where += " AND id < ?"
+            params.append(before)
+        params.append(limit)
+        async with db.execute(
+            "SELECT id, user_id, moderator_id, action, reason, duration, created_at "
+            f"FROM mod_actions WHERE {where} ORDER BY id DESC LIMIT ?",
+            params
+        ) as cursor:
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) async for row in cursor]
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def _insert(self, db, guild_id, user_ids, moderator_id, action, reason, duration=None):
+        created_at = time.time()
+        await db.executemany(
+            "INSERT INTO mod_actions (guild_id, user_id, moderator_id, action, reason, duration, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(guild_id, user_id, moderator_id, action, reason, duration, created_at) for user_id in user_ids]
+        )
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Per-key token buckets used to pace the bot's own sends
+
+    Each key (normally a channel id) refills at rate tokens per second up
+    to capacity. acquire() waits until a token is available; try_acquire()
+    never waits. Idle buckets are dropped so memory tracks active channels.
+    """
+
+    def __init__(self, rate=1.0, capacity=5, idle_after=300.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.idle_after = idle_after
+        self._buckets = {}  # key -> [tokens, last refill time]
+        self._next_sweep = time.monotonic() + idle_after
+
+    def try_acquire(self, key):
+        """Take a token if one is available, returning whether it was"""
+        bucket = self._refill(key)
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True
+        return False
+
+    async def acquire(self, key):
+        """Wait for a token and take it"""
+        while True:
+            bucket = self._refill(key)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return
+            await asyncio.sleep((1 - bucket[0]) / self.rate)
+
+    def _refill(self, key):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.capacity), now]
+        else:
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+    def _sweep(self, now):
+        self._next_sweep = now + self.idle_after
+        stale = [key for key, bucket in self._buckets.items() if now - bucket[1] > self.idle_after]
+        for key in stale:
+            del self._buckets[key]
+
+
+async def run_bounded(items, action, concurrency=8):
+    """Run action(item) for every item with at most concurrency calls in flight
+
+    Returns one result per item, in order; an exception raised by action is
+    returned in place of its result so one failure doesn't stop the rest.
+    discord.py still queues each request on its rate-limit bucket, so the
+    pool only bounds how many requests wait there at once.
+    """
+    results = [None] * len(items)
+    pending = iter(enumerate(items))
+
+    async def worker():
+        # Workers share one iterator, so each item is taken exactly once
+        for index, item in pending:
+            try:
+                results[index] = await action(item)
+            except Exception as e:
+                results[index] = e
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)))))
+    return results
+
+
+class WarningCoalescer:
+    """Collapses content warnings in a channel into one message per window
+
+    The first flagged message in a channel posts a warning. Further flagged
+    messages within window seconds bump a counter; the warning is then
+    edited to cover all of them, at most once per window, instead of a new
+    warning being posted for each one. A channel's entry is dropped when its
+    window ends, so only channels warned in the last window are held.
+    """
+
+    def __init__(self, throttle, window=60.0):
+        self.throttle = throttle
+        self.window = window
+        self._active = {}  # channel id -> _ChannelWarning
+
+    async def warn(self, channel):
+        """Record a flagged message in channel, posting or updating the warning"""
+        now = time.monotonic()
+        warning = self._active.get(channel.id)
+
+        if warning is not None and now - warning.started < self.window:
+            warning.count += 1
+            if warning.flush_task is None:
+                # Fold every hit in the rest of the window into a single edit
+                delay = max(0.0, warning.started + self.window - now)
+                warning.flush_task = asyncio.create_task(self._flush(channel.id, warning, delay))
+            return
+
+        warning = self._active[channel.id] = _ChannelWarning(now)
+        asyncio.get_running_loop().call_later(self.window, self._expire, channel.id, warning)
+        await self.throttle.acquire(channel.id)
+        warning.message = await channel.send(warning_text(1))
+
+    def _expire(self, channel_id, warning):
+        # A pending flush removes the entry itself once the edit is sent
+        if self._active.get(channel_id) is warning and warning.flush_task is None:
+            del self._active[channel_id]
+
+    async def _flush(self, channel_id, warning, delay):
+        await asyncio.sleep(delay)
+        if self._active.get(channel_id) is warning:
+            del self._active[channel_id]
+        if warning.message is None:
+            return
+        try:
+            await self.throttle.acquire(channel_id)
+            await warning.message.edit(content=warning_text(warning.count))
+        except Exception as e:
+            print(f"Couldn't update content warning: {e}")
+
+
+class _ChannelWarning:
+    __slots__ = ("started", "count", "message", "flush_task")
+
+    def __init__(self, started):
+        self.started = started
+        self.count = 1
+        self.message = None
+        self.flush_task = None
+
+
+def warning_text(count):
+    if count == 1:
+        return "⚠️ Content warning: This message may contain triggering content for some members."
+    return f"⚠️ Content warning: The last {count} messages may contain triggering content for some members."
@@ -0,0 +1,175 @@
+import datetime
+import sys
+
+# Preferences every profile has unless the user changed them. They aren't
+# stored per profile; a profile only holds the ones that differ.
+DEFAULT_PREFERENCES = {"daily_affirmation": False}
+
+
+def pack_date(date_str):
+    """Pack a DD-MM-YYYY string into a YYYYMMDD int
+
+    Anything that isn't a valid date written exactly that way is returned
+    unchanged, so odd values from old data files survive a round trip.
+    """
+    try:
+        day, month, year = date_str.split('-')
+        date = datetime.date(int(year), int(month), int(day))
+    except (AttributeError, TypeError, ValueError):
+        return date_str
+    if len(day) != 2 or len(month) != 2 or len(year) != 4:
+        return date_str  # A real date, but it wouldn't unpack to the same string
+    return date.year * 10000 + date.month * 100 + date.day
+
+
+def unpack_date(packed):
+    """Turn a packed date back into its DD-MM-YYYY string"""
+    if not isinstance(packed, int):
+        return packed
+    year, month_day = divmod(packed, 10000)
+    month, day = divmod(month_day, 100)
+    return f"{day:02d}-{month:02d}-{year:04d}"
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Profile:
+    """One user's profile, laid out to stay small at millions of users
+
+    Values are kept in slots rather than a dict per profile. Pronouns are
+    interned, so everyone using "she/her" shares one string. Birthdates
+    and milestone dates are packed into YYYYMMDD ints. Triggers are a
+    tuple; whole-word triggers, milestones and changed preferences are
+    None until the user has some, which for most users is never.
+    """
+
+    __slots__ = ("_pronouns", "_birthdate", "_triggers", "_whole_words", "_milestones", "_preferences")
+
+    def __init__(self, pronouns=None, birthdate=None, triggers=(), whole_word_triggers=(), milestones=None, preferences=None):
+        self.pronouns = pronouns
+        self.birthdate = birthdate
+        self._triggers = tuple(triggers)
+        whole_words = set(whole_word_triggers) & set(self._triggers)
+        self._whole_words = frozenset(whole_words) if whole_words else None
+        self._milestones = None
+        for date_str, description in (milestones or {}).items():
+            self.add_milestone(date_str, description)
+        self._preferences = None
+        for key, value in (preferences or {}).items():
+            self.set_preference(key, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a profile from its JSON form"""
+        return cls(
+            pronouns=data.get("pronouns"),
+            birthdate=data.get("birthdate"),
+            triggers=data.get("triggers") or (),
+            whole_word_triggers=data.get("whole_word_triggers") or (),
+            milestones=data.get("milestones"),
+            preferences=data.get("preferences")
+        )
+
+    def to_dict(self):
+        """Return the profile's JSON form (the same shape user_data.json has always used)"""
+        return {
+            "pronouns": self.pronouns,
+            "triggers": list(self._triggers),
+            "whole_word_triggers": list(self.whole_word_triggers),
+            "birthdate": self.birthdate,
+            "milestones": self.milestones,
+            "preferences": self.preferences
+        }
+
+    def __repr__(self):
+        return f"Profile({self.to_dict()!r})"
+
+    @property
+    def pronouns(self):
+        return self._pronouns
+
+    @pronouns.setter
+    def pronouns(self, value):
+        self._pronouns = _intern(value)
+
+    @property
+    def birthdate(self):
+        """The birthdate as a DD-MM-YYYY string, or None"""
+        return unpack_date(self._birthdate)
+
+    @birthdate.setter
+    def birthdate(self, value):
+        self._birthdate = pack_date(value) if value else None
+
+    @property
+    def triggers(self):
+        return self._triggers
+
+    @property
+    def whole_word_triggers(self):
+        """The triggers that only match as whole words, in trigger order"""
+        if not self._whole_words:
+            return ()
+        return tuple(trigger for trigger in self._triggers if trigger in self._whole_words)
+
+    def is_whole_word(self, trigger):
+        return bool(self._whole_words) and trigger in self._whole_words
+
+    def add_trigger(self, trigger, whole_word=False):
+        self._triggers += (trigger,)
+        self.set_whole_word(trigger, whole_word)
+
+    def remove_trigger(self, trigger):
+        """Remove a trigger, returning whether the profile had it"""
+        if trigger not in self._triggers:
+            return False
+        self._triggers = tuple(t for t in self._triggers if t != trigger)
+        self.set_whole_word(trigger, False)
+        return True
+
+    def set_whole_word(self, trigger, whole_word):
+        whole_words = set(self._whole_words or ())
+        if whole_word:
+            whole_words.add(trigger)
+        else:
+            whole_words.discard(trigger)
+        self._whole_words = frozenset(whole_words) if whole_words else None
+
+    @property
+    def milestones(self):
+        """A new {DD-MM-YYYY: description} dict of the user's milestones"""
+        return dict(self.milestone_items())
+
+    def milestone_items(self):
+        """Yield (DD-MM-YYYY, description) for every milestone"""
+        for packed, description in (self._milestones or {}).items():
+            yield unpack_date(packed), description
+
+    def add_milestone(self, date_str, description):
+        if self._milestones is None:
+            self._milestones = {}
+        self._milestones[pack_date(date_str)] = description
+
+    @property
+    def preferences(self):
+        """A new dict of every preference, defaults included"""
+        return {**DEFAULT_PREFERENCES, **(self._preferences or {})}
+
+    def get_preference(self, key, default=None):
+        if self._preferences and key in self._preferences:
+            return self._preferences[key]
+        return DEFAULT_PREFERENCES.get(key, default)
+
+    def set_preference(self, key, value):
+        """Set a preference; None (or the default value) drops it back to the default"""
+        if value is None or (key in DEFAULT_PREFERENCES and DEFAULT_PREFERENCES[key] == value):
+            if self._preferences:
+                self._preferences.pop(key, None)
+                if not self._preferences:
+                    self._preferences = None
+            return
+        if self._preferences is None:
+            self._preferences = {}
+        self._preferences[_intern(key)] = _intern(value)
@@ -0,0 +1,125 @@
+import asyncio
+
+from utils.profile import Profile
+
+
+class ProfileStore:
+    """In-memory user profiles with batched write-behind persistence
+
+    Profiles are read from the storage backend once and then served from
+    memory. Commands mutate the Profile objects in place and call mark_dirty();
+    a background task writes the changes out every flush_interval seconds,
+    or sooner once max_dirty profiles are waiting. close() flushes whatever
+    is left and closes the backend.
+    """
+
+    def __init__(self, backend, flush_interval=5.0, max_dirty=100):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.loaded = False
+        self._profiles = {}
+        self._dirty = set()
+        self._in_flight = set()  # Ids in the batch being written right now
+        self._wakeup = None
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+
+    async def load(self):
+        """Read every profile from the backend (only the first call does any work)"""
+        if self.loaded:
+            return
+        self._profiles = await self.backend.load()
+        self.loaded = True
+
+    @property
+    def profiles(self):
+        return self._profiles
+
+    def get(self, user_id):
+        """Return a user's profile, or None if they have none"""
+        return self._profiles.get(str(user_id))
+
+    def get_or_create(self, user_id):
+        """Return a user's profile, creating the default one if needed"""
+        user_id = str(user_id)  # Convert to string for JSON compatibility
+        profile = self._profiles.get(user_id)
+        if profile is None:
+            profile = self._profiles[user_id] = Profile()
+            self.mark_dirty(user_id)
+        return profile
+
+    def delete(self, user_id):
+        """Remove a user's profile, returning whether one existed"""
+        user_id = str(user_id)
+        if user_id not in self._profiles:
+            return False
+        del self._profiles[user_id]
+        self.mark_dirty(user_id)
+        return True
+
+    def apply_remote(self, user_id, profile):
+        """Take a profile another process wrote (None if it deleted the profile)
+
+        Returns False and keeps the local copy if this process has its own
+        unsaved change to the profile, or one that is being written right now;
+        that change is written (or retried) and wins.
+        """
+        user_id = str(user_id)
+        if user_id in self._dirty or user_id in self._in_flight:
+            return False
+        if profile is None:
+            self._profiles.pop(user_id, None)
+        else:
+            self._profiles[user_id] = profile
+        return True
+
+    def mark_dirty(self, user_id):
+        """Record that a profile changed and needs to be written out"""
+        self._dirty.add(str(user_id))
+        if len(self._dirty) >= self.max_dirty and self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the background flush task (safe to call more than once)"""
+        if self._flush_task is None or self._flush_task.done():
+            self._wakeup = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the background task and write any pending changes"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        await self.backend.close()
+
+    async def flush(self):
+        """Write pending changes to the backend without blocking the event loop"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            pending = self._in_flight = self._dirty
+            self._dirty = set()
+            try:
+                # Snapshot on the loop so the batch is consistent, write off it
+                batch = self.backend.prepare(self._profiles, pending)
+                await self.backend.write(batch)
+            except Exception as e:
+                print(f"Failed to save user data: {e}")
+                self._dirty |= pending  # Retry on the next flush
+            finally:
+                self._in_flight = set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+
+class ProfileSync:
+    """Keeps this process's profiles in step with other processes sharing a database
+
+    Each process of a sharded launch writes through a SqliteBackend with
+    its own origin, which logs every changed user id to profile_changes.
+    This task polls that log every interval seconds, reloads the profiles
+    other processes changed and calls on_change(user_id, profile) so the
+    derived indexes follow. A change made in one process is therefore seen
+    by all others within the writer's flush interval plus interval.
+    """
+
+    def __init__(self, store, on_change, interval=1.0, retention=3600.0):
+        self.store = store
+        self.on_change = on_change
+        self.interval = interval
+        self.retention = retention
+        self._seq = None
+        self._task = None
+
+    def start(self):
+        """Start polling (safe to call more than once); call after the store has loaded"""
+        if self._task is None or self._task.done():
+            if self._seq is None:
+                self._seq = self.store.backend.change_seq
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def poll(self):
+        """Apply every change other processes made since the last poll"""
+        backend = self.store.backend
+        seq, user_ids = await backend.changes_since(self._seq)
+        if user_ids:
+            profiles = await backend.load_profiles(user_ids)
+            for user_id in user_ids:
+                profile = profiles.get(user_id)
+                if self.store.apply_remote(user_id, profile):
+                    self.on_change(user_id, profile)
+        self._seq = seq
+        return len(user_ids)
+
+    async def _run(self):
+        last_prune = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+                # The log only has to outlive the slowest poller, so old entries go
+                if time.monotonic() - last_prune > self.retention / 10:
+                    await self.store.backend.prune_changes(self.retention)
+                    last_prune = time.monotonic()
+            except Exception as e:
+                print(f"Failed to sync profile changes: {e}")
@@ -0,0 +1,155 @@
+import asyncio
+import collections
+import datetime
+import os
+import sys
+import sysconfig
+import threading
+
+
+class SamplingProfiler:
+    """Samples the event loop's stack and writes collapsed stacks for flame graphs
+
+    While a profile runs, a background thread grabs the loop thread's stack
+    every interval seconds. Only code objects are kept per sample, so the
+    cost on the loop is the few microseconds sys._current_frames() needs to
+    take the GIL. A profile covers either a time window, or the next N
+    invocations of one command: then only samples taken while one of that
+    command's tasks is running are counted.
+
+    The output is one "frame;frame;frame count" line per distinct stack,
+    root first, which flamegraph.pl, speedscope and inferno all read.
+    """
+
+    def __init__(self, output_dir, interval=0.01, max_duration=3600.0):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.max_duration = max_duration
+        self.command = None
+        self.remaining = None
+        self.samples = 0
+        self._stacks = collections.Counter()
+        self._targets = set()  # Tasks currently running the profiled command
+        self._loop = None
+        self._loop_thread_id = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._timer = None
+        self._done = None
+
+    @property
+    def active(self):
+        return self._thread is not None and not self._stopping.is_set()
+
+    def start(self, duration=None, command=None, invocations=None):
+        """Start profiling for duration seconds, or for the next invocations of command
+
+        Returns a future that resolves to (path, samples) once the profile
+        has been written. A command profile still stops after duration (or
+        max_duration) seconds, so a rarely used command can't leave the
+        sampler running forever.
+        """
+        if self._thread is not None:
+            raise RuntimeError("A profile is already running")
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self.command = command
+        self.remaining = invocations if command else None
+        self.samples = 0
+        self._stacks = collections.Counter()
+        self._targets = set()
+        self._stopping.clear()
+        self._done = self._loop.create_future()
+        self._timer = self._loop.call_later(min(duration or self.max_duration, self.max_duration), self.stop)
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self._done
+
+    def stop(self):
+        """Stop sampling; the profile is written in the background"""
+        if not self.active:
+            return
+        self._stopping.set()
+        self._timer.cancel()
+        asyncio.create_task(self._finish())
+
+    def command_started(self, name):
+        """Called as a command starts, on the task that runs it"""
+        if self.active and name == self.command:
+            self._targets.add(asyncio.current_task())
+
+    def command_finished(self, name):
+        task = asyncio.current_task()
+        if task not in self._targets:
+            return
+        self._targets.discard(task)
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.stop()
+
+    async def _finish(self):
+        await asyncio.to_thread(self._thread.join)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        target = self.command.replace(" ", "_") if self.command else "all"
+        path = os.path.join(self.output_dir, f"profile-{stamp}-{target}.collapsed")
+        try:
+            await asyncio.to_thread(self._write, path)
+        except OSError as e:
+            self._done.set_exception(e)
+        else:
+            self._done.set_result((path, self.samples))
+        finally:
+            self._thread = None
+            self._targets = set()
+
+    def _sample(self):
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            if self.command is not None:
+                try:
+                    task = asyncio.current_task(self._loop)
+                except RuntimeError:
+                    continue
+                if task not in self._targets:
+                    continue
+
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            self._stacks[tuple(reversed(codes))] += 1
+            self.samples += 1
+
+    def _write(self, path):
+        names = {}
+        lines = []
+        for codes, count in self._stacks.most_common():
+            frames = []
+            for code in codes:
+                name = names.get(code)
+                if name is None:
+                    name = names[code] = f"{getattr(code, 'co_qualname', code.co_name)} ({_short_path(code.co_filename)})"
+                frames.append(name)
+            lines.append(f"{';'.join(frames)} {count}\n")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(path, 'w') as f:
+            f.writelines(lines)
+
+
+def _short_path(filename):
+    """Trim a source path down to the part that identifies it"""
+    marker = f"site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    stdlib = sysconfig.get_paths()["stdlib"] + os.sep
+    if filename.startswith(stdlib):
+        return filename[len(stdlib):]
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:
+        return filename
+    return filename if relative.startswith("..") else relative
@@ -0,0 +1,44 @@
+import asyncio
+
+
+class ReplyRegistry:
+    """Hands a user's next message in a channel to whatever is waiting for it
+
+    Stands in for bot.wait_for("message", check=...), which runs every
+    pending check against every incoming message. Waiters here are keyed by
+    (channel id, author id), so each message costs one dict lookup however
+    many conversations are open.
+    """
+
+    def __init__(self):
+        self._waiters = {}
+
+    def __len__(self):
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def wait(self, channel_id, author_id, timeout=None):
+        """Return the author's next message in the channel
+
+        Raises asyncio.TimeoutError if none arrives within timeout seconds.
+        """
+        key = (channel_id, author_id)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[key]
+
+    def dispatch(self, message):
+        """Resolve the waiters for this message's channel and author, if any"""
+        waiters = self._waiters.pop((message.channel.id, message.author.id), None)
+        if not waiters:
+            return False
+        for future in waiters:
+            if not future.done():
+                future.set_result(message)
+        return True
@@ -0,0 +1,170 @@
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+
+# How much a query term counts for, by the field it was found in
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+
+# A partial last word expands to at most this many vocabulary terms
+MAX_PREFIX_TERMS = 50
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split text into accent-free, casefolded words"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WORD.findall(stripped.casefold())
+
+
+class ResourceIndex:
+    """Inverted index over resources.json for ranked search and autocomplete
+
+    Every word of a resource's name, category and description maps to the
+    resources containing it, weighted by field. A query scores the resources
+    that contain all of its words by field weight times inverse document
+    frequency, so a lookup only touches the posting lists of the query's
+    words rather than the whole directory. The last query word may be a
+    prefix, found by bisecting the sorted vocabulary.
+
+    The index follows the ContentCache it reads from. When the file
+    changes, only resources that were added, removed or edited are
+    unindexed or reindexed.
+    """
+
+    def __init__(self, content_cache):
+        self.content_cache = content_cache
+        self._version = None
+        self._resources = {}  # doc id -> (category, resource)
+        self._doc_ids = {}  # (category, name, url, description) -> doc id
+        self._postings = {}  # term -> {doc id: weight}
+        self._terms = []  # Sorted vocabulary, for prefix lookups
+        self._next_id = 0
+
+    def __len__(self):
+        self.refresh()
+        return len(self._resources)
+
+    def search(self, query, limit=5):
+        """Return up to limit (category, resource) pairs matching query, best first"""
+        self.refresh()
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # The last word may still be being typed, so it also matches as a prefix
+        matches = [self._matching_terms(word, prefix=index == len(words) - 1) for index, word in enumerate(words)]
+        if not all(matches):
+            return []
+        # Start from the rarest word and only look the others up for its documents
+        matches.sort(key=lambda terms: sum(len(self._postings[term]) for term, _ in terms))
+
+        scores = {}
+        for term, factor in matches[0]:
+            for doc_id, weight in self._postings[term].items():
+                score = weight * factor
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        for terms in matches[1:]:
+            narrowed = {}
+            for doc_id, score in scores.items():
+                best = 0.0
+                for term, factor in terms:
+                    weight = self._postings[term].get(doc_id)
+                    if weight is not None and weight * factor > best:
+                        best = weight * factor
+                if best:
+                    narrowed[doc_id] = score + best
+            scores = narrowed
+            if not scores:
+                return []
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._resources[doc_id] for doc_id, _ in best]
+
+    def complete(self, prefix, limit=10):
+        """Return up to limit indexed words starting with prefix, most common first"""
+        self.refresh()
+        words = tokenize(prefix)
+        if not words:
+            return []
+        terms = self._expand(words[-1])
+        terms.sort(key=lambda term: (-len(self._postings[term]), term))
+        return terms[:limit]
+
+    def _matching_terms(self, word, prefix):
+        """Return (term, idf * boost) for every indexed term a query word matches"""
+        terms = self._expand(word) if prefix else ([word] if word in self._postings else [])
+        total = len(self._resources)
+        # Whole-word matches outrank completions of a partial word
+        return [
+            (term, math.log(1 + total / len(self._postings[term])) * (1.0 if term == word else 0.5))
+            for term in terms
+        ]
+
+    def _expand(self, prefix):
+        start = bisect.bisect_left(self._terms, prefix)
+        terms = []
+        for term in self._terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def refresh(self):
+        """Bring the index up to date with the resources file"""
+        resources = self.content_cache.get()
+        if self.content_cache.version == self._version:
+            return
+        self._version = self.content_cache.version
+
+        current = {}
+        for category, entries in resources.items():
+            for resource in entries:
+                key = (category, resource["name"], resource["url"], resource["description"])
+                current[key] = (category, resource)
+
+        vocabulary_size = len(self._postings)
+        changed = False
+        for key in [key for key in self._doc_ids if key not in current]:
+            self._remove(self._doc_ids.pop(key))
+            changed = True
+        for key, (category, resource) in current.items():
+            doc_id = self._doc_ids.get(key)
+            if doc_id is None:
+                self._doc_ids[key] = self._add(category, resource)
+                changed = True
+            else:
+                self._resources[doc_id] = (category, resource)  # Same content, fresh object
+        if changed or len(self._postings) != vocabulary_size:
+            # One sort per file change rather than an insort per new word
+            self._terms = sorted(self._postings)
+
+    def _add(self, category, resource):
+        doc_id = self._next_id
+        self._next_id += 1
+        self._resources[doc_id] = (category, resource)
+        for term, weight in self._weights(category, resource).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+            postings[doc_id] = weight
+        return doc_id
+
+    def _remove(self, doc_id):
+        category, resource = self._resources.pop(doc_id)
+        for term in self._weights(category, resource):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def _weights(self, category, resource):
+        weights = {}
+        for field, text in (("name", resource["name"]), ("category", category), ("description", resource["description"])):
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + FIELD_WEIGHTS[field]
+        return weights
@@ -0,0 +1,45 @@
+import os
+
+
+def parse_shard_ids(text):
+    """Parse a SHARD_IDS value like "0,1,2" (None if it is empty)"""
+    shard_ids = [int(part) for part in (text or "").split(",") if part.strip()]
+    return shard_ids or None
+
+
+def split_shards(shard_count, workers):
+    """Split shard ids 0..shard_count-1 into at most workers contiguous clusters"""
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    clusters = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        clusters.append(list(range(start, end)))
+        start = end
+    return clusters
+
+
+def shard_for(snowflake, shard_count):
+    """The shard Discord routes a guild to; also used to give each user one home shard"""
+    return (int(snowflake) >> 22) % shard_count
+
+
+def cluster_file(path, cluster_id):
+    """Give each process of a sharded launch its own copy of a per-process file"""
+    if cluster_id is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{cluster_id}{ext}"
+
+
+def handles_user(bot, user_id):
+    """Whether this process should send things addressed to a user, not a guild
+
+    A user can share guilds with several processes, so each user is given
+    to exactly one of them: the one running the user's home shard.
+    """
+    shard_ids = getattr(bot, "shard_ids", None)
+    if not bot.shard_count or shard_ids is None:
+        return True
+    return shard_for(user_id, bot.shard_count) in shard_ids
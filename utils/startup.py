@@ -0,0 +1,47 @@
+import contextlib
+import time
+
+
+class StartupTimer:
+    """Records how long each startup phase took, for a breakdown once the bot is ready
+
+    Phases may overlap (profiles load while the gateway connects), so each
+    one is reported with its own duration and the moment it finished.
+    """
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = []  # (name, start, end)
+        self.reported = False
+        self._open = {}  # name -> start, for phases that begin and end in different places
+
+    def record(self, name, start, end=None):
+        self.phases.append((name, start, end if end is not None else time.perf_counter()))
+
+    def begin(self, name):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name):
+        """Finish a phase started with begin(); does nothing if it wasn't started"""
+        start = self._open.pop(name, None)
+        if start is not None:
+            self.record(name, start)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def report(self):
+        """Return the breakdown as printable lines (only the first call returns anything)"""
+        if self.reported:
+            return ""
+        self.reported = True
+        lines = ["Startup timing:"]
+        for name, start, end in sorted(self.phases, key=lambda phase: phase[2]):
+            lines.append(f"  {name:<16}{(end - start) * 1000:8.0f}ms   done at +{end - self.started:.2f}s")
+        lines.append(f"  {'total':<16}{(time.perf_counter() - self.started) * 1000:8.0f}ms")
+        return "\n".join(lines)
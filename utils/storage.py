@@ -0,0 +1,450 @@
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+
+import aiosqlite
+
+from utils.profile import Profile
+
+
+# Snapshot key holding the journal generation the snapshot already includes
+GENERATION_KEY = "_journal_generation"
+
+
+class JsonBackend:
+    """Stores profiles as a JSON snapshot plus an append-only change journal
+
+    Each flush appends one line per changed profile to the journal instead of
+    rewriting the whole file. Once the journal holds compact_every records,
+    or as soon as a profile is deleted, it is folded into a fresh snapshot, written to a temp file and atomically
+    renamed over the old one. On load the journal is replayed on top of the
+    snapshot; a torn final line from a crash is ignored.
+
+    Every compaction starts a new journal generation. The snapshot records
+    its generation and each journal record is stamped with the one it was
+    written in, so records an older generation left behind are never
+    replayed over a newer snapshot.
+    """
+
+    def __init__(self, path, compact_every=1000):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_every = compact_every
+        self._journal_records = 0
+        self._generation = 0
+
+    async def load(self):
+        return await asyncio.to_thread(self._read)
+
+    def prepare(self, profiles, user_ids):
+        """Snapshot the changes to write (runs on the event loop)"""
+        # A deletion (!forgetme) compacts straight away, so the deleted
+        # profile is gone from both files rather than lingering in them
+        deleting = any(user_id not in profiles for user_id in user_ids)
+        if deleting or self._journal_records + len(user_ids) >= self.compact_every:
+            # Only copy the profiles here; serializing them happens in write()
+            return "snapshot", {user_id: profile.to_dict() for user_id, profile in profiles.items()}
+
+        lines = []
+        for user_id in user_ids:
+            profile = profiles.get(user_id)
+            record = {"id": user_id, "gen": self._generation, "profile": None if profile is None else profile.to_dict()}
+            lines.append(json.dumps(record) + "\n")
+        return "journal", "".join(lines), len(lines)
+
+    async def write(self, batch):
+        await asyncio.to_thread(self._write, batch)
+
+    async def close(self):
+        pass
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                profiles = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            profiles = {}
+        # Snapshots written before generations existed count as generation 0
+        self._generation = profiles.pop(GENERATION_KEY, 0)
+
+        self._journal_records = 0
+        good_offset = 0
+        torn = False
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        torn = True  # Partially written record from a crash
+                        break
+                    good_offset += len(line)
+                    if record.get("gen", 0) < self._generation:
+                        continue  # Already in the snapshot; left by a compaction that crashed
+                    if record["profile"] is None:
+                        profiles.pop(record["id"], None)
+                    else:
+                        profiles[record["id"]] = record["profile"]
+                    self._journal_records += 1
+        except FileNotFoundError:
+            pass
+
+        if torn:
+            # Cut the torn record off so later appends stay readable
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good_offset)
+
+        return {user_id: Profile.from_dict(profile) for user_id, profile in profiles.items()}
+
+    def _write(self, batch):
+        if batch[0] == "journal":
+            _, payload, records = batch
+            with open(self.journal_path, 'a') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_records += records
+            return
+
+        # Compaction: replace the snapshot first, then drop the journal. The
+        # snapshot carries the next generation, so if we crash before the
+        # journal is emptied its older records are skipped on load rather
+        # than reverting the newer state in the snapshot.
+        _, profiles = batch
+        generation = self._generation + 1
+        payload = json.dumps({GENERATION_KEY: generation, **profiles}, indent=4)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._generation = generation
+        with open(self.journal_path, 'w'):
+            pass
+        self._journal_records = 0
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    pronouns TEXT,
+    birthdate TEXT,
+    birth_month INTEGER,
+    birth_day INTEGER,
+    preferences TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_birthday ON profiles (birth_month, birth_day);
+
+CREATE TABLE IF NOT EXISTS triggers (
+    user_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    whole_word INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_triggers_word ON triggers (word COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS milestones (
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    month INTEGER,
+    day INTEGER,
+    description TEXT NOT NULL,
+    PRIMARY KEY (user_id, date)
+);
+CREATE INDEX IF NOT EXISTS idx_milestones_month_day ON milestones (month, day);
+
+CREATE TABLE IF NOT EXISTS profile_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    changed_at REAL NOT NULL
+);
+"""
+
+MILESTONES_NULLABLE_MIGRATION = """
+CREATE TABLE milestones_new (
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    month INTEGER,
+    day INTEGER,
+    description TEXT NOT NULL,
+    PRIMARY KEY (user_id, date)
+);
+INSERT INTO milestones_new SELECT user_id, date, month, day, description FROM milestones;
+DROP TABLE milestones;
+ALTER TABLE milestones_new RENAME TO milestones;
+CREATE INDEX IF NOT EXISTS idx_milestones_month_day ON milestones (month, day);
+"""
+
+
+def _split_date(date_str):
+    """Return (month, day) for a valid DD-MM-YYYY date, or (None, None)
+
+    Rows with anything else keep their raw string but get NULL month and
+    day, so they are stored but never turn up in a birthday lookup.
+    """
+    try:
+        day, month, year = map(int, date_str.split('-'))
+        datetime.date(year, month, day)
+    except (AttributeError, TypeError, ValueError):
+        return None, None
+    return month, day
+
+
+class SqliteBackend:
+    """Stores profiles as rows in a SQLite database (WAL mode)
+
+    Only the profiles that changed since the last flush are written, so the
+    cost of a save no longer depends on how many users the bot knows about.
+    If import_from points at an old user_data.json, that file is imported
+    the first time the backend is loaded against a fresh database.
+
+    When several processes share the database, each one passes an origin
+    name. Every write then also logs the changed user ids to the
+    profile_changes table, which the other processes poll (see
+    utils.profile_sync) to pick up each other's changes.
+    """
+
+    def __init__(self, path, import_from=None, origin=None):
+        self.path = path
+        self.import_from = import_from
+        self.origin = origin
+        self.change_seq = 0  # Last change already reflected in what load() returned
+        self._db = None
+
+    async def connect(self):
+        if self._db is None:
+            self._db = await aiosqlite.connect(self.path)
+            await self._db.execute("PRAGMA journal_mode=WAL")
+            await self._db.execute("PRAGMA synchronous=NORMAL")
+            await self._db.executescript(SCHEMA)
+            async with self._db.execute("PRAGMA table_info(triggers)") as cursor:
+                columns = [row[1] async for row in cursor]
+            if "whole_word" not in columns:
+                # Databases created before whole-word triggers existed
+                await self._db.execute("ALTER TABLE triggers ADD COLUMN whole_word INTEGER NOT NULL DEFAULT 0")
+            async with self._db.execute("PRAGMA table_info(milestones)") as cursor:
+                not_null = {row[1]: row[3] async for row in cursor}
+            if not_null.get("month"):
+                # Databases created when malformed milestone dates were dropped
+                await self._db.executescript(MILESTONES_NULLABLE_MIGRATION)
+            await self._db.commit()
+        return self._db
+
+    async def load(self):
+        db = await self.connect()
+        if self.origin is not None:
+            # Read the position first: a change landing mid-load is replayed, not missed
+            async with db.execute("SELECT COALESCE(MAX(seq), 0) FROM profile_changes") as cursor:
+                (self.change_seq,) = await cursor.fetchone()
+
+        profiles = await self._read_profiles(db)
+
+        if self.import_from:
+            async with db.execute("SELECT value FROM meta WHERE key = 'json_imported'") as cursor:
+                already_imported = await cursor.fetchone() is not None
+            if not already_imported:
+                if not profiles:
+                    profiles = await import_json_profiles(self.import_from, self)
+                await db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)", (self.import_from,))
+                await db.commit()
+
+        return profiles
+
+    async def load_profiles(self, user_ids):
+        """Read just the given profiles; ids missing from the result have no profile"""
+        db = await self.connect()
+        profiles = {}
+        user_ids = list(user_ids)
+        # Stay well under SQLite's limit on bound parameters
+        for start in range(0, len(user_ids), 500):
+            profiles.update(await self._read_profiles(db, user_ids[start:start + 500]))
+        return profiles
+
+    async def changes_since(self, seq):
+        """Return (latest seq, ids of profiles other processes changed after seq)"""
+        db = await self.connect()
+        user_ids = set()
+        async with db.execute(
+            "SELECT seq, user_id, origin FROM profile_changes WHERE seq > ? ORDER BY seq", (seq,)
+        ) as cursor:
+            async for seq, user_id, origin in cursor:
+                if origin != self.origin:
+                    user_ids.add(user_id)
+        return seq, user_ids
+
+    async def prune_changes(self, older_than):
+        """Drop change log entries written more than older_than seconds ago"""
+        db = await self.connect()
+        await db.execute("DELETE FROM profile_changes WHERE changed_at < ?", (time.time() - older_than,))
+        await db.commit()
+
+    async def _read_profiles(self, db, user_ids=None):
+        if user_ids is None:
+            where, params = "", ()
+        else:
+            where, params = f" WHERE user_id IN ({','.join('?' * len(user_ids))})", tuple(user_ids)
+
+        rows = {}
+        async with db.execute(f"SELECT user_id, pronouns, birthdate, preferences FROM profiles{where}", params) as cursor:
+            async for user_id, pronouns, birthdate, preferences in cursor:
+                rows[user_id] = (pronouns, birthdate, preferences)
+
+        triggers, whole_words = {}, {}
+        async with db.execute(
+            f"SELECT user_id, word, whole_word FROM triggers{where} ORDER BY user_id, position", params
+        ) as cursor:
+            async for user_id, word, whole_word in cursor:
+                triggers.setdefault(user_id, []).append(word)
+                if whole_word:
+                    whole_words.setdefault(user_id, []).append(word)
+
+        milestones = {}
+        async with db.execute(f"SELECT user_id, date, description FROM milestones{where}", params) as cursor:
+            async for user_id, date, description in cursor:
+                milestones.setdefault(user_id, {})[date] = description
+
+        return {
+            user_id: Profile(
+                pronouns=pronouns,
+                birthdate=birthdate,
+                triggers=triggers.get(user_id, ()),
+                whole_word_triggers=whole_words.get(user_id, ()),
+                milestones=milestones.get(user_id),
+                preferences=json.loads(preferences)
+            )
+            for user_id, (pronouns, birthdate, preferences) in rows.items()
+        }
+
+    def prepare(self, profiles, user_ids):
+        """Snapshot the changed rows to write (runs on the event loop)"""
+        batch = []
+        for user_id in user_ids:
+            profile = profiles.get(user_id)
+            if profile is None:
+                batch.append((user_id, None, (), ()))
+                continue
+
+            birthdate = profile.birthdate
+            month, day = _split_date(birthdate)
+            row = (
+                user_id,
+                profile.pronouns,
+                birthdate,
+                month,
+                day,
+                json.dumps(profile.preferences)
+            )
+            triggers = [
+                (user_id, position, word, int(profile.is_whole_word(word)))
+                for position, word in enumerate(profile.triggers)
+            ]
+            milestones = []
+            for date, description in profile.milestone_items():
+                m_month, m_day = _split_date(date)
+                milestones.append((user_id, date, m_month, m_day, description))
+            batch.append((user_id, row, triggers, milestones))
+        return batch
+
+    async def write(self, batch):
+        db = await self.connect()
+        try:
+            for user_id, row, triggers, milestones in batch:
+                await db.execute("DELETE FROM triggers WHERE user_id = ?", (user_id,))
+                await db.execute("DELETE FROM milestones WHERE user_id = ?", (user_id,))
+                if row is None:
+                    await db.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+                    continue
+
+                await db.execute(
+                    "INSERT INTO profiles (user_id, pronouns, birthdate, birth_month, birth_day, preferences) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET pronouns = excluded.pronouns, "
+                    "birthdate = excluded.birthdate, birth_month = excluded.birth_month, "
+                    "birth_day = excluded.birth_day, preferences = excluded.preferences",
+                    row
+                )
+                await db.executemany(
+                    "INSERT INTO triggers (user_id, position, word, whole_word) VALUES (?, ?, ?, ?)", triggers
+                )
+                await db.executemany(
+                    "INSERT INTO milestones (user_id, date, month, day, description) VALUES (?, ?, ?, ?, ?)",
+                    milestones
+                )
+            if self.origin is not None:
+                changed_at = time.time()
+                await db.executemany(
+                    "INSERT INTO profile_changes (user_id, origin, changed_at) VALUES (?, ?, ?)",
+                    [(user_id, self.origin, changed_at) for user_id, _, _, _ in batch]
+                )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+async def import_json_profiles(json_path, backend):
+    """Copy every profile from a user_data.json file into backend"""
+    profiles = await JsonBackend(json_path).load()
+    if profiles:
+        await backend.write(backend.prepare(profiles, list(profiles)))
+        print(f"Imported {len(profiles)} profiles from {json_path}")
+        for user_id, kind, date_str in _malformed_dates(profiles):
+            print(f"  {user_id}: {kind} {date_str!r} isn't a DD-MM-YYYY date; kept as-is but won't be celebrated")
+    return profiles
+
+
+def _malformed_dates(profiles):
+    """Yield (user_id, "birthdate" or "milestone", value) for dates _split_date can't read"""
+    for user_id, profile in profiles.items():
+        if profile.birthdate and _split_date(profile.birthdate)[0] is None:
+            yield user_id, "birthdate", profile.birthdate
+        for date_str, _ in profile.milestone_items():
+            if _split_date(date_str)[0] is None:
+                yield user_id, "milestone", date_str
+
+
+def open_backend(kind, json_path, database_path, origin=None):
+    """Create the storage backend named by kind ('json' or 'sqlite')
+
+    origin names this process when several share one SQLite database;
+    the JSON backend can't be shared, so it refuses one.
+    """
+    kind = (kind or "json").lower()
+    if kind == "json":
+        if origin is not None:
+            raise ValueError("The JSON backend can't be shared between processes; use sqlite")
+        return JsonBackend(json_path)
+    if kind == "sqlite":
+        return SqliteBackend(database_path, import_from=json_path, origin=origin)
+    raise ValueError(f"Unknown storage backend: {kind}")
+
+
+async def _import_main(json_path, database_path):
+    backend = SqliteBackend(database_path)
+    try:
+        await import_json_profiles(json_path, backend)
+    finally:
+        await backend.close()
+
+
+if __name__ == "__main__":
+    # One-shot migration: python -m utils.storage [user_data.json] [slayy_mom.db]
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "user_data.json")
+    database_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join("data", "slayy_mom.db")
+    asyncio.run(_import_main(json_path, database_path))
@@ -0,0 +1,121 @@
+import re
+import unicodedata
+
+# Lookalike letters from other scripts. Applied after casefolding, so only
+# lowercase keys are needed.
+CONFUSABLES = {
+    # Cyrillic
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+    "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ї": "i", "ј": "j",
+    "ѕ": "s", "ԁ": "d", "ԛ": "q", "ԝ": "w", "ɡ": "g",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+}
+
+# Digits and symbols swapped in for letters (leetspeak). These are only read
+# as letters when they sit between letters, as in k1ll or sh!t, so ordinary
+# numbers and punctuation ("omg!!!", "|") never turn into words.
+SUBSTITUTES = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b",
+    "@": "a", "$": "s", "!": "i", "|": "i", "+": "t", "€": "e",
+}
+_SUBSTITUTE_TABLE = str.maketrans(SUBSTITUTES)
+# Runs of substitutes followed by a letter; the letter before is checked separately
+_SUBSTITUTE_RUN = re.compile(rf"[{''.join(re.escape(char) for char in SUBSTITUTES)}]+(?=[^\W\d_])")
+
+
+class _FoldTable(dict):
+    """str.translate table that folds each character the first time it is seen
+
+    A character is decomposed (NFKD, which also undoes full-width and other
+    compatibility forms), stripped of accents, casefolded and run through
+    CONFUSABLES. The result is cached, so after warm-up translate() runs
+    entirely in C. SUBSTITUTES depend on the neighbouring characters, so
+    fold() applies them afterwards.
+    """
+
+    def __missing__(self, codepoint):
+        folded = []
+        for char in unicodedata.normalize("NFKD", chr(codepoint)):
+            if unicodedata.combining(char):
+                continue  # Accents and other combining marks
+            for folded_char in char.casefold():
+                folded.append(CONFUSABLES.get(folded_char, folded_char))
+        result = self[codepoint] = "".join(folded)
+        return result
+
+
+class _WordMaskTable(dict):
+    """str.translate table marking which folded characters came from word characters
+
+    Each character becomes as many "w" (letters and digits) or " " (anything
+    else) as it folds to, so the mask lines up with fold(text). word_mask()
+    then marks substitutes read as letters (the "!" in sh!t) as word
+    characters too.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        mark = "w" if char.isalnum() else " "
+        result = self[codepoint] = mark * len(_FOLD[codepoint])
+        return result
+
+
+_FOLD = _FoldTable()
+_WORD_MASK = _WordMaskTable()
+
+
+def _between_letters(folded):
+    """Yield the spans of substitute runs with a letter on both sides"""
+    for match in _SUBSTITUTE_RUN.finditer(folded):
+        start = match.start()
+        if start and folded[start - 1].isalpha():
+            yield match.span()
+
+
+def fold_with_substitutions(text):
+    """Return fold(text) and the (start, end) spans where substitutes were read as letters
+
+    The spans are what word_mask needs, so a caller that folds a message
+    can build its mask later without folding it again.
+    """
+    folded = text.translate(_FOLD)
+    substitutions = list(_between_letters(folded))
+    if not substitutions:
+        return folded, substitutions
+    pieces, last = [], 0
+    for start, end in substitutions:
+        pieces += folded[last:start], folded[start:end].translate(_SUBSTITUTE_TABLE)
+        last = end
+    pieces.append(folded[last:])
+    return "".join(pieces), substitutions
+
+
+def fold(text):
+    """Normalize text for trigger matching; triggers and messages both go through this"""
+    return fold_with_substitutions(text)[0]
+
+
+def word_mask(text, substitutions=None):
+    """Return a string lining up with fold(text): "w" for word characters, " " otherwise
+
+    substitutions are the spans from fold_with_substitutions(text); they
+    are worked out again if not given.
+    """
+    mask = text.translate(_WORD_MASK)
+    if substitutions is None:
+        substitutions = list(_between_letters(text.translate(_FOLD)))
+    if not substitutions:
+        return mask
+    pieces, last = [], 0
+    for start, end in substitutions:
+        pieces += mask[last:start], "w" * (end - start)
+        last = end
+    pieces.append(mask[last:])
+    return "".join(pieces)
+
+
+def is_whole_word(mask, start, end):
+    """Whether folded text[start:end] is bounded by non-word characters"""
+    return (start == 0 or mask[start - 1] == " ") and (end == len(mask) or mask[end] == " ")
@@ -0,0 +1,286 @@
+from collections import deque
+
+from utils.text_normalize import fold, fold_with_substitutions, is_whole_word, word_mask
+
+
+class TriggerMatcher:
+    """Aho-Corasick automaton over every stored trigger word
+
+    Triggers are registered per user so the pattern set can be kept up to
+    date as people add and remove words. The automaton itself is only rebuilt
+    when the set of distinct patterns changes, and then lazily on the next
+    search, so a burst of trigger edits costs a single rebuild.
+
+    Triggers and messages are both normalized with text_normalize.fold, so
+    "SH!T", full-width and accented spellings all match. A trigger can be
+    whole-word only; it then matches only between non-word characters,
+    unless another user registered the same word to match anywhere.
+    """
+
+    def __init__(self):
+        self._owners = {}  # pattern -> {user id: whole_word} for everyone who registered it
+        self._whole_word_only = set()  # patterns every owner wants matched as whole words
+        self._user_patterns = {}  # user id -> set of patterns
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [None]
+        self._dict_link = [0]
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._owners)
+
+    def load(self, user_data):
+        """Replace all registered triggers with the ones in user_data"""
+        self._owners = {}
+        self._whole_word_only = set()
+        self._user_patterns = {}
+        for user_id, profile in user_data.items():
+            for trigger in profile.triggers:
+                self.add(user_id, trigger, profile.is_whole_word(trigger))
+        self._dirty = True
+
+    def add(self, user_id, trigger, whole_word=False):
+        """Register a trigger word for a user"""
+        pattern = fold(trigger)
+        if not pattern.strip():
+            return
+        user_id = str(user_id)
+
+        owners = self._owners.get(pattern)
+        if owners is None:
+            owners = self._owners[pattern] = {}
+            self._dirty = True
+        owners[user_id] = whole_word
+        self._update_mode(pattern)
+        self._user_patterns.setdefault(user_id, set()).add(pattern)
+
+    def remove(self, user_id, trigger):
+        """Unregister a trigger word for a user"""
+        self._remove_pattern(str(user_id), fold(trigger))
+
+    def remove_user(self, user_id):
+        """Unregister every trigger word belonging to a user"""
+        for pattern in list(self._user_patterns.get(str(user_id), ())):
+            self._remove_pattern(str(user_id), pattern)
+
+    def users(self):
+        """Return the ids of every user with a registered trigger"""
+        return list(self._user_patterns)
+
+    def iter_matches(self, text):
+        """Yield (end_index, pattern) for every trigger found in text
+
+        end_index points into fold(text), which is what patterns are made of.
+        """
+        if self._dirty:
+            self._build()
+
+        folded, substitutions = fold_with_substitutions(text)
+        mask = None  # Word boundaries are only worked out if a whole-word trigger turns up
+        whole_word_only = self._whole_word_only
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        dict_link = self._dict_link
+
+        node = 0
+        for index, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            match = node if output[node] is not None else dict_link[node]
+            while match:
+                pattern = output[match]
+                if pattern in whole_word_only:
+                    if mask is None:
+                        mask = word_mask(text, substitutions)
+                    if not is_whole_word(mask, index + 1 - len(pattern), index + 1):
+                        match = dict_link[match]
+                        continue
+                yield index, pattern
+                match = dict_link[match]
+
+    def search(self, text):
+        """Return the first trigger found in text, or None"""
+        for _, pattern in self.iter_matches(text):
+            return pattern
+        return None
+
+    def _remove_pattern(self, user_id, pattern):
+        patterns = self._user_patterns.get(user_id)
+        if patterns is not None:
+            patterns.discard(pattern)
+            if not patterns:
+                del self._user_patterns[user_id]
+
+        owners = self._owners.get(pattern)
+        if owners is None:
+            return
+        owners.pop(user_id, None)
+        if not owners:
+            del self._owners[pattern]
+            self._dirty = True
+        self._update_mode(pattern)
+
+    def _update_mode(self, pattern):
+        owners = self._owners.get(pattern)
+        if owners and all(owners.values()):
+            self._whole_word_only.add(pattern)
+        else:
+            self._whole_word_only.discard(pattern)
+
+    def _build(self):
+        goto = [{}]
+        output = [None]
+        for pattern in self._owners:
+            node = 0
+            for char in pattern:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    output.append(None)
+                node = next_node
+            output[node] = pattern
+
+        # Breadth-first pass to fill in failure and dictionary suffix links
+        fail = [0] * len(goto)
+        dict_link = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fallback = goto[state].get(char, 0)
+                fail[child] = fallback if fallback != child else 0
+                dict_link[child] = fail[child] if output[fail[child]] is not None else dict_link[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._dict_link = dict_link
+        self._dirty = False
+
+
+class GuildTriggerIndex:
+    """One TriggerMatcher per guild, holding only that guild's members' triggers
+
+    A message is matched against its own guild's automaton, so the cost of
+    a search is bounded by the guild's members rather than by every user
+    the bot knows. Only members who have triggers are tracked. Membership
+    comes from add_guild (once a guild's member list has arrived) and
+    member_joined/member_left; member_guilds(user_id) is asked which guilds
+    someone is in when a user with no tracked guilds adds a trigger.
+    """
+
+    def __init__(self, member_guilds=None):
+        self.member_guilds = member_guilds or (lambda user_id: ())
+        self._triggers = {}  # user id -> {trigger word: whole_word}
+        self._user_guilds = {}  # user id (with triggers) -> set of guild ids
+        self._guilds = {}  # guild id -> TriggerMatcher
+
+    def __len__(self):
+        return len(self._triggers)
+
+    def load(self, user_data):
+        """Replace every user's triggers with the ones in user_data
+
+        Guild membership is forgotten, so add_guild has to be called again
+        for every guild the bot is in.
+        """
+        self._triggers = {}
+        for user_id, profile in user_data.items():
+            if profile.triggers:
+                self._triggers[str(user_id)] = {trigger: profile.is_whole_word(trigger) for trigger in profile.triggers}
+        self._user_guilds = {}
+        self._guilds = {}
+
+    def add_guild(self, guild_id, member_ids):
+        """(Re)build a guild's matcher from its full member list"""
+        self.remove_guild(guild_id)
+        matcher = self._guilds[guild_id] = TriggerMatcher()
+        for user_id in member_ids:
+            user_id = str(user_id)
+            triggers = self._triggers.get(user_id)
+            if triggers:
+                self._user_guilds.setdefault(user_id, set()).add(guild_id)
+                for trigger, whole_word in triggers.items():
+                    matcher.add(user_id, trigger, whole_word)
+
+    def remove_guild(self, guild_id):
+        matcher = self._guilds.pop(guild_id, None)
+        if matcher is None:
+            return
+        for user_id in matcher.users():
+            guilds = self._user_guilds.get(user_id)
+            if guilds is not None:
+                guilds.discard(guild_id)
+
+    def member_joined(self, guild_id, user_id):
+        user_id = str(user_id)
+        matcher = self._guilds.get(guild_id)
+        triggers = self._triggers.get(user_id)
+        if matcher is None or not triggers:
+            return
+        self._user_guilds.setdefault(user_id, set()).add(guild_id)
+        for trigger, whole_word in triggers.items():
+            matcher.add(user_id, trigger, whole_word)
+
+    def member_left(self, guild_id, user_id):
+        user_id = str(user_id)
+        matcher = self._guilds.get(guild_id)
+        if matcher is not None:
+            matcher.remove_user(user_id)
+        guilds = self._user_guilds.get(user_id)
+        if guilds is not None:
+            guilds.discard(guild_id)
+
+    def add(self, user_id, trigger, whole_word=False):
+        """Register (or change the mode of) a trigger word for a user in every guild they're in"""
+        user_id = str(user_id)
+        self._triggers.setdefault(user_id, {})[trigger] = whole_word
+        guilds = self._user_guilds.get(user_id)
+        if guilds is None:
+            guilds = self._user_guilds[user_id] = {
+                guild_id for guild_id in self.member_guilds(user_id) if guild_id in self._guilds
+            }
+        for guild_id in guilds:
+            self._guilds[guild_id].add(user_id, trigger, whole_word)
+
+    def remove(self, user_id, trigger):
+        """Unregister a trigger word for a user"""
+        user_id = str(user_id)
+        triggers = self._triggers.get(user_id)
+        if not triggers or trigger not in triggers:
+            return
+        del triggers[trigger]
+        for guild_id in self._user_guilds.get(user_id, ()):
+            self._guilds[guild_id].remove(user_id, trigger)
+        if not triggers:
+            del self._triggers[user_id]
+            self._user_guilds.pop(user_id, None)
+
+    def remove_user(self, user_id):
+        """Unregister every trigger word belonging to a user"""
+        user_id = str(user_id)
+        for guild_id in self._user_guilds.pop(user_id, ()):
+            self._guilds[guild_id].remove_user(user_id)
+        self._triggers.pop(user_id, None)
+
+    def iter_matches(self, guild_id, text):
+        """Yield (end_index, pattern) for every trigger of guild_id's members found in text"""
+        matcher = self._guilds.get(guild_id)
+        if matcher is not None:
+            yield from matcher.iter_matches(text)
+
+    def search(self, guild_id, text):
+        """Return the first of guild_id's members' triggers found in text, or None"""
+        matcher = self._guilds.get(guild_id)
+        return matcher.search(text) if matcher is not None else None
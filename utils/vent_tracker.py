@@ -0,0 +1,52 @@
+import asyncio
+import json
+import os
+
+
+class VentTracker:
+    """Vent threads still waiting for their follow-up, saved to a small JSON file
+
+    Maps thread id -> {"user_id", "expires_at"}, where expires_at is the
+    Unix time the follow-up stops waiting for the user's first message.
+    Because the file outlives the process, a restart picks the open vents
+    back up instead of silently dropping them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._vents = {}
+        self._save_lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._vents)
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self._vents = {int(thread_id): vent for thread_id, vent in data.items()}
+
+    def items(self):
+        """Return (thread_id, user_id, expires_at) for every open vent"""
+        return [(thread_id, vent["user_id"], vent["expires_at"]) for thread_id, vent in self._vents.items()]
+
+    async def open(self, thread_id, user_id, expires_at):
+        self._vents[thread_id] = {"user_id": user_id, "expires_at": expires_at}
+        await self.save()
+
+    async def close(self, thread_id):
+        if self._vents.pop(thread_id, None) is not None:
+            await self.save()
+
+    async def save(self):
+        async with self._save_lock:
+            payload = json.dumps({str(thread_id): vent for thread_id, vent in self._vents.items()}, indent=4)
+            await asyncio.to_thread(self._write, payload)
+
+    def _write(self, payload):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)